@@ -0,0 +1,117 @@
+"""Run-length activity records for the monitor loop.
+
+Instead of one log line per observation, the monitor reports what it sees
+on every tick and ActivityLog writes only the changes:
+
+  foreground_enter   the foreground app changed during a restriction window
+  foreground_leave   ... with how long the previous app stayed in front
+  violation          first violation of a (rule, app) pair
+  violation_summary  further violations of that pair, at most one record
+                     per summary_interval, with their count
+
+Violations of a pair are counted at most once per repeat_gap, the old
+per-line rate limit. Counts therefore match what per-event logging would
+have written, and Analytics stays comparable across old and new logs. A
+pair with no new violations for a whole interval is closed. If it reoccurs,
+another "violation" record is written straight away.
+"""
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import logger
+
+
+class _Run:
+    __slots__ = ("count", "since", "last")
+
+    def __init__(self, since: float):
+        self.count = 0          # violations not yet written
+        self.since = since      # when the pair's last record was written
+        self.last = since       # when a violation was last counted
+
+
+class ActivityLog:
+    def __init__(self, emit: Callable[..., None] = logger.log, summary_interval: float = 60.0,
+                 repeat_gap: float = 5.0, clock: Callable[[], float] = time.monotonic):
+        self._emit = emit
+        self._interval = summary_interval
+        self._gap = repeat_gap
+        self._clock = clock
+        self._app: Optional[str] = None
+        self._entered = 0.0
+        self._runs: Dict[Tuple[str, str], _Run] = {}
+
+    def foreground(self, app: Optional[str], rule: Optional[str] = None) -> None:
+        """*app* is in front now (None = nothing tracked). O(1) when unchanged."""
+        if app == self._app:
+            return
+        now = self._clock()
+        if self._app is not None:
+            self._emit("foreground_leave", app=self._app, seconds=round(now - self._entered, 1))
+        if app is not None:
+            self._emit("foreground_enter", app=app, rule=rule)
+        self._app, self._entered = app, now
+
+    def violation(self, rule: str, app: str, title: str = "") -> None:
+        run = self._runs.get((rule, app))
+        now = self._clock()
+        if run is None:
+            self._runs[(rule, app)] = _Run(now)
+            self._emit("violation", rule=rule, app=app, title=title)
+        elif now - run.last >= self._gap:
+            run.count += 1
+            run.last = now
+
+    def tick(self) -> None:
+        """Write due summaries and close pairs that went quiet."""
+        if not self._runs:
+            return
+        now = self._clock()
+        for key, run in list(self._runs.items()):
+            if now - run.since >= self._interval:
+                if run.count:
+                    self._summary(key, run, now)
+                else:
+                    del self._runs[key]
+
+    def close(self) -> None:
+        """Restriction over (or shutting down): flush every summary and the foreground span."""
+        now = self._clock()
+        for key, run in self._runs.items():
+            if run.count:
+                self._summary(key, run, now)
+        self._runs.clear()
+        self.foreground(None)
+
+    def export(self) -> List[list]:
+        """Open pairs as [rule, app, count, since, last] with wall-clock times."""
+        now, wall = self._clock(), time.time()
+        return [[rule, app, run.count, round(wall - (now - run.since), 1),
+                 round(wall - (now - run.last), 1)]
+                for (rule, app), run in list(self._runs.items())]
+
+    def restore(self, runs) -> None:
+        """
+        Reopen pairs from export() output so a restart neither re-logs a
+        fresh "violation" nor loses pending counts. Times in the future
+        (the clock jumped back) are discarded. A pair whose interval has
+        already passed gets its pending summary written now.
+        """
+        now, wall = self._clock(), time.time()
+        for rule, app, count, since, last in runs:
+            age, idle = wall - float(since), wall - float(last)
+            if age < 0 or idle < 0:
+                continue
+            run = _Run(now - age)
+            run.count, run.last = int(count), now - min(idle, age)
+            key = (str(rule), str(app))
+            if age < self._interval:
+                self._runs[key] = run
+            elif run.count:
+                self._summary(key, run, now)
+
+    def _summary(self, key: Tuple[str, str], run: _Run, now: float) -> None:
+        rule, app = key
+        self._emit("violation_summary", rule=rule, app=app, count=run.count,
+                   seconds=round(now - run.since, 1))
+        run.count, run.since = 0, now
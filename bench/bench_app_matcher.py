@@ -0,0 +1,56 @@
+"""is_app_allowed() against app lists with thousands of entries.
+
+The baseline is the pre-compiled check: lowercase the whole app_list on
+every call, then do a linear `in`. AppMatcher is built once per window and
+matches with a set lookup plus at most one combined regex per kind.
+
+    python bench/bench_app_matcher.py [--sizes 10 1000 5000 20000] [--globs 50]
+"""
+import argparse
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import AppMatcher  # noqa: E402
+
+
+def old_is_listed(app_name: str, app_list) -> bool:
+    return app_name.lower() in [a.lower() for a in app_list]
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 5000, 20000])
+    ap.add_argument("--globs", type=int, default=50, help="glob patterns added to each list")
+    ap.add_argument("--number", type=int, default=200)
+    args = ap.parse_args()
+
+    rng = random.Random(1)
+    timeit.timeit(lambda: AppMatcher(["warm.exe"]).matches("x.exe"), number=1000)
+    print(f"{'entries':>8} {'old list scan':>14} {'AppMatcher':>11} {'+globs':>9}  (us per call)")
+    for n in args.sizes:
+        app_list = [f"App{i:06d}.exe" for i in range(n)]
+        queries = [f"app{rng.randrange(2 * n):06d}.exe" for _ in range(64)]   # ~half hits
+        paths = [rf"c:\program files\{q[:-4]}\{q}" for q in queries]
+
+        old = timeit.timeit(lambda: [old_is_listed(q, app_list) for q in queries],
+                            number=args.number) / (args.number * len(queries))
+
+        exact = AppMatcher(app_list)
+        assert [exact.matches(q) for q in queries] == [old_is_listed(q, app_list) for q in queries]
+        new = timeit.timeit(lambda: [exact.matches(q, p) for q, p in zip(queries, paths)],
+                            number=args.number) / (args.number * len(queries))
+
+        globbed = AppMatcher(app_list + [f"game{i}*.exe" for i in range(args.globs // 2)]
+                             + [rf"*\studio{i}\*" for i in range(args.globs - args.globs // 2)])
+        glob = timeit.timeit(lambda: [globbed.matches(q, p) for q, p in zip(queries, paths)],
+                             number=args.number) / (args.number * len(queries))
+
+        print(f"{n:>8} {old * 1e6:>14.2f} {new * 1e6:>11.3f} {glob * 1e6:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Per-tick foreground exe lookup: Process(pid).exe() every tick vs ExeCache.
+
+The fake table sleeps a configurable cost per call, since on Windows
+exe() (OpenProcess + QueryFullProcessImageName) is dearer than
+create_time(). The defaults are rough figures for a desktop; pass
+measured ones with --exe-us / --ctime-us.
+
+    python bench/bench_exe_cache.py [--ticks 20000] [--switch-every 40]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from proctable import ExeCache, FakeProcessTable  # noqa: E402
+
+
+class CostlyTable(FakeProcessTable):
+    def __init__(self, procs, exe_us: float, ctime_us: float):
+        super().__init__(procs)
+        self._exe_s, self._ctime_s = exe_us / 1e6, ctime_us / 1e6
+
+    @staticmethod
+    def _spin(seconds: float) -> None:
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            pass
+
+    def exe(self, pid: int) -> str:
+        self._spin(self._exe_s)
+        return super().exe(pid)
+
+    def create_time(self, pid: int) -> float:
+        self._spin(self._ctime_s)
+        return super().create_time(pid)
+
+
+def foreground_pids(n: int, switch_every: int, pids: list, rng: random.Random):
+    """A foreground that mostly stays put, switching every *switch_every* ticks."""
+    pid = rng.choice(pids)
+    for tick in range(n):
+        if tick % switch_every == 0:
+            pid = rng.choice(pids)
+        yield pid
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--ticks", type=int, default=20000)
+    ap.add_argument("--switch-every", type=int, default=40, help="ticks between foreground switches")
+    ap.add_argument("--procs", type=int, default=300)
+    ap.add_argument("--exe-us", type=float, default=25.0, help="simulated cost of exe()")
+    ap.add_argument("--ctime-us", type=float, default=4.0, help="simulated cost of create_time()")
+    args = ap.parse_args()
+
+    procs = {pid: (float(pid), rf"C:\Apps\App{pid}.exe", 4) for pid in range(8, 8 + 4 * args.procs, 4)}
+    pids = list(procs)
+
+    table = CostlyTable(procs, args.exe_us, args.ctime_us)
+    t0 = time.perf_counter()
+    for pid in foreground_pids(args.ticks, args.switch_every, pids, random.Random(1)):
+        table.exe(pid).lower()
+    before = (time.perf_counter() - t0) / args.ticks * 1e6
+    before_calls = table.calls / args.ticks
+
+    table = CostlyTable(procs, args.exe_us, args.ctime_us)
+    cache = ExeCache(table)
+    t0 = time.perf_counter()
+    for pid in foreground_pids(args.ticks, args.switch_every, pids, random.Random(1)):
+        cache.lookup(pid)
+    after = (time.perf_counter() - t0) / args.ticks * 1e6
+    after_calls = table.calls / args.ticks
+
+    print(f"exe() every tick  {before:7.2f} us/tick  {before_calls:.2f} calls/tick")
+    print(f"ExeCache          {after:7.2f} us/tick  {after_calls:.2f} calls/tick  {cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
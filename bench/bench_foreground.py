@@ -0,0 +1,82 @@
+"""Foreground-switch reaction latency and wakeups: event-driven vs polling.
+
+A scripted "desktop" switches the foreground at random intervals. The
+monitor-loop stand-in either polls every check_interval (the old loop,
+PollingForegroundSource) or waits on the event-driven source with a long
+idle timeout. It records how long each switch took to be noticed and how
+many times the loop woke up.
+
+    python bench/bench_foreground.py [--switches 40] [--mean-gap 0.25] [--interval 0.5]
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from foreground import PollingForegroundSource, ScriptedForegroundSource  # noqa: E402
+
+
+class Desktop(ScriptedForegroundSource):
+    """Plays the script and records when each hwnd came to the front."""
+
+    def __init__(self, script):
+        super().__init__(script, initial=0)
+        self.switched_at = {}
+
+    def _publish(self, hwnd: int) -> None:
+        self.switched_at[hwnd] = time.perf_counter()
+        super()._publish(hwnd)
+
+
+def run(desktop: Desktop, source, timeout: float, n: int) -> tuple:
+    """Loop until the last window is seen; switches that came and went unseen count as missed."""
+    latencies, wakeups, last = [], 0, 0
+    desktop.start()
+    while last != n:
+        source.wait(timeout)
+        wakeups += 1
+        hwnd = source.current()
+        if hwnd != last:
+            latencies.append(time.perf_counter() - desktop.switched_at[hwnd])
+            last = hwnd
+    desktop.stop()
+    return latencies, wakeups, n - len(latencies)
+
+
+def script(n: int, mean_gap: float, seed: int):
+    rng = random.Random(seed)
+    return [(rng.expovariate(1 / mean_gap), hwnd) for hwnd in range(1, n + 1)]
+
+
+def report(label: str, latencies, wakeups: int, missed: int, elapsed: float) -> None:
+    ms = sorted(x * 1e3 for x in latencies)
+    p95 = ms[max(0, int(len(ms) * 0.95) - 1)]
+    print(f"{label:<13} median {statistics.median(ms):7.2f} ms  p95 {p95:7.2f} ms  "
+          f"max {ms[-1]:7.2f} ms  missed {missed:3d}  {wakeups / elapsed:6.1f} wakeups/s")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--switches", type=int, default=40)
+    ap.add_argument("--mean-gap", type=float, default=0.25, help="mean seconds between switches")
+    ap.add_argument("--interval", type=float, default=0.5, help="old check_interval")
+    args = ap.parse_args()
+
+    desktop = Desktop(script(args.switches, args.mean_gap, 1))
+    t0 = time.perf_counter()
+    lat, wakeups, missed = run(desktop, PollingForegroundSource(desktop.current),
+                               args.interval, args.switches)
+    report("polling", lat, wakeups, missed, time.perf_counter() - t0)
+
+    desktop = Desktop(script(args.switches, args.mean_gap, 1))
+    t0 = time.perf_counter()
+    lat, wakeups, missed = run(desktop, desktop, 60.0, args.switches)
+    report("event-driven", lat, wakeups, missed, time.perf_counter() - t0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Import cost of the monitor process vs the Status & Logs window.
+
+Each module is imported in a fresh interpreter under -X importtime and
+tracemalloc. Reported per module: wall time of the import, modules added
+to sys.modules, tracemalloc peak, resident set size afterwards, which
+heavy libraries got pulled in, and the slowest imports (cumulative) from
+the -X importtime output.
+
+    python bench/bench_imports.py [--top 8] [module ...]     (default: main status_window)
+
+main.py needs pywin32 and psutil, so the defaults only import on Windows;
+any module that fails to import is reported with its error.
+"""
+import argparse
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+HEAVY = ("matplotlib", "numpy", "tkinter", "PIL", "pystray", "yaml", "psutil")
+
+CHILD = r"""
+import json, sys, time, tracemalloc
+sys.path.insert(0, sys.argv[1])
+name, heavy = sys.argv[2], sys.argv[3].split(",")
+
+
+def rss():
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class Counters(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [
+                (f, ctypes.c_size_t) for f in (
+                    "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage",
+                    "QuotaPagedPoolUsage", "QuotaPeakNonPagedPoolUsage",
+                    "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage")]
+        c = Counters(cb=ctypes.sizeof(Counters))
+        ctypes.windll.psapi.GetProcessMemoryInfo(
+            ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(c), c.cb)
+        return c.WorkingSetSize
+    import os
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+before = set(sys.modules)
+rss0 = rss()
+tracemalloc.start()
+sys.stderr.write("-- start\n"); sys.stderr.flush()   # brackets the -X importtime lines
+t0 = time.perf_counter()
+error = None
+try:
+    __import__(name)
+except Exception as e:
+    error = f"{type(e).__name__}: {e}"
+elapsed = time.perf_counter() - t0
+sys.stderr.write("-- end\n"); sys.stderr.flush()
+_, peak = tracemalloc.get_traced_memory()
+tracemalloc.stop()
+added = set(sys.modules) - before
+print(json.dumps({
+    "error": error, "seconds": elapsed, "modules": len(added), "peak": peak,
+    "rss": rss(), "rss_delta": rss() - rss0,
+    "heavy": [h for h in heavy if h in added],
+}))
+"""
+
+_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def profile(name: str) -> tuple:
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", CHILD,
+                           str(ROOT), name, ",".join(HEAVY)],
+                          capture_output=True, text=True, cwd=ROOT)
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    err = proc.stderr
+    err = err[err.find("-- start\n"):err.find("-- end\n")]     # the module's own graph only
+    times = []
+    for line in err.splitlines():
+        m = _LINE.match(line)
+        if m:
+            times.append((int(m.group(2)), m.group(4)))
+    return result, times
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("modules", nargs="*", default=["main", "status_window"])
+    ap.add_argument("--top", type=int, default=8, help="slowest imports to list per module")
+    args = ap.parse_args()
+
+    for name in args.modules:
+        r, times = profile(name)
+        print(f"{name}")
+        if r["error"]:
+            print(f"  import failed: {r['error']}")
+        print(f"  import {r['seconds'] * 1e3:8.1f} ms   {r['modules']:4d} modules   "
+              f"tracemalloc peak {r['peak'] / 2**20:6.1f} MiB   "
+              f"RSS {r['rss'] / 2**20:6.1f} MiB (+{r['rss_delta'] / 2**20:.1f})")
+        print(f"  heavy: {', '.join(r['heavy']) or 'none'}")
+        for us, mod in sorted(times, reverse=True)[:args.top]:
+            print(f"    {us / 1e3:8.1f} ms  {mod}")
+
+
+if __name__ == "__main__":
+    main()
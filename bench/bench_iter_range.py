@@ -0,0 +1,93 @@
+"""Reading violations out of a 1M-line log set: read_range() vs iter_range(events=...).
+
+Writes synthetic day files (5% violations) to a temporary directory, then
+runs each reader in a fresh process so peak RSS is its own.
+
+    python bench/bench_iter_range.py [--lines 1000000] [--days 10] [--keep DIR]
+"""
+import argparse
+import json
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import logger  # noqa: E402
+
+EVENTS = ["foreground_enter", "foreground_leave", "config_reloaded", "override_granted"]
+
+
+def peak_rss_mb() -> float:
+    try:
+        import resource
+        kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return kb / 1024 / (1024 if sys.platform == "darwin" else 1)
+    except ImportError:   # Windows
+        import psutil
+        return psutil.Process().memory_info().peak_wset / 2**20
+
+
+def generate(log_dir: Path, lines: int, days: int) -> None:
+    rng = random.Random(1)
+    first = date(2026, 1, 1)
+    per_day = lines // days
+    for d in range(days):
+        day = (first + timedelta(days=d)).isoformat()
+        with open(log_dir / f"{day}.jsonl", "w", encoding="utf-8") as f:
+            for i in range(per_day):
+                ts = f"{day}T{i * 86400 // per_day // 3600:02d}:{i % 60:02d}:{i % 60:02d}"
+                if rng.random() < 0.05:
+                    rec = {"ts": ts, "event": "violation",
+                           "details": {"rule": "night", "app": f"game{rng.randrange(20)}.exe",
+                                       "title": "Some window title"}}
+                else:
+                    rec = {"ts": ts, "event": rng.choice(EVENTS),
+                           "details": {"app": f"app{rng.randrange(200)}.exe", "seconds": i % 900}}
+                f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+
+
+def run_mode(mode: str, log_dir: Path) -> None:
+    logger.init(log_dir)
+    t0 = time.perf_counter()
+    if mode == "read_range":
+        n = len([r for r in logger.read_range("0000-00-00", "9999-12-31") if r["event"] == "violation"])
+    else:
+        n = sum(1 for _ in logger.iter_range(events=["violation"]))
+    secs = time.perf_counter() - t0
+    print(json.dumps({"mode": mode, "violations": n, "seconds": secs, "peak_rss_mb": peak_rss_mb()}))
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--lines", type=int, default=1_000_000)
+    ap.add_argument("--days", type=int, default=10)
+    ap.add_argument("--keep", type=Path, help="write the logs here and keep them")
+    ap.add_argument("--mode", help=argparse.SUPPRESS)
+    ap.add_argument("--dir", type=Path, help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.dir)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log_dir = args.keep or Path(tmp)
+        log_dir.mkdir(parents=True, exist_ok=True)
+        t0 = time.perf_counter()
+        generate(log_dir, args.lines, args.days)
+        print(f"generated {args.lines:,} lines in {time.perf_counter() - t0:.1f}s")
+        for mode in ("read_range", "iter_range"):
+            out = subprocess.run([sys.executable, __file__, "--mode", mode, "--dir", str(log_dir)],
+                                 capture_output=True, text=True, check=True).stdout
+            r = json.loads(out)
+            print(f"{mode:<11} {r['seconds']:6.2f}s  {r['peak_rss_mb']:7.1f} MB peak RSS  "
+                  f"{r['violations']:,} violations")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""logger.log throughput: open-append-close per record vs the batched writer.
+
+"old" is the pre-batching log(): format, take the lock, open the day's file,
+write one line, close. "new" is logger.log(), which only queues; its
+figure includes the final flush() so the records are on disk in both
+cases. --fsync is passed to logger.init for the new writer.
+
+    python bench/bench_logger.py [--records 20000] [--threads 1] [--fsync SECONDS]
+"""
+import argparse
+import json
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import logger  # noqa: E402
+
+_old_lock = threading.Lock()
+
+
+def old_log(log_dir: Path, event: str, **details) -> None:
+    record = {"ts": datetime.now().isoformat(timespec="seconds"), "event": event}
+    if details:
+        record["details"] = details
+    line = json.dumps(record, ensure_ascii=False)
+    with _old_lock:
+        with open(log_dir / f"{datetime.now().strftime('%Y-%m-%d')}.jsonl", "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+def timed(fn, records: int, threads: int) -> float:
+    per = records // threads
+
+    def work():
+        for n in range(per):
+            fn("foreground_changed", exe="chrome.exe", n=n)
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    t0 = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    call = time.perf_counter() - t0
+    return call, per * threads
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--records", type=int, default=20_000)
+    ap.add_argument("--threads", type=int, default=1)
+    ap.add_argument("--fsync", type=float, default=None)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        old_dir = Path(tmp) / "old"
+        old_dir.mkdir()
+        call, n = timed(lambda e, **d: old_log(old_dir, e, **d), args.records, args.threads)
+        print(f"old  {n / call:10,.0f} records/s   {call / n * 1e6:7.2f} us/call")
+
+        logger.init(Path(tmp) / "new", fsync=args.fsync, max_queue=args.records)
+        call, n = timed(logger.log, args.records, args.threads)
+        t0 = time.perf_counter()
+        logger.flush(timeout=None)
+        total = call + time.perf_counter() - t0
+        print(f"new  {n / total:10,.0f} records/s   {call / n * 1e6:7.2f} us/call "
+              f"(caller side; {total:.3f} s to disk)")
+        logger.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Persistence health checks per second on FakeBackend.
+
+Compares one `schtasks /query /tn <name>` per task (the old self-heal),
+a fresh batched listing (setup.py --status), and the cached status the
+guardian uses between heals. --spawn-ms is the simulated cost of each
+process spawn; measure schtasks on the target machine for real figures.
+
+    python bench/bench_persistence.py [--spawn-ms 30] [--seconds 2]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from persistence import TASK_NAMES, FakeBackend, Persistence  # noqa: E402
+
+
+def per_task_status(backend: FakeBackend) -> bool:
+    """One spawn per task, as guardian._self_heal used to query them."""
+    ok = True
+    for name in TASK_NAMES:
+        ok &= name in backend.list_tasks()
+    return ok and backend.registry_exists() and backend.startup_exists()
+
+
+def rate(check, backend: FakeBackend, seconds: float) -> tuple:
+    backend.spawns = 0
+    n, end = 0, time.perf_counter() + seconds
+    t0 = time.perf_counter()
+    while time.perf_counter() < end:
+        check()
+        n += 1
+    return n / (time.perf_counter() - t0), backend.spawns / n
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--spawn-ms", type=float, default=30.0)
+    ap.add_argument("--seconds", type=float, default=2.0, help="time spent per variant")
+    args = ap.parse_args()
+
+    backend = FakeBackend(set(TASK_NAMES), registry=True, startup=True, spawn_cost=args.spawn_ms / 1000)
+    persistence = Persistence(backend)
+    rows = [
+        ("per-task queries", lambda: per_task_status(backend)),
+        ("batched, fresh", lambda: persistence.status(max_age=0)),
+        ("cached", lambda: persistence.status()),
+    ]
+    for label, check in rows:
+        per_s, spawns = rate(check, backend, args.seconds)
+        print(f"{label:<17} {per_s:12,.1f} checks/s  {spawns:.3f} spawns/check")
+
+
+if __name__ == "__main__":
+    main()
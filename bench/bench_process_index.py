@@ -0,0 +1,137 @@
+"""Force-kill cost on a synthetic 5,000-process table: full scan vs ProcessIndex.
+
+The baseline is what _force_kill used to do through process_iter: read the
+name of every process, then kill the matches. The index refreshes with one
+call per tick, either a PID-set diff that names only new PIDs or a
+one-call snapshot (Toolhelp on Windows), and validates only kill targets.
+
+The fake table spins a configurable cost per call, as bench_exe_cache.py
+does. The defaults are rough desktop figures; pass measured ones for the
+target machine.
+
+    python bench/bench_process_index.py [--procs 5000] [--churn 20] [--ticks 100]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from proctable import FakeProcessTable, ProcessIndex  # noqa: E402
+
+TARGET = r"c:\games\steam.exe"
+
+
+def _spin(us: float) -> None:
+    end = time.perf_counter() + us / 1e6
+    while time.perf_counter() < end:
+        pass
+
+
+class CostlyTable(FakeProcessTable):
+    def __init__(self, procs, costs, snapshot: bool):
+        super().__init__(procs, snapshot=snapshot)
+        self._costs = costs
+
+    def pids(self):
+        _spin(self._costs.pids_us + self._costs.per_proc_us * len(self.procs))
+        return super().pids()
+
+    def snapshot(self):
+        if self.has_snapshot:
+            _spin(self._costs.snapshot_us + self._costs.per_proc_us * 4 * len(self.procs))
+        return super().snapshot()
+
+    def name(self, pid):
+        _spin(self._costs.name_us)
+        return super().name(pid)
+
+    def ppid(self, pid):
+        _spin(self._costs.ppid_us)
+        return super().ppid(pid)
+
+    def create_time(self, pid):
+        _spin(self._costs.ctime_us)
+        return super().create_time(pid)
+
+    def kill(self, pid):
+        _spin(self._costs.kill_us)
+        return super().kill(pid)
+
+
+def make_procs(n: int, rng: random.Random) -> dict:
+    return {pid: (float(pid), rf"c:\apps\app{rng.randrange(400)}.exe", rng.randrange(1, pid + 1))
+            for pid in range(4, 4 * n + 4, 4)}
+
+
+def churn(table: FakeProcessTable, k: int, rng: random.Random, clock: list) -> int:
+    """Replace *k* processes, half of them on recycled PIDs; start the target on one. Returns its pid."""
+    pids = list(table.procs)
+    for pid in rng.sample(pids, k):
+        del table.procs[pid]
+        clock[0] += 1
+        new = pid if rng.random() < 0.5 else max(table.procs) + 4
+        table.procs[new] = (clock[0], rf"c:\apps\app{rng.randrange(400)}.exe", rng.choice(pids))
+    clock[0] += 1
+    target = rng.choice(list(table.procs))
+    table.procs[target] = (clock[0], TARGET, 4)   # the offender often lands on a recycled PID
+    return target
+
+
+def full_scan(table: FakeProcessTable, offender: int) -> int:
+    killed = 0
+    for pid in table.pids():
+        if table.name(pid).lower() == "steam.exe":
+            table.kill(pid)
+            killed += 1
+    return killed
+
+
+def run(kill, table, ticks: int, k: int, seed: int) -> tuple:
+    rng, clock = random.Random(seed), [1e6]
+    total, killed = 0.0, 0
+    table.calls = 0
+    for _ in range(ticks):
+        offender = churn(table, k, rng, clock)
+        t0 = time.perf_counter()
+        killed += kill(table, offender)
+        total += time.perf_counter() - t0
+    return total / ticks * 1e3, table.calls / ticks, killed
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--procs", type=int, default=5000)
+    ap.add_argument("--churn", type=int, default=20, help="processes replaced per tick")
+    ap.add_argument("--ticks", type=int, default=100)
+    ap.add_argument("--pids-us", type=float, default=50.0, help="fixed cost of pids()")
+    ap.add_argument("--snapshot-us", type=float, default=200.0, help="fixed cost of snapshot()")
+    ap.add_argument("--per-proc-us", type=float, default=0.1,
+                    help="pids() cost per process (snapshot() is charged 4x)")
+    ap.add_argument("--name-us", type=float, default=20.0)
+    ap.add_argument("--ppid-us", type=float, default=20.0)
+    ap.add_argument("--ctime-us", type=float, default=5.0)
+    ap.add_argument("--kill-us", type=float, default=50.0)
+    args = ap.parse_args()
+
+    base = make_procs(args.procs, random.Random(1))
+    rows = [("full scan", lambda: CostlyTable(base, args, snapshot=False), None)]
+    for label, snap in (("index, pid diff", False), ("index, snapshot", True)):
+        rows.append((label, lambda snap=snap: CostlyTable(base, args, snapshot=snap), snap))
+
+    for label, make, snap in rows:
+        table = make()
+        if snap is None:
+            kill = full_scan
+        else:
+            index = ProcessIndex(table, kill_interval=0)
+            index.refresh()
+            kill = lambda t, offender, index=index: len(index.kill("steam.exe", pids=(offender,)))
+        ms, calls, killed = run(kill, table, args.ticks, args.churn, 2)
+        print(f"{label:<16} {ms:8.3f} ms/tick  {calls:7.1f} calls/tick  killed {killed}")
+
+
+if __name__ == "__main__":
+    main()
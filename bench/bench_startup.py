@@ -0,0 +1,91 @@
+"""main.py cold start: process start → import → Sleeper() → first monitor tick.
+
+Each sample is a fresh interpreter that imports main, builds a Sleeper with
+a ScriptedForegroundSource (no WinEvent hook, no UI threads) and runs
+_monitor_loop until its first _tick. "miss" starts with an empty config
+cache, so PyYAML is imported and config.yaml compiled; "hit" reuses the
+pickle the previous run wrote. Logs, state and heartbeat go to a temp dir.
+
+Needs the app's own dependencies (pywin32, psutil), i.e. Windows.
+
+    python bench/bench_startup.py [--runs 10]
+"""
+import argparse
+import json
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+CHILD = r"""
+import sys, time
+t0 = time.perf_counter()
+sys.path.insert(0, sys.argv[1])
+from pathlib import Path
+import main
+t_import = time.perf_counter()
+
+import json
+import threading
+from foreground import ScriptedForegroundSource
+from lease import LocalLease
+
+tmp = Path(sys.argv[2])
+main.BASE_DIR = tmp                     # logger.init(BASE_DIR / log_dir)
+main.CACHE_DIR = tmp / "cache"
+main.STATE_PATH = tmp / ".state.json"
+main.MONITOR_HEARTBEAT = tmp / ".monitor_heartbeat"
+
+app = main.Sleeper(LocalLease("bench"), fg=ScriptedForegroundSource())
+t_init = time.perf_counter()
+
+first = threading.Event()
+tick = app._tick
+def first_tick(*args, **kwargs):
+    first.set()
+    app._stop.set()
+    tick(*args, **kwargs)
+app._tick = first_tick
+threading.Thread(target=app._monitor_loop, daemon=True).start()
+first.wait(30)
+t_tick = time.perf_counter()
+app._fg.wake()
+print(json.dumps({"import": t_import - t0, "init": t_init - t_import, "tick": t_tick - t_init,
+                  "total": t_tick - t0}))
+"""
+
+PHASES = ("import", "init", "tick", "total")
+
+
+def sample(tmp: Path) -> dict:
+    out = subprocess.run([sys.executable, "-c", CHILD, str(ROOT), str(tmp)],
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=10)
+    args = ap.parse_args()
+    if sys.platform != "win32":
+        sys.exit("main.py needs pywin32; run this on Windows")
+
+    print(f"{'cache':<6}" + "".join(f"{p:>12}" for p in PHASES) + "   (median ms)")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        for label in ("miss", "hit"):
+            runs = []
+            for _ in range(args.runs):
+                if label == "miss":
+                    shutil.rmtree(tmp / "cache", ignore_errors=True)
+                runs.append(sample(tmp))
+            print(f"{label:<6}" + "".join(
+                f"{statistics.median(r[p] for r in runs) * 1e3:12.1f}" for p in PHASES))
+
+
+if __name__ == "__main__":
+    main()
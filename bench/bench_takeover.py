@@ -0,0 +1,110 @@
+"""Time from the active main.py dying to a new process holding the lease.
+
+warm   a parked standby blocked in FileLease.acquire() — what the guardian
+       keeps running (lease.Standby)
+cold   the old path: spawn a fresh interpreter after the exit, import, acquire
+
+The holder is a real child process killed with SIGKILL, so the handoff goes
+through the OS releasing the lock. The cold figure leaves out the guardian's
+restart delay and main.py's Windows-only imports, so on the target machine
+the gap is wider. POSIX only (FileLease).
+
+    python bench/bench_takeover.py [--rounds 10]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from lease import FileLease  # noqa: E402
+
+HOLDER = """
+import sys, time
+sys.path.insert(0, sys.argv[1])
+from lease import FileLease
+FileLease(sys.argv[2]).acquire()
+print("held", flush=True)
+time.sleep(600)
+"""
+
+COLD = """
+import sys
+sys.path.insert(0, sys.argv[1])
+import config, logger, scheduler, foreground  # the portable part of main.py's imports
+from lease import FileLease
+FileLease(sys.argv[2]).acquire()
+print("held", flush=True)
+"""
+
+
+def _holder(path: Path) -> subprocess.Popen:
+    proc = subprocess.Popen([sys.executable, "-c", HOLDER, str(ROOT), str(path)],
+                            stdout=subprocess.PIPE, text=True)
+    assert proc.stdout.readline().strip() == "held"
+    return proc
+
+
+def _reap(proc: subprocess.Popen) -> None:
+    proc.kill()
+    proc.wait()
+    proc.stdout.close()
+
+
+def warm(path: Path) -> float:
+    holder = _holder(path)
+    lease = FileLease(path)
+    took = threading.Event()
+    at = []
+
+    def parked():
+        lease.acquire()
+        at.append(time.perf_counter())
+        took.set()
+
+    t = threading.Thread(target=parked, daemon=True)
+    t.start()
+    time.sleep(0.05)                     # let it block in flock()
+    t0 = time.perf_counter()
+    _reap(holder)
+    took.wait(10)
+    lease.release()
+    return at[0] - t0
+
+
+def cold(path: Path) -> float:
+    holder = _holder(path)
+    t0 = time.perf_counter()
+    _reap(holder)
+    fresh = subprocess.Popen([sys.executable, "-c", COLD, str(ROOT), str(path)],
+                             stdout=subprocess.PIPE, text=True)
+    fresh.stdout.readline()
+    elapsed = time.perf_counter() - t0
+    fresh.wait()
+    fresh.stdout.close()
+    return elapsed
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rounds", type=int, default=10)
+    args = ap.parse_args()
+    if sys.platform == "win32":
+        sys.exit("FileLease is POSIX only")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "monitor.lock"
+        for label, fn in (("warm standby", warm), ("cold start", cold)):
+            ms = sorted(fn(path) * 1e3 for _ in range(args.rounds))
+            print(f"{label:<13} median {statistics.median(ms):8.2f} ms  "
+                  f"min {ms[0]:8.2f} ms  max {ms[-1]:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
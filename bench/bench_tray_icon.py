@@ -0,0 +1,50 @@
+"""Tray icon cost: concentric-ellipse gradient vs vectorized gradient, render vs cache hit.
+
+_gradient_disc uses the ellipses up to icon_util._ELLIPSE_MAX px; keep that
+at the crossover these figures show.
+
+    python bench/bench_tray_icon.py [--sizes 32 64 128 256] [--number 50]
+"""
+import argparse
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import icon_util  # noqa: E402
+
+
+def per_call_us(fn, number: int) -> float:
+    return timeit.timeit(fn, number=number) / number * 1e6
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[32, 64, 128, 256])
+    ap.add_argument("--number", type=int, default=50)
+    args = ap.parse_args()
+
+    print(f"{'px':>5} {'ellipses':>10} {'vectorized':>11} {'full render':>12} "
+          f"{'disk hit':>10} {'memory hit':>11}  (us per call)")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for size in args.sizes:
+            old = per_call_us(lambda: icon_util._ellipse_disc(size), args.number)
+            new = per_call_us(lambda: icon_util._radial_disc(size), args.number)
+            render = per_call_us(lambda: icon_util.render_tray_icon("restricted", size), args.number)
+
+            icon_util.get_tray_icon("restricted", size, cache_dir=cache_dir)   # writes the PNG
+
+            def disk_hit():
+                icon_util._cache.clear()
+                icon_util.get_tray_icon("restricted", size, cache_dir=cache_dir)
+
+            disk = per_call_us(disk_hit, args.number)
+            mem = per_call_us(lambda: icon_util.get_tray_icon("restricted", size, cache_dir=cache_dir),
+                              args.number * 100)
+            print(f"{size:>5} {old:>10.1f} {new:>11.1f} {render:>12.1f} {disk:>10.1f} {mem:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
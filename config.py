@@ -1,47 +1,275 @@
-"""PyYAML-based config loader with mtime hot-reload."""
+"""PyYAML-based config loader with hot-reload and a content-hash cache.
+
+Config and TimeWindow are frozen, slotted snapshots that carry their
+compiled matchers and schedule index. ConfigManager publishes a new
+snapshot by swapping one reference, so readers never lock.
+"""
+import fnmatch
+import hashlib
+import pickle
+import re
 import threading
 import time
 import os
-from dataclasses import dataclass, field
-from datetime import time as dtime
+from bisect import bisect_right
+from dataclasses import dataclass, field, replace
+from datetime import date, datetime, timedelta, time as dtime
 from pathlib import Path
-from typing import Callable, List, Optional
+from typing import Callable, FrozenSet, List, Optional, Sequence, Tuple
+
+
+class AppMatcher:
+    """
+    Compiled app_list: a frozenset of exact exe names plus one combined regex
+    for glob patterns. Patterns containing a backslash (e.g. "*\\games\\*")
+    are matched against the full exe path, all others against the exe name.
+    Matching is case-insensitive; "/" is treated as "\\".
+    """
+
+    __slots__ = ("names", "_name_re", "_path_re")
 
-import yaml
+    def __init__(self, patterns: List[str]):
+        names, name_globs, path_globs = set(), [], []
+        for p in patterns:
+            p = str(p).lower().replace("/", "\\")
+            if "\\" in p:
+                path_globs.append(p)
+            elif any(c in p for c in "*?["):
+                name_globs.append(p)
+            else:
+                names.add(p)
+        self.names = frozenset(names)
+        self._name_re = _compile_globs(name_globs)
+        self._path_re = _compile_globs(path_globs)
+
+    def matches(self, name: str, path: str = "") -> bool:
+        name = name.lower()
+        if name in self.names:
+            return True
+        if self._name_re is not None and self._name_re.match(name):
+            return True
+        if path and self._path_re is not None:
+            return self._path_re.match(path.lower().replace("/", "\\")) is not None
+        return False
+
+
+def _compile_globs(globs: List[str]) -> Optional[re.Pattern]:
+    if not globs:
+        return None
+    return re.compile("|".join(fnmatch.translate(g) for g in globs))
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TimeWindow:
     name: str
     start_time: dtime
     end_time: dtime
-    mode: str          # "whitelist" | "blacklist"
-    app_list: List[str]
+    mode: str          # "whitelist" | "blacklist" | "quota"
+    app_list: Tuple[str, ...]
     force_kill: bool = False
     allow_override: bool = True
+    kill_tree: bool = False   # force_kill also kills child processes
+    days_of_week: FrozenSet[int] = frozenset()   # 0=Mon … 6=Sun; empty = every day
+    start_date: Optional[date] = None            # first day the window starts on
+    end_date: Optional[date] = None              # last day the window starts on
+    except_dates: FrozenSet[date] = frozenset()  # days the window does not start on
+    quota_minutes: float = 0.0   # (quota only) foreground minutes per app per occurrence
+    matcher: AppMatcher = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "app_list", tuple(self.app_list))
+        object.__setattr__(self, "days_of_week", frozenset(self.days_of_week))
+        object.__setattr__(self, "except_dates", frozenset(self.except_dates))
+        object.__setattr__(self, "matcher", AppMatcher(self.app_list))
+
+    def starts_on(self, d: date) -> bool:
+        """True if an occurrence of this window begins on day *d*.
+
+        A window that crosses midnight belongs to the day it starts on, so
+        Friday 22:00–02:00 also covers early Saturday morning.
+        """
+        if self.days_of_week and d.weekday() not in self.days_of_week:
+            return False
+        if self.start_date is not None and d < self.start_date:
+            return False
+        if self.end_date is not None and d > self.end_date:
+            return False
+        return d not in self.except_dates
+
+    def started_on(self, now: datetime) -> date:
+        """Start day of the occurrence active at *now* (yesterday in the post-midnight spill)."""
+        if self.start_time > self.end_time and now.time() <= self.end_time:
+            return now.date() - _ONE_DAY
+        return now.date()
+
+
+_DAY_US = 86_400_000_000
+_ONE_DAY = timedelta(days=1)
+
+
+def _us(t: dtime) -> int:
+    """Microseconds since midnight."""
+    return ((t.hour * 60 + t.minute) * 60 + t.second) * 1_000_000 + t.microsecond
+
+
+class DayIndex:
+    """
+    Immutable interval table over one calendar day.
+
+    The day is cut into half-open segments [bounds[i], bounds[i+1]) of
+    microseconds since midnight, each owned by the index of the first window
+    (config order) covering it, or None. Window ends are inclusive, as in
+    _in_window(). *today* holds windows starting on this day; *spill* those
+    that started yesterday and run past midnight. Adjacent segments never
+    share an owner, so every boundary is a real change.
+    """
+
+    __slots__ = ("bounds", "owners")
+
+    def __init__(self, spans: Sequence[Tuple[int, int]], today: Sequence[int],
+                 spill: Sequence[int] = ()):
+        intervals = []
+        for i in today:
+            s, e = spans[i]
+            intervals.append((s, e if s < e else _DAY_US, i))
+        for i in spill:
+            intervals.append((0, spans[i][1], i))
+
+        points = sorted({0, _DAY_US, *(p for lo, hi, _ in intervals for p in (lo, hi))})
+        bounds: List[int] = []
+        owners: List[Optional[int]] = []
+        for lo in points[:-1]:
+            owner = min((i for s, e, i in intervals if s <= lo < e), default=None)
+            if not owners or owners[-1] != owner:
+                bounds.append(lo)
+                owners.append(owner)
+        self.bounds = tuple(bounds)
+        self.owners = tuple(owners)
+
+    def active(self, us: int) -> Optional[int]:
+        return self.owners[bisect_right(self.bounds, us) - 1]
+
+
+class ScheduleIndex:
+    """
+    Calendar over a list of time windows.
+
+    A day's table depends only on which windows start that day and which
+    spill over from the day before, so tables are compiled once per distinct
+    profile and shared: a plain weekly config has at most seven, and each
+    dated range or exception date adds only the profiles it actually
+    creates. The date -> table lookup is memoised, so steady-state queries
+    are one dict hit plus a bisect regardless of the number of rules.
+
+    After the last dated rule (start/end/except date) the profiles repeat
+    weekly, so next_change() stops after one quiet week past that point.
+    """
+
+    __slots__ = ("_windows", "_spans", "_profiles", "_days", "_settled")
+
+    HORIZON_DAYS = 400   # how far next_change() looks ahead before giving up
+    MAX_DAYS = 64        # memoised dates before the date cache is reset
+
+    def __init__(self, windows: Sequence[TimeWindow]):
+        self._windows = tuple(windows)
+        self._spans = tuple((_us(w.start_time), _us(w.end_time) + 1) for w in self._windows)
+        self._profiles: dict = {}
+        self._days: dict = {}
+        # First day whose profile (and the day before's spill) no dated rule affects
+        dated = [d for w in self._windows
+                 for d in (w.start_date, w.end_date, *w.except_dates) if d is not None]
+        self._settled: Optional[date] = max(dated) + 2 * _ONE_DAY if dated else None
+
+    def _crosses(self, i: int) -> bool:
+        s, e = self._spans[i]
+        return s >= e
 
+    def for_date(self, d: date) -> DayIndex:
+        idx = self._days.get(d)
+        if idx is not None:
+            return idx
+        idx = self._profile(d)
+        if len(self._days) >= self.MAX_DAYS:
+            self._days.clear()
+        self._days[d] = idx
+        return idx
 
-@dataclass
+    def _profile(self, d: date) -> DayIndex:
+        """Table for *d*, without memoising the date."""
+        prev = d - _ONE_DAY
+        today = tuple(i for i, w in enumerate(self._windows) if w.starts_on(d))
+        spill = tuple(i for i, w in enumerate(self._windows)
+                      if self._crosses(i) and w.starts_on(prev))
+        key = (today, spill)
+        idx = self._profiles.get(key)
+        if idx is None:
+            idx = self._profiles[key] = DayIndex(self._spans, today, spill)
+        return idx
+
+    def active(self, now: datetime) -> Optional[int]:
+        """Index of the window active at *now*, or None."""
+        return self.for_date(now.date()).active(_us(now.time()))
+
+    def next_change(self, now: datetime) -> Optional[datetime]:
+        """
+        First wall-clock instant after *now* at which active() changes, or
+        None if nothing changes within HORIZON_DAYS. The result is a naive
+        local time; use .timestamp() on both ends to get a DST-correct
+        number of seconds until it.
+        """
+        day = now.date()
+        idx = self.for_date(day)
+        i = bisect_right(idx.bounds, _us(now.time()))
+        if i < len(idx.bounds):
+            return datetime.combine(day, dtime()) + timedelta(microseconds=idx.bounds[i])
+        owner = idx.owners[-1]
+        # The walk goes through _profile() so it does not flush the date memo.
+        quiet_from = max(day, self._settled) if self._settled else day
+        for _ in range(self.HORIZON_DAYS):
+            day += _ONE_DAY
+            if (day - quiet_from).days > 7:
+                return None         # a full quiet week with only weekly rules left
+            idx = self._days.get(day) or self._profile(day)
+            if idx.owners[0] != owner:
+                return datetime.combine(day, dtime())
+            if len(idx.bounds) > 1:
+                return datetime.combine(day, dtime()) + timedelta(microseconds=idx.bounds[1])
+        return None
+
+
+@dataclass(frozen=True, slots=True)
 class Config:
     check_interval: float
     log_dir: str
     override_max_minutes: int
-    time_windows: List[TimeWindow]
+    time_windows: Tuple[TimeWindow, ...]
+    stall_timeout: float = 30.0   # seconds a monitor tick may overrun before the guardian restarts it
+    log_fsync: Optional[float] = None   # logger fsync: None = never, 0 = every batch, N = every N s
+    generation: int = 0   # bumped by ConfigManager on every publish
+    schedule: ScheduleIndex = field(init=False, repr=False, compare=False)
 
-    def is_restricted_now(self, t: dtime) -> Optional[TimeWindow]:
-        """Return the first active TimeWindow, or None."""
-        for w in self.time_windows:
-            if _in_window(t, w.start_time, w.end_time):
-                return w
-        return None
+    def __post_init__(self):
+        object.__setattr__(self, "time_windows", tuple(self.time_windows))
+        object.__setattr__(self, "schedule", ScheduleIndex(self.time_windows))
+
+    def is_restricted_now(self, now: datetime) -> Optional[TimeWindow]:
+        """Return the first TimeWindow active at *now*, or None."""
+        i = self.schedule.active(now)
+        return None if i is None else self.time_windows[i]
+
+    def next_change(self, now: datetime) -> Optional[datetime]:
+        """When is_restricted_now() next returns a different window (None = never)."""
+        return self.schedule.next_change(now)
 
-    def is_app_allowed(self, app_name: str, window: TimeWindow) -> bool:
-        name_lower = app_name.lower()
-        list_lower = [a.lower() for a in window.app_list]
+    def is_app_allowed(self, app_name: str, window: TimeWindow, app_path: str = "",
+                       used_minutes: float = 0.0) -> bool:
+        """*used_minutes* is the app's metered foreground time (quota windows only)."""
         if window.mode == "whitelist":
-            return name_lower in list_lower
+            return window.matcher.matches(app_name, app_path)
         elif window.mode == "blacklist":
-            return name_lower not in list_lower
+            return not window.matcher.matches(app_name, app_path)
+        elif window.mode == "quota":
+            return used_minutes < window.quota_minutes or not window.matcher.matches(app_name, app_path)
         return True
 
 
@@ -51,65 +279,217 @@ def _in_window(t: dtime, start: dtime, end: dtime) -> bool:
     return t >= start or t <= end
 
 
-def _parse(path: Path) -> Config:
-    with open(path, encoding="utf-8") as f:
-        raw = yaml.safe_load(f)
+# Bump when Config/TimeWindow change shape so pickled configs are not reused.
+CACHE_VERSION = 6
+
+
+def _parse_bytes(data: bytes, cache_dir: Optional[Path] = None) -> Config:
+    """
+    Parse config file contents. With *cache_dir*, the compiled Config is
+    pickled under the SHA-256 of *data*, so an unchanged config skips
+    importing PyYAML and recompiling on the next start.
+    """
+    cached = None
+    if cache_dir is not None:
+        digest = hashlib.sha256(data).hexdigest()[:16]
+        cached = Path(cache_dir) / f"config-v{CACHE_VERSION}-{digest}.pickle"
+        try:
+            with open(cached, "rb") as f:
+                return pickle.load(f)
+        except Exception:
+            pass
+
+    cfg = _parse_yaml(data)
+    if cached is not None:
+        _write_cache(cached, cfg)
+    return cfg
+
+
+def _write_cache(cached: Path, cfg: Config) -> None:
+    try:
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        for old in cached.parent.glob("config-*.pickle"):
+            old.unlink()
+        tmp = cached.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(cfg, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cached)
+    except OSError:
+        pass
+
+
+def _parse_yaml(data: bytes) -> Config:
+    import yaml
+    raw = yaml.safe_load(data)
 
     windows = []
     for w in raw.get("time_windows", []):
         start = dtime.fromisoformat(str(w["start_time"]))
         end   = dtime.fromisoformat(str(w["end_time"]))
+        mode = w.get("mode", "whitelist")
+        if mode == "quota" and w.get("quota_minutes") is None:
+            raise ValueError(f"time window {w['name']!r}: mode quota needs quota_minutes")
         windows.append(TimeWindow(
             name=w["name"],
             start_time=start,
             end_time=end,
-            mode=w.get("mode", "whitelist"),
-            app_list=w.get("app_list", []),
+            mode=mode,
+            app_list=tuple(w.get("app_list", [])),
             force_kill=w.get("force_kill", False),
             allow_override=w.get("allow_override", True),
+            kill_tree=w.get("kill_tree", False),
+            days_of_week=_parse_days(w.get("days_of_week")),
+            start_date=_parse_date(w.get("start_date")),
+            end_date=_parse_date(w.get("end_date")),
+            except_dates=frozenset(_parse_date(d) for d in w.get("except_dates") or ()),
+            quota_minutes=float(w.get("quota_minutes") or 0),
         ))
 
     return Config(
         check_interval=float(raw.get("check_interval", 0.5)),
         log_dir=str(raw.get("log_dir", "logs")),
         override_max_minutes=int(raw.get("override_max_minutes", 60)),
-        time_windows=windows,
+        time_windows=tuple(windows),
+        stall_timeout=float(raw.get("stall_timeout", 30)),
+        log_fsync=_parse_fsync(raw.get("log_fsync")),
     )
 
 
+_DAY_NAMES = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+_DAY_LOOKUP = {n: i for i, full in enumerate(_DAY_NAMES) for n in (full, full[:3])}
+_DAY_GROUPS = {"daily": range(7), "weekdays": range(5), "weekends": range(5, 7)}
+
+
+def _parse_days(value) -> FrozenSet[int]:
+    """days_of_week: a list of names ("mon", "Saturday" — full or three-letter)
+    or 0–6 (0 = Monday), or one of "daily", "weekdays", "weekends".
+    Missing = every day."""
+    if value is None:
+        return frozenset()
+    if isinstance(value, str):
+        key = value.strip().lower()
+        if key in _DAY_GROUPS:
+            return frozenset(_DAY_GROUPS[key])
+        value = [value]
+    days = set()
+    for v in value:
+        if isinstance(v, int) and not isinstance(v, bool) and 0 <= v <= 6:
+            days.add(v)
+        elif isinstance(v, str) and v.strip().lower() in _DAY_LOOKUP:
+            days.add(_DAY_LOOKUP[v.strip().lower()])
+        else:
+            raise ValueError(f"invalid day in days_of_week: {v!r}")
+    return frozenset(days)
+
+
+def _parse_fsync(value) -> Optional[float]:
+    """log_fsync: null/false = never, 0 = every batch, N = at most every N seconds."""
+    if value is None or value is False:
+        return None
+    if isinstance(value, bool) or float(value) < 0:
+        raise ValueError(f"invalid log_fsync: {value!r}")
+    return float(value)
+
+
+def _parse_date(value) -> Optional[date]:
+    """YAML gives unquoted dates as date objects, quoted ones as strings."""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value))
+
+
 class ConfigManager:
-    def __init__(self, path: str | Path, on_reload: Optional[Callable[[Config], None]] = None):
+    """
+    Holds the current Config and hot-reloads it. The watcher thread waits on
+    OS change notifications (fswatch), debounces bursts from editors, and
+    reparses only when the file's SHA-256 changed. An invalid file keeps the
+    last-known-good config and is reported once via *on_invalid* until a
+    valid file loads again.
+
+    Reading .config is a plain attribute load. Parsing and the callbacks run
+    outside any lock; _lock only serialises publishers.
+    """
+
+    DEBOUNCE = 0.3   # seconds of quiet before a burst of changes is handled
+
+    def __init__(self, path: str | Path, on_reload: Optional[Callable[[Config], None]] = None,
+                 cache_dir: Optional[str | Path] = None,
+                 on_invalid: Optional[Callable[[Exception], None]] = None):
         self._path = Path(path)
         self._on_reload = on_reload
-        self._lock = threading.RLock()
-        self._config: Config = _parse(self._path)
-        self._mtime: float = self._path.stat().st_mtime
+        self._on_invalid = on_invalid
+        self._cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self._lock = threading.Lock()
+        data = self._path.read_bytes()
+        self._generation = 1
+        self._config: Config = replace(_parse_bytes(data, self._cache_dir), generation=1)
+        self._hash = hashlib.sha256(data).digest()
+        self._bad_hash: Optional[bytes] = None
         self._stop = threading.Event()
         self._thread = threading.Thread(target=self._watch, daemon=True, name="config-watcher")
         self._thread.start()
 
     @property
     def config(self) -> Config:
-        with self._lock:
-            return self._config
+        return self._config
 
     def reload(self) -> Config:
-        """Force an immediate reload from disk."""
+        """Force an immediate reload from disk. Raises if the file is invalid."""
+        data = self._path.read_bytes()
+        return self._publish(_parse_bytes(data, self._cache_dir), hashlib.sha256(data).digest())
+
+    def _publish(self, cfg: Config, digest: bytes) -> Config:
         with self._lock:
-            self._config = _parse(self._path)
-            self._mtime = self._path.stat().st_mtime
-            if self._on_reload:
-                self._on_reload(self._config)
-            return self._config
+            self._generation += 1
+            cfg = replace(cfg, generation=self._generation)
+            self._config = cfg
+            self._hash = digest
+            self._bad_hash = None
+        if self._on_reload:
+            self._on_reload(cfg)
+        return cfg
+
+    def _check(self) -> None:
+        """Reload if the contents changed; remember (and report once) invalid contents."""
+        try:
+            data = self._path.read_bytes()
+        except OSError:
+            return              # mid-save or briefly missing — wait for the next event
+        digest = hashlib.sha256(data).digest()
+        if digest == self._hash:
+            self._bad_hash = None   # back to the live config: the broken spell is over
+            return
+        if digest == self._bad_hash:
+            return
+        try:
+            cfg = _parse_bytes(data, self._cache_dir)
+        except Exception as e:
+            first = self._bad_hash is None      # report once per broken spell
+            self._bad_hash = digest
+            if first and self._on_invalid:
+                self._on_invalid(e)
+            return
+        self._publish(cfg, digest)
 
     def _watch(self) -> None:
-        while not self._stop.wait(2.0):
-            try:
-                mtime = self._path.stat().st_mtime
-                if mtime != self._mtime:
-                    self.reload()
-            except Exception:
-                pass
+        from fswatch import create_watcher
+        watcher = create_watcher(self._path)
+        try:
+            while not self._stop.is_set():
+                if not watcher.wait(1.0):
+                    continue
+                while watcher.wait(self.DEBOUNCE) and not self._stop.is_set():
+                    pass
+                try:
+                    self._check()
+                except Exception:
+                    pass
+        finally:
+            watcher.close()
 
     def stop(self) -> None:
         self._stop.set()
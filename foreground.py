@@ -0,0 +1,185 @@
+"""Foreground-window sources — push foreground changes to the monitor loop.
+
+A source reports the current foreground hwnd and lets the monitor block in
+wait() until it changes (or a timeout elapses):
+
+  WinEventForegroundSource  SetWinEventHook(EVENT_SYSTEM_FOREGROUND) wakes the
+                            monitor, current() calls the getter — Windows
+  PollingForegroundSource   calls a getter on demand — fallback, never wakes early
+  ScriptedForegroundSource  replays (delay, hwnd) steps — fake for tests/benchmarks
+"""
+import sys
+import threading
+from typing import Callable, Iterable, Optional, Tuple
+
+
+class ForegroundSource:
+    """Base class. Subclasses call _publish() or wake() when the foreground changes."""
+
+    #: True when wait() returns early on foreground changes (not just on timeout).
+    event_driven = False
+
+    def __init__(self):
+        self._hwnd = 0
+        self._changed = threading.Event()
+
+    def start(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        self.wake()
+
+    def current(self) -> int:
+        return self._hwnd
+
+    def wait(self, timeout: float) -> bool:
+        """Block up to *timeout* seconds. True if woken by a change or wake()."""
+        fired = self._changed.wait(timeout)
+        self._changed.clear()
+        return fired
+
+    def wake(self) -> None:
+        """Wake a pending wait() without a foreground change (config reload etc.)."""
+        self._changed.set()
+
+    def _publish(self, hwnd: int) -> None:
+        if hwnd != self._hwnd:
+            self._hwnd = hwnd
+            self._changed.set()
+
+
+class PollingForegroundSource(ForegroundSource):
+    """Fallback: asks *get_foreground* each time current() is called."""
+
+    def __init__(self, get_foreground: Callable[[], int]):
+        super().__init__()
+        self._get = get_foreground
+
+    def current(self) -> int:
+        try:
+            self._hwnd = self._get() or 0
+        except Exception:
+            self._hwnd = 0
+        return self._hwnd
+
+
+class ScriptedForegroundSource(ForegroundSource):
+    """
+    Fake source: plays *script* — an iterable of (delay_seconds, hwnd) — on a
+    background thread, or accepts manual push() calls. Works on any platform.
+    """
+
+    event_driven = True
+
+    def __init__(self, script: Iterable[Tuple[float, int]] = (), initial: int = 0):
+        super().__init__()
+        self._hwnd = initial
+        self._script = list(script)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.done = threading.Event()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._play, daemon=True, name="fg-script")
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        super().stop()
+
+    def push(self, hwnd: int) -> None:
+        self._publish(hwnd)
+
+    def _play(self) -> None:
+        for delay, hwnd in self._script:
+            if self._stop.wait(delay):
+                break
+            self._publish(hwnd)
+        self.done.set()
+
+
+class WinEventForegroundSource(PollingForegroundSource):
+    """
+    Windows: an out-of-context WinEvent hook for EVENT_SYSTEM_FOREGROUND,
+    serviced by a dedicated message-loop thread.
+
+    Events only wake the monitor. current() still asks *get_foreground*
+    (GetForegroundWindow, a cheap user32 call), because the foreground can
+    become NULL, e.g. after the active window is minimized, without an
+    event that names it.
+    """
+
+    event_driven = True
+
+    EVENT_SYSTEM_FOREGROUND = 0x0003
+    WINEVENT_OUTOFCONTEXT = 0x0000
+    WM_QUIT = 0x0012
+
+    def __init__(self, get_foreground: Callable[[], int]):
+        super().__init__(get_foreground)
+        import ctypes
+        from ctypes import wintypes
+        self._ctypes = ctypes
+        self._user32 = ctypes.windll.user32
+        self._proc_type = ctypes.WINFUNCTYPE(
+            None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+            wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD,
+        )
+        self._proc = None          # keep the callback alive while hooked
+        self._thread_id = 0
+        self._ready = threading.Event()
+        self._error: Optional[Exception] = None
+
+    def start(self) -> None:
+        threading.Thread(target=self._run, daemon=True, name="fg-winevent").start()
+        self._ready.wait(timeout=2)
+        if self._error:
+            raise self._error
+
+    def stop(self) -> None:
+        if self._thread_id:
+            self._user32.PostThreadMessageW(self._thread_id, self.WM_QUIT, 0, 0)
+        super().stop()
+
+    def _on_event(self, hook, event, hwnd, id_obj, id_child, thread, ms) -> None:
+        if event == self.EVENT_SYSTEM_FOREGROUND:
+            self.wake()
+
+    def _run(self) -> None:
+        from ctypes import wintypes
+        user32 = self._user32
+        try:
+            self._thread_id = self._ctypes.windll.kernel32.GetCurrentThreadId()
+            self._proc = self._proc_type(self._on_event)
+            hook = user32.SetWinEventHook(
+                self.EVENT_SYSTEM_FOREGROUND, self.EVENT_SYSTEM_FOREGROUND,
+                0, self._proc, 0, 0, self.WINEVENT_OUTOFCONTEXT,
+            )
+            if not hook:
+                raise OSError("SetWinEventHook failed")
+        except Exception as e:
+            self._error = e
+            self._ready.set()
+            return
+        self._ready.set()
+
+        msg = wintypes.MSG()
+        while user32.GetMessageW(self._ctypes.byref(msg), 0, 0, 0) > 0:
+            user32.TranslateMessage(self._ctypes.byref(msg))
+            user32.DispatchMessageW(self._ctypes.byref(msg))
+        user32.UnhookWinEvent(hook)
+
+
+def create_source(get_foreground: Callable[[], int]) -> ForegroundSource:
+    """Prefer the WinEvent hook; fall back to polling *get_foreground*."""
+    if sys.platform == "win32":
+        try:
+            src = WinEventForegroundSource(get_foreground)
+            src.start()
+            return src
+        except Exception:
+            pass
+    src = PollingForegroundSource(get_foreground)
+    src.start()
+    return src
+
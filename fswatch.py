@@ -0,0 +1,181 @@
+"""File-change notification backends for the config hot-reload watcher.
+
+All backends watch the file's *directory*, so editors that save atomically
+(write temp file, rename over the original) are still seen. Notifications
+may be spurious; callers compare file contents before acting.
+
+  InotifyWatcher   Linux inotify via libc
+  WindowsWatcher   FindFirstChangeNotificationW on the directory
+  PollingWatcher   stat() every poll_interval — fallback everywhere
+"""
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+
+class FileWatcher:
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+
+    def wait(self, timeout: float) -> bool:
+        """Block up to *timeout* seconds; True if the file may have changed."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class PollingWatcher(FileWatcher):
+    def __init__(self, path: str | Path, poll_interval: float = 2.0):
+        super().__init__(path)
+        self._interval = poll_interval
+        self._sig = self._stat()
+        self._closed = False
+
+    def _stat(self) -> Optional[tuple]:
+        try:
+            st = self.path.stat()
+            return st.st_mtime_ns, st.st_size, st.st_ino
+        except OSError:
+            return None
+
+    def wait(self, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        while not self._closed:
+            sig = self._stat()
+            if sig != self._sig:
+                self._sig = sig
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(self._interval, remaining))
+        return False
+
+    def close(self) -> None:
+        self._closed = True
+
+
+class InotifyWatcher(FileWatcher):
+    IN_MODIFY = 0x002
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_NONBLOCK = os.O_NONBLOCK
+    IN_CLOEXEC = 0o2000000
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(self, path: str | Path):
+        super().__init__(path)
+        import ctypes
+        import ctypes.util
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = (self.IN_MODIFY | self.IN_CLOSE_WRITE | self.IN_MOVED_FROM
+                | self.IN_MOVED_TO | self.IN_CREATE | self.IN_DELETE)
+        wd = libc.inotify_add_watch(self._fd, os.fsencode(self.path.parent.resolve()), mask)
+        if wd < 0:
+            err = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(err, "inotify_add_watch failed")
+        self._name = os.fsencode(self.path.name)
+
+    def wait(self, timeout: float) -> bool:
+        # Events for other names in the directory (an editor's swap or temp
+        # file) do not end the wait; only the timeout or our file does.
+        deadline = time.monotonic() + timeout
+        while self._fd >= 0:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            try:
+                ready, _, _ = select.select([self._fd], [], [], remaining)
+            except (OSError, ValueError):
+                return False
+            if not ready:
+                return False
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:     # spurious wakeup
+                continue
+            except OSError:
+                return False
+            if self._mentions(data):
+                return True
+        return False
+
+    def _mentions(self, data: bytes) -> bool:
+        """True if any event in *data* is for the watched file name."""
+        pos = 0
+        while pos + self._EVENT.size <= len(data):
+            _wd, _mask, _cookie, length = self._EVENT.unpack_from(data, pos)
+            pos += self._EVENT.size
+            name = data[pos:pos + length].rstrip(b"\0")
+            pos += length
+            if name == self._name:
+                return True
+        return False
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class WindowsWatcher(FileWatcher):
+    FILE_NOTIFY_CHANGE_FILE_NAME = 0x01
+    FILE_NOTIFY_CHANGE_SIZE = 0x08
+    FILE_NOTIFY_CHANGE_LAST_WRITE = 0x10
+    WAIT_OBJECT_0 = 0
+    INVALID_HANDLE_VALUE = -1
+
+    def __init__(self, path: str | Path):
+        super().__init__(path)
+        import ctypes
+        from ctypes import wintypes
+        self._k32 = ctypes.windll.kernel32
+        self._k32.FindFirstChangeNotificationW.restype = wintypes.HANDLE
+        self._k32.FindFirstChangeNotificationW.argtypes = [wintypes.LPCWSTR, wintypes.BOOL, wintypes.DWORD]
+        self._k32.FindNextChangeNotification.argtypes = [wintypes.HANDLE]
+        self._k32.FindCloseChangeNotification.argtypes = [wintypes.HANDLE]
+        self._k32.WaitForSingleObject.argtypes = [wintypes.HANDLE, wintypes.DWORD]
+        flags = (self.FILE_NOTIFY_CHANGE_FILE_NAME | self.FILE_NOTIFY_CHANGE_SIZE
+                 | self.FILE_NOTIFY_CHANGE_LAST_WRITE)
+        h = self._k32.FindFirstChangeNotificationW(str(self.path.parent.resolve()), False, flags)
+        if not h or h == ctypes.c_void_p(self.INVALID_HANDLE_VALUE).value:
+            raise ctypes.WinError()
+        self._h = h
+
+    def wait(self, timeout: float) -> bool:
+        if not self._h:
+            return False
+        rc = self._k32.WaitForSingleObject(self._h, int(timeout * 1000))
+        if rc != self.WAIT_OBJECT_0:
+            return False
+        self._k32.FindNextChangeNotification(self._h)
+        return True
+
+    def close(self) -> None:
+        if self._h:
+            self._k32.FindCloseChangeNotification(self._h)
+            self._h = None
+
+
+def create_watcher(path: str | Path, poll_interval: float = 2.0) -> FileWatcher:
+    """Best available backend for this platform, falling back to polling."""
+    try:
+        if sys.platform.startswith("linux"):
+            return InotifyWatcher(path)
+        if sys.platform == "win32":
+            return WindowsWatcher(path)
+    except OSError:
+        pass
+    return PollingWatcher(path, poll_interval)
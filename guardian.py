@@ -10,34 +10,43 @@ Persistence vectors (all recreated every 60s if missing):
 
 Named mutex "SleepGuardianV1" ensures only one instance runs at a time —
 safe even when all three Task Scheduler tasks fire together.
+
+main.py is restarted when it exits, and also when its monitor thread
+misses its heartbeat by more than stall_timeout (see watchdog.py). A warm
+`main.py --standby` waits on the monitor lease (lease.py) and takes over
+as soon as the active process exits; the cold-start path is the fallback.
 """
 import os
 import sys
 import time
 import threading
 import subprocess
-import winreg
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
+
+import ipc
+import logger
+from lease import Standby
+from persistence import Persistence, WindowsBackend
+from watchdog import HeartbeatReader, StallDetector, supervise
 
 import win32event
 import win32api
 import winerror
-import win32com.client
 
 BASE_DIR = Path(__file__).resolve().parent
 PYTHONW = Path(sys.executable).with_name("pythonw.exe")
 MAIN_PY = BASE_DIR / "main.py"
 LOG_DIR = BASE_DIR / "logs"
 HEARTBEAT = LOG_DIR / ".guardian_heartbeat"
+MONITOR_HEARTBEAT = LOG_DIR / ".monitor_heartbeat"   # written by main.py every tick
+CONFIG_PATH = BASE_DIR / "config.yaml"
+CACHE_DIR = BASE_DIR / ".cache"
+STANDBY_DELAY = 5.0    # after a cold start, before spawning the standby
+STANDBY_RETRY = 30.0   # after a standby died or failed to spawn
 MUTEX_NAME = "SleepGuardianV1"
 
-TASK_NAMES = ["SleepGuard-1", "SleepGuard-2", "SleepGuard-3"]
-TASK_OFFSETS_SEC = [0, 20, 40]           # staggered within the 1-min repeat
-REG_KEY = r"SOFTWARE\Microsoft\Windows\CurrentVersion\Run"
-REG_VALUE = "SleepGuardian"
-STARTUP_LNK_NAME = "SleepGuardian.lnk"
-
 
 # --------------------------------------------------------------------------- mutex
 
@@ -50,92 +59,18 @@ def _acquire_mutex() -> object:
     return h
 
 
-# --------------------------------------------------------------------------- persistence helpers
-
-def _guardian_cmd() -> str:
-    return f'"{PYTHONW}" "{BASE_DIR / "guardian.py"}"'
-
-
-_NO_WINDOW = 0x08000000  # CREATE_NO_WINDOW
-
-
-def _task_exists(name: str) -> bool:
-    try:
-        result = subprocess.run(
-            ["schtasks", "/query", "/tn", name],
-            capture_output=True, text=True,
-            creationflags=_NO_WINDOW,
-        )
-        return result.returncode == 0
-    except Exception:
-        return False
-
-
-def _register_task(name: str, offset_sec: int) -> None:
-    """Register a user-level Task Scheduler task via schtasks CLI."""
-    cmd = [
-        "schtasks", "/create",
-        "/tn", name,
-        "/tr", _guardian_cmd(),
-        "/sc", "MINUTE", "/mo", "1",
-        "/f",
-        "/rl", "LIMITED",
-    ]
-    subprocess.run(cmd, capture_output=True, creationflags=_NO_WINDOW)
-
-
-def _reg_key_exists() -> bool:
-    try:
-        key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, REG_KEY)
-        winreg.QueryValueEx(key, REG_VALUE)
-        winreg.CloseKey(key)
-        return True
-    except FileNotFoundError:
-        return False
-
-
-def _set_reg_key() -> None:
-    key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, REG_KEY, 0, winreg.KEY_SET_VALUE)
-    winreg.SetValueEx(key, REG_VALUE, 0, winreg.REG_SZ, _guardian_cmd())
-    winreg.CloseKey(key)
-
-
-def _startup_lnk_path() -> Path:
-    appdata = os.environ.get("APPDATA", "")
-    return Path(appdata) / "Microsoft" / "Windows" / "Start Menu" / "Programs" / "Startup" / STARTUP_LNK_NAME
-
-
-def _startup_exists() -> bool:
-    return _startup_lnk_path().exists()
-
-
-def _create_startup_lnk() -> None:
-    shell = win32com.client.Dispatch("WScript.Shell")
-    lnk = shell.CreateShortCut(str(_startup_lnk_path()))
-    lnk.Targetpath = str(PYTHONW)
-    lnk.Arguments = f'"{BASE_DIR / "guardian.py"}"'
-    lnk.WorkingDirectory = str(BASE_DIR)
-    lnk.save()
+# --------------------------------------------------------------------------- self-heal
 
+_persistence: Optional[Persistence] = None
 
-# --------------------------------------------------------------------------- self-heal
 
 def _self_heal() -> None:
-    """Recreate any missing persistence vectors."""
+    """Recreate any missing persistence vectors (one schtasks listing per TTL)."""
+    global _persistence
     LOG_DIR.mkdir(parents=True, exist_ok=True)
-    for name, offset in zip(TASK_NAMES, TASK_OFFSETS_SEC):
-        if not _task_exists(name):
-            _register_task(name, offset)
-    if not _reg_key_exists():
-        try:
-            _set_reg_key()
-        except Exception:
-            pass
-    if not _startup_exists():
-        try:
-            _create_startup_lnk()
-        except Exception:
-            pass
+    if _persistence is None:
+        _persistence = Persistence(WindowsBackend(BASE_DIR, PYTHONW))
+    _persistence.heal()
 
 
 def _heal_loop() -> None:
@@ -155,16 +90,65 @@ def _heal_loop() -> None:
 
 # --------------------------------------------------------------------------- main-process watcher
 
-def _launch_main() -> subprocess.Popen:
+def _launch_main(standby: bool = False) -> subprocess.Popen:
     flags = 0x08000000 | 0x00000008  # CREATE_NO_WINDOW | DETACHED_PROCESS
     return subprocess.Popen(
-        [str(PYTHONW), str(MAIN_PY)],
+        [str(PYTHONW), str(MAIN_PY)] + (["--standby"] if standby else []),
         cwd=str(BASE_DIR),
         creationflags=flags,
         close_fds=True,
     )
 
 
+# --------------------------------------------------------------------------- IPC status
+
+_state = {"main_pid": None, "restarts": 0, "stalls": 0, "last_rc": None}
+_monitor_beats = HeartbeatReader(MONITOR_HEARTBEAT)
+
+
+def _ipc_status(request: dict) -> dict:
+    """
+    Answer for `setup.py --status` (IPC thread). Never spawns schtasks: the
+    task list is the cached one, plus a registry lookup and a stat of the
+    Startup shortcut. The monitor beat is read from its mapped file.
+    """
+    st = _persistence.cached() if _persistence is not None else None
+    beat = _monitor_beats.read()
+    return {
+        "pid": os.getpid(),
+        **_state,
+        "persistence": st._asdict() if st else None,
+        "monitor_beat": {
+            "pid": beat.pid, "seq": beat.seq,
+            "age_s": round(time.monotonic() - beat.ts, 3),
+        } if beat else None,
+    }
+
+
+def _load_config():
+    """Hot-reloaded config.yaml, or None if it cannot be loaded."""
+    try:
+        from config import ConfigManager
+        return ConfigManager(CONFIG_PATH, cache_dir=CACHE_DIR)
+    except Exception:
+        return None
+
+
+def _stall_detector(cfg_mgr) -> StallDetector:
+    """Stall detection with the timeout read from *cfg_mgr* (30 s without a config)."""
+    if cfg_mgr is not None:
+        timeout = lambda: cfg_mgr.config.stall_timeout
+    else:
+        timeout = lambda: 30.0
+    return StallDetector(HeartbeatReader(MONITOR_HEARTBEAT), timeout)
+
+
+def _on_stall(stall) -> None:
+    _state["stalls"] += 1
+    logger.log("monitor_stalled", pid=stall.beat.pid, seq=stall.beat.seq,
+               overdue_s=round(stall.overdue, 1))
+
+
 def main() -> int:
     mutex = _acquire_mutex()
     if mutex is None:
@@ -179,27 +163,50 @@ def main() -> int:
             time.sleep(0.2)
             return 1
 
+        cfg_mgr = _load_config()
+        logger.init(LOG_DIR, fsync=cfg_mgr.config.log_fsync if cfg_mgr else None)
+        try:
+            ipc.Server("guardian", {"status": _ipc_status})
+        except OSError:
+            pass
+        detector = _stall_detector(cfg_mgr)
+        standby = Standby(_launch_main, retry=STANDBY_RETRY)
         backoff = 1.0
         max_backoff = 30.0
+        delay = 0.0
 
         while True:
-            try:
-                proc = _launch_main()
-            except Exception:
-                time.sleep(min(backoff, max_backoff))
-                backoff = min(backoff * 2, max_backoff)
-                continue
-
-            rc = proc.wait()
+            # A parked standby has already taken over; otherwise cold-start.
+            proc = standby.promote()
+            if proc is not None:
+                logger.log("standby_promoted", pid=proc.pid)
+            else:
+                time.sleep(delay)
+                try:
+                    proc = _launch_main()
+                except Exception:
+                    delay = min(backoff, max_backoff)
+                    backoff = min(backoff * 2, max_backoff)
+                    continue
+                standby.defer(STANDBY_DELAY)
+            _state["main_pid"] = proc.pid
+
+            # Returns when main.py exits, or after killing it if its monitor
+            # thread stops beating (deadlock, hung process-table call).
+            rc = supervise(proc, detector, _on_stall, on_poll=standby.tend)
+            _state.update(main_pid=None, last_rc=rc, restarts=_state["restarts"] + 1)
 
             # Always restart. Clean exit (rc=0) = user pressed tray Exit;
-            # reset backoff and restart quickly. Only crashes increase backoff.
+            # reset backoff and restart quickly. Crashes and stalls increase
+            # backoff, which also delays the next standby so a crash loop
+            # cannot spin.
             if rc == 0:
                 backoff = 1.0
-                time.sleep(1.0)
+                delay = 1.0
             else:
-                time.sleep(min(backoff, max_backoff))
+                delay = min(backoff, max_backoff)
                 backoff = min(backoff * 2, max_backoff)
+                standby.defer(delay)
 
     finally:
         win32api.CloseHandle(mutex)
@@ -1,7 +1,10 @@
 import os
-from typing import Tuple
+from typing import Dict, Optional, Tuple
 from PIL import Image, ImageDraw
 
+# Bump when the drawing code changes so cached PNGs are regenerated.
+ICON_VERSION = 3
+
 
 def _draw_crescent(draw: ImageDraw.ImageDraw, center: Tuple[int, int], outer_r: int, thickness: int, color_outer: Tuple[int, int, int, int], color_inner: Tuple[int, int, int, int]):
     cx, cy = center
@@ -20,34 +23,69 @@ def _draw_star(draw: ImageDraw.ImageDraw, center: Tuple[int, int], r: int, fill:
     draw.line((cx, cy - r, cx, cy + r), fill=fill, width=2)
 
 
-def generate_tray_icon(path: str, size: int = 64) -> str:
-    """Generate a nicer tray icon (night sky with crescent and stars) and save to file.
+# Glow-ring colour per tray state (matches _tray_status_label in main.py).
+STATE_RING = {
+    "active":     (80, 110, 200, 100),
+    "restricted": (230, 80, 80, 170),
+    "override":   (200, 160, 255, 160),
+}
 
-    Args:
-        path: Absolute path to save the PNG icon.
-        size: Width/height in pixels (square icon).
+_cache: Dict[Tuple[str, int, int], Image.Image] = {}
 
-    Returns:
-        The path for convenience.
-    """
+
+# Per-channel ramps from the centre (28, 36, 58) to the rim (18, 24, 38).
+_GRADIENT_LUTS = tuple([int(base + span * (1 - v / 255)) for v in range(256)]
+                       for base, span in ((18, 10), (24, 12), (38, 20)))
+_radial: Optional[Image.Image] = None
+
+
+# Below this size one ellipse per radius is cheaper than resampling the
+# 256 px radial gradient; bench/bench_tray_icon.py puts the crossover near 100 px.
+_ELLIPSE_MAX = 96
+
+
+def _gradient_disc(size: int) -> Image.Image:
+    """Background disc: colour ramps from (28, 36, 58) at the centre to (18, 24, 38) at the rim."""
+    return _ellipse_disc(size) if size <= _ELLIPSE_MAX else _radial_disc(size)
+
+
+def _radial_disc(size: int) -> Image.Image:
+    """One radial-gradient image mapped through per-channel lookup tables."""
+    global _radial
+    if _radial is None:
+        _radial = Image.radial_gradient("L")   # 256x256, 0 centre → 255 rim
+    dist = _radial.resize((size, size), Image.BOX)
+    channels = [dist.point(lut) for lut in _GRADIENT_LUTS]
+    mask = Image.new("L", (size, size), 0)
+    r = size // 2
+    ImageDraw.Draw(mask).ellipse((size // 2 - r, size // 2 - r, size // 2 + r, size // 2 + r), fill=255)
+    return Image.merge("RGBA", (*channels, mask))
+
+
+def _ellipse_disc(size: int) -> Image.Image:
+    """One filled ellipse per radius, outermost first."""
+    image = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    c = size // 2
+    for i in range(c, 0, -1):
+        t = i / c
+        draw.ellipse((c - i, c - i, c + i, c + i),
+                     fill=(int(18 + 10 * (1 - t)), int(24 + 12 * (1 - t)), int(38 + 20 * (1 - t)), 255))
+    return image
+
+
+def render_tray_icon(state: str = "active", size: int = 64) -> Image.Image:
+    """Draw the tray icon (night sky with crescent and stars) for *state*."""
     width = height = size
-    image = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+    image = _gradient_disc(size)
     draw = ImageDraw.Draw(image)
 
-    # Background gradient (radial-like via concentric circles)
+    # Glow ring
     bg_center = (width // 2, height // 2)
     max_r = min(bg_center)
-    for i in range(max_r, 0, -1):
-        t = i / max_r
-        r = int(18 + 10 * (1 - t))
-        g = int(24 + 12 * (1 - t))
-        b = int(38 + 20 * (1 - t))
-        a = 255
-        draw.ellipse((bg_center[0] - i, bg_center[1] - i, bg_center[0] + i, bg_center[1] + i), fill=(r, g, b, a))
-
-    # Glow ring
     ring_r = int(max_r * 0.95)
-    draw.ellipse((bg_center[0] - ring_r, bg_center[1] - ring_r, bg_center[0] + ring_r, bg_center[1] + ring_r), outline=(80, 110, 200, 100), width=2)
+    draw.ellipse((bg_center[0] - ring_r, bg_center[1] - ring_r, bg_center[0] + ring_r, bg_center[1] + ring_r),
+                 outline=STATE_RING.get(state, STATE_RING["active"]), width=2)
 
     # Crescent moon
     crescent_r = int(size * 0.28)
@@ -66,10 +104,50 @@ def generate_tray_icon(path: str, size: int = 64) -> str:
     _draw_star(draw, (int(width * 0.38), int(height * 0.55)), r=2, fill=star_color)
     _draw_star(draw, (int(width * 0.20), int(height * 0.55)), r=2, fill=star_color)
     _draw_star(draw, (int(width * 0.48), int(height * 0.25)), r=2, fill=star_color)
+    return image
+
+
+def generate_tray_icon(path: str, size: int = 64) -> str:
+    """Generate the default ("active") tray icon and save it as PNG.
+
+    Args:
+        path: Absolute path to save the PNG icon.
+        size: Width/height in pixels (square icon).
 
-    # Ensure directory exists and save
+    Returns:
+        The path for convenience.
+    """
     os.makedirs(os.path.dirname(path), exist_ok=True)
-    image.save(path, format='PNG')
+    render_tray_icon("active", size).save(path, format='PNG')
     return path
 
 
+def get_tray_icon(state: str, size: int = 64, dpi: int = 96,
+                  cache_dir: Optional[str] = None) -> Image.Image:
+    """
+    Tray icon for (state, size, dpi), from memory, then from
+    cache_dir/tray-<state>-<px>-v<ICON_VERSION>.png, rendering only on a miss.
+    """
+    key = (state, size, dpi)
+    image = _cache.get(key)
+    if image is not None:
+        return image
+
+    px = max(16, round(size * dpi / 96))
+    path = os.path.join(cache_dir, f"tray-{state}-{px}-v{ICON_VERSION}.png") if cache_dir else None
+    if path and os.path.exists(path):
+        try:
+            with Image.open(path) as f:
+                image = f.convert("RGBA")
+        except OSError:
+            image = None
+    if image is None:
+        image = render_tray_icon(state, px)
+        if path:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                image.save(path, format='PNG')
+            except OSError:
+                pass
+    _cache[key] = image
+    return image
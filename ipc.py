@@ -0,0 +1,108 @@
+"""Local request/response status endpoints served by main.py and guardian.py.
+
+Transport is multiprocessing.connection: a named pipe \\\\.\\pipe\\Sleeper-<name>
+on Windows, a Unix socket in the temp directory elsewhere. Messages are
+JSON sent with send_bytes/recv_bytes. Nothing is pickled, so a client can
+never make a server execute code. Requests look like {"op": "status"};
+replies are {"ok": true, "result": ...} or {"ok": false, "error": ...}.
+"""
+import errno
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+from multiprocessing.connection import Client, Listener
+from typing import Callable, Dict, Optional, Tuple
+
+MAX_MESSAGE = 64 * 1024
+IDLE_TIMEOUT = 1.0   # seconds a connected client may take to send its request
+
+Handler = Callable[[dict], object]
+
+
+def address(name: str) -> Tuple[str, str]:
+    """(address, family) of endpoint *name*."""
+    if sys.platform == "win32":
+        return rf"\\.\pipe\Sleeper-{name}", "AF_PIPE"
+    return os.path.join(tempfile.gettempdir(), f"sleeper-{name}.sock"), "AF_UNIX"
+
+
+def _clear_stale_socket(path: str) -> None:
+    """
+    Unlink *path* if it was left behind by a holder that died (connecting is
+    refused). Raises EADDRINUSE if a live server still answers on it.
+    """
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except ConnectionRefusedError:
+        os.unlink(path)
+        return
+    except OSError:
+        return          # missing, or not ours to judge — Listener reports it
+    finally:
+        probe.close()
+    raise OSError(errno.EADDRINUSE, "endpoint is already being served", path)
+
+
+class Server:
+    """Serves *handlers* (op -> fn(request) -> JSON-able result) on a daemon thread."""
+
+    def __init__(self, name: str, handlers: Dict[str, Handler]):
+        self._handlers = handlers
+        addr, family = address(name)
+        if family == "AF_UNIX":
+            _clear_stale_socket(addr)
+        self._listener = Listener(addr, family)
+        self._closed = False
+        self._thread = threading.Thread(target=self._serve, daemon=True, name=f"ipc-{name}")
+        self._thread.start()
+
+    def _serve(self) -> None:
+        while not self._closed:
+            try:
+                conn = self._listener.accept()
+            except OSError:
+                if self._closed:
+                    return
+                continue
+            try:
+                with conn:
+                    while conn.poll(IDLE_TIMEOUT):
+                        conn.send_bytes(self._reply(conn.recv_bytes(MAX_MESSAGE)))
+            except (OSError, EOFError):
+                pass
+
+    def _reply(self, raw: bytes) -> bytes:
+        try:
+            req = json.loads(raw)
+            handler = self._handlers[req["op"]]
+            reply = {"ok": True, "result": handler(req)}
+        except KeyError as e:
+            reply = {"ok": False, "error": f"unknown or missing op: {e}"}
+        except Exception as e:
+            reply = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        return json.dumps(reply, ensure_ascii=False, default=str).encode("utf-8")
+
+    def close(self) -> None:
+        self._closed = True
+        try:
+            self._listener.close()
+        except OSError:
+            pass
+
+
+def request(name: str, op: str = "status", timeout: float = 0.5, **args) -> Optional[object]:
+    """The result of *op* on endpoint *name*, or None if it is not running or failed."""
+    addr, family = address(name)
+    try:
+        with Client(addr, family) as conn:
+            conn.send_bytes(json.dumps({"op": op, **args}).encode("utf-8"))
+            if not conn.poll(timeout):
+                return None
+            reply = json.loads(conn.recv_bytes(MAX_MESSAGE))
+    except (OSError, EOFError, ValueError):
+        return None
+    return reply.get("result") if reply.get("ok") else None
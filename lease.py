@@ -0,0 +1,148 @@
+"""Single-enforcer lease shared by main.py processes.
+
+Every main.py takes the lease before it starts enforcing, and holds it
+until the process exits. The OS releases it when the holder dies (even
+when it is killed), which immediately wakes the next waiter. That waiter is
+normally the guardian's warm standby. The handoff therefore needs no
+polling and no cooperation from the outgoing process.
+
+The holder must keep its Lease object referenced for as long as it holds
+the lease. On Windows, freeing it closes the last handle to the named
+mutex, which deletes the mutex, and the next waiter would then create a
+fresh, unowned one.
+
+  MutexLease   Windows named mutex (an abandoned mutex counts as acquired)
+  FileLease    fcntl.flock on a lock file (Linux / macOS)
+  LocalLease   in-process stand-in for tests
+
+Standby keeps that waiter alive for the guardian.
+"""
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+
+class Lease:
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Block until the lease is ours (or *timeout* seconds pass). True if acquired."""
+        raise NotImplementedError
+
+    def release(self) -> None:
+        raise NotImplementedError
+
+
+class MutexLease(Lease):
+    WAIT_OBJECT_0 = 0x00
+    WAIT_ABANDONED = 0x80
+    INFINITE = 0xFFFFFFFF
+
+    def __init__(self, name: str):
+        import win32event
+        self._win32event = win32event
+        self._h = win32event.CreateMutex(None, False, name)
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        ms = self.INFINITE if timeout is None else int(timeout * 1000)
+        rc = self._win32event.WaitForSingleObject(self._h, ms)
+        return rc in (self.WAIT_OBJECT_0, self.WAIT_ABANDONED)
+
+    def release(self) -> None:
+        self._win32event.ReleaseMutex(self._h)
+
+
+class FileLease(Lease):
+    def __init__(self, path: str | Path):
+        import fcntl
+        self._fcntl = fcntl
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        if timeout is None:
+            self._fcntl.flock(self._fd, self._fcntl.LOCK_EX)
+            return True
+        import time
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                self._fcntl.flock(self._fd, self._fcntl.LOCK_EX | self._fcntl.LOCK_NB)
+                return True
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    return False
+                time.sleep(0.01)
+
+    def release(self) -> None:
+        self._fcntl.flock(self._fd, self._fcntl.LOCK_UN)
+
+
+class LocalLease(Lease):
+    """Leases with the same name share one lock within this process."""
+
+    _locks: Dict[str, threading.Lock] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, name: str):
+        with self._registry_lock:
+            self._lock = self._locks.setdefault(name, threading.Lock())
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        return self._lock.acquire(timeout=-1 if timeout is None else timeout)
+
+    def release(self) -> None:
+        self._lock.release()
+
+
+class Standby:
+    """
+    The warm `main.py --standby` process. It waits on the monitor lease, so
+    it starts enforcing by itself the moment the active main.py exits;
+    promote() only hands the process over to the supervise loop.
+
+    *launch(standby=True)* starts the process and returns a Popen-like
+    object (only poll() and pid are used).
+    """
+
+    def __init__(self, launch: Callable[..., object], retry: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self._launch = launch
+        self._retry = retry
+        self._clock = clock
+        self.proc = None
+        self._due = 0.0
+
+    def defer(self, seconds: float) -> None:
+        """Do not (re)spawn for *seconds* — after a crash, or to keep a cold start uncontended."""
+        self._due = max(self._due, self._clock() + seconds)
+
+    def tend(self) -> None:
+        """Spawn a standby if none is alive and one is due."""
+        if self.proc is not None:
+            if self.proc.poll() is None:
+                return
+            self.proc = None
+            self.defer(self._retry)     # died while parked — don't spin
+        if self._clock() < self._due:
+            return
+        try:
+            self.proc = self._launch(standby=True)
+        except Exception:
+            self.defer(self._retry)
+
+    def promote(self):
+        """The live standby, now the active process; None if there is none."""
+        proc, self.proc = self.proc, None
+        if proc is not None and proc.poll() is None:
+            return proc
+        return None
+
+
+def create_lease(name: str, lock_dir: str | Path) -> Lease:
+    """Platform lease called *name*; on POSIX a lock file in *lock_dir*."""
+    if sys.platform == "win32":
+        return MutexLease(name)
+    return FileLease(Path(lock_dir) / f"{name}.lock")
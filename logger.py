@@ -1,18 +1,146 @@
-"""Structured JSONL event logger for Sleeper."""
+"""Structured JSONL event logger for Sleeper.
+
+log() never touches the disk: records go onto a bounded in-memory queue that
+a background writer drains in batches through a persistent per-day handle.
+When the queue is full the oldest record is dropped and a "log_dropped"
+record with the count is written with the next batch.
+"""
+import atexit
 import json
+import os
 import threading
+import time
+from collections import deque
 from datetime import datetime
 from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
 
 
 _lock = threading.Lock()
 _log_dir: Path = Path("logs")
+_writer: Optional["_Writer"] = None     # started by the first log() call
+_fsync: Optional[float] = None
+_max_queue = 10_000
+
+
+class _Writer:
+    """Background batching writer. fsync: None = never, 0 = every batch, N = at most every N s."""
+
+    def __init__(self, log_dir: Path, max_queue: int, fsync: Optional[float]):
+        self._dir = log_dir
+        self._max = max_queue
+        self._fsync = fsync
+        self._cond = threading.Condition()
+        self._queue: deque = deque()
+        self._dropped = 0
+        self._queued = 0      # records ever enqueued
+        self._done = 0        # records ever taken off the queue and written (or failed)
+        self._closing = False
+        self._fh = None
+        self._fh_day: Optional[str] = None
+        self._last_sync = 0.0
+        self._thread = threading.Thread(target=self._run, daemon=True, name="log-writer")
+        self._thread.start()
+
+    def put(self, day: str, line: str) -> None:
+        with self._cond:
+            if len(self._queue) >= self._max:
+                self._queue.popleft()
+                self._dropped += 1
+                self._done += 1
+            self._queue.append((day, line))
+            self._queued += 1
+            self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything queued so far is written. False on timeout."""
+        with self._cond:
+            target = self._queued
+            return self._cond.wait_for(lambda: self._done >= target, timeout)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or self._dropped or self._closing)
+                batch = list(self._queue)
+                self._queue.clear()
+                dropped, self._dropped = self._dropped, 0
+                closing = self._closing
+            if dropped:
+                record = {"ts": datetime.now().isoformat(timespec="seconds"),
+                          "event": "log_dropped", "details": {"count": dropped}}
+                batch.insert(0, (record["ts"][:10], json.dumps(record, ensure_ascii=False)))
+            failed = self._write(batch)
+            lost = failed
+            if dropped and failed == len(batch):
+                lost += dropped - 1   # the log_dropped record itself was lost
+            with self._cond:
+                self._done += len(batch) - (1 if dropped else 0)
+                self._dropped += lost
+                self._cond.notify_all()
+            if closing:
+                self._close_file()
+                return
+            if failed:
+                time.sleep(1.0)   # disk trouble — don't spin
+
+    def _write(self, batch: list) -> int:
+        """Write *batch*; returns the number of lines that could not be written."""
+        written = 0
+        try:
+            for day, line in batch:
+                if day != self._fh_day:
+                    self._close_file()
+                    self._fh = open(self._dir / f"{day}.jsonl", "a", encoding="utf-8")
+                    self._fh_day = day
+                self._fh.write(line + "\n")
+                written += 1
+            if self._fh:
+                self._fh.flush()
+                self._maybe_fsync()
+        except OSError:
+            self._close_file()
+        return len(batch) - written
+
+    def _maybe_fsync(self) -> None:
+        if self._fsync is None:
+            return
+        now = time.monotonic()
+        if now - self._last_sync >= self._fsync:
+            os.fsync(self._fh.fileno())
+            self._last_sync = now
 
+    def _close_file(self) -> None:
+        if self._fh:
+            try:
+                self._fh.close()
+            except OSError:
+                pass
+        self._fh = None
+        self._fh_day = None
 
-def init(log_dir: str | Path = "logs") -> None:
-    global _log_dir
-    _log_dir = Path(log_dir)
-    _log_dir.mkdir(parents=True, exist_ok=True)
+
+def init(log_dir: str | Path = "logs", fsync: Optional[float] = None,
+         max_queue: int = 10_000) -> None:
+    """Set the log directory. Read-only users never start the writer thread."""
+    global _log_dir, _writer, _fsync, _max_queue
+    with _lock:
+        if _writer is not None:
+            _writer.close()
+            _writer = None
+        _log_dir = Path(log_dir)
+        _log_dir.mkdir(parents=True, exist_ok=True)
+        _fsync, _max_queue = fsync, max_queue
+
+
+def log_dir() -> Path:
+    return _log_dir
 
 
 def _log_path() -> Path:
@@ -20,26 +148,121 @@ def _log_path() -> Path:
 
 
 def log(event: str, **details) -> None:
+    global _writer
     record = {"ts": datetime.now().isoformat(timespec="seconds"), "event": event}
     if details:
         record["details"] = details
     line = json.dumps(record, ensure_ascii=False)
+    writer = _writer
+    if writer is None:
+        with _lock:
+            if _writer is None:
+                _log_dir.mkdir(parents=True, exist_ok=True)
+                _writer = _Writer(_log_dir, _max_queue, _fsync)
+            writer = _writer
+    writer.put(record["ts"][:10], line)
+
+
+def flush(timeout: Optional[float] = 2.0) -> bool:
+    """Wait until every record logged so far is on disk (or *timeout* passes)."""
+    writer = _writer
+    return writer.flush(timeout) if writer else True
+
+
+def shutdown(timeout: Optional[float] = 2.0) -> None:
+    """Drain the queue and close the file. Registered with atexit."""
+    global _writer
     with _lock:
-        with open(_log_path(), "a", encoding="utf-8") as f:
-            f.write(line + "\n")
+        writer, _writer = _writer, None
+    if writer:
+        writer.close(timeout)
+
+
+atexit.register(shutdown)
+
+
+def _iter_lines(lines: Iterable[bytes], events: Optional[Iterable[str]] = None,
+                predicate: Optional[Callable[[dict], bool]] = None) -> Iterator[dict]:
+    """
+    Decode JSONL *lines*. With *events*, lines that do not contain the encoded
+    '"event": "<name>"' bytes are skipped before json.loads, and the decoded
+    event is checked exactly afterwards. *predicate* filters decoded records.
+    """
+    wanted = needles = None
+    if events is not None:
+        wanted = frozenset(events)
+        needles = tuple(('"event": ' + json.dumps(e, ensure_ascii=False)).encode("utf-8")
+                        for e in wanted)
+    for raw in lines:
+        if needles is not None and not any(n in raw for n in needles):
+            continue
+        raw = raw.strip()
+        if not raw:
+            continue
+        try:
+            record = json.loads(raw)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            continue
+        if wanted is not None and record.get("event") not in wanted:
+            continue
+        if predicate is not None and not predicate(record):
+            continue
+        yield record
+
+
+def iter_file(path: Path, events: Optional[Iterable[str]] = None,
+              predicate: Optional[Callable[[dict], bool]] = None) -> Iterator[dict]:
+    """Stream the records of one log file."""
+    with open(path, "rb") as f:
+        yield from _iter_lines(f, events, predicate)
 
 
 def _read_file(path: Path) -> list[dict]:
-    records = []
-    with open(path, encoding="utf-8") as f:
-        for raw in f:
-            raw = raw.strip()
-            if raw:
-                try:
-                    records.append(json.loads(raw))
-                except json.JSONDecodeError:
-                    pass
-    return records
+    return list(iter_file(path))
+
+
+class LogTail:
+    """
+    Incremental reader for today's log file.
+
+    Remembers the file's identity (path + inode) and byte offset and returns
+    only records appended since the previous call. A trailing line without a
+    newline is held back until it is complete.
+    """
+
+    def __init__(self):
+        self._path: Optional[Path] = None
+        self._ino: Optional[int] = None
+        self._offset = 0
+        self._partial = b""
+
+    def read_new(self) -> tuple[bool, list[dict]]:
+        """
+        Return (reset, records). reset is True when the caller should discard
+        what it has: first call, day rollover, or the file was replaced or
+        truncated. records are then read from the start of the current file.
+        """
+        path = _log_path()
+        try:
+            st = path.stat()
+            ino = st.st_ino
+            size = st.st_size
+        except FileNotFoundError:
+            ino, size = None, 0
+        reset = False
+        if path != self._path or ino != self._ino or size < self._offset:
+            self._path, self._ino, self._offset, self._partial = path, ino, 0, b""
+            reset = True
+        if size == self._offset:
+            return reset, []
+
+        with open(path, "rb") as f:
+            f.seek(self._offset)
+            data = f.read(size - self._offset)
+        self._offset += len(data)
+        lines = (self._partial + data).split(b"\n")
+        self._partial = lines.pop()
+        return reset, list(_iter_lines(lines))
 
 
 def read_today() -> list[dict]:
@@ -49,22 +272,26 @@ def read_today() -> list[dict]:
     return _read_file(path)
 
 
-def read_all_logs() -> list[dict]:
-    """Read every *.jsonl file in log_dir, sorted chronologically."""
-    records = []
+def iter_range(start_date: str = "0000-00-00", end_date: str = "9999-12-31",
+               events: Optional[Iterable[str]] = None,
+               predicate: Optional[Callable[[dict], bool]] = None) -> Iterator[dict]:
+    """
+    Stream records from start_date to end_date inclusive (YYYY-MM-DD strings),
+    file by file in chronological order. See _iter_lines for *events* and
+    *predicate*.
+    """
     if not _log_dir.exists():
-        return records
+        return
     for path in sorted(_log_dir.glob("*.jsonl")):
-        records.extend(_read_file(path))
-    return records
+        if start_date <= path.stem <= end_date:
+            yield from iter_file(path, events, predicate)
+
+
+def read_all_logs() -> list[dict]:
+    """Read every *.jsonl file in log_dir, sorted chronologically."""
+    return list(iter_range())
 
 
 def read_range(start_date: str, end_date: str) -> list[dict]:
     """Read logs from start_date to end_date inclusive (YYYY-MM-DD strings)."""
-    records = []
-    if not _log_dir.exists():
-        return records
-    for path in sorted(_log_dir.glob("*.jsonl")):
-        if start_date <= path.stem <= end_date:
-            records.extend(_read_file(path))
-    return records
+    return list(iter_range(start_date, end_date))
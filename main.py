@@ -1,10 +1,17 @@
-"""Sleeper — main monitoring process."""
+"""Sleeper — main monitoring process.
+
+Startup is ordered for the guardian's restart gap: only what enforcement
+needs is imported at module level, the monitor thread starts first, and
+tkinter / pystray / PIL are imported afterwards by the UI threads.
+
+With --standby the process does all of that up front and then waits on the
+monitor lease, so it takes over within milliseconds of the active one exiting.
+"""
 import os
 import sys
-import time
+import subprocess
 import threading
-import tkinter as tk
-from tkinter import ttk, messagebox
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional
@@ -12,60 +19,150 @@ from typing import Optional
 import win32gui
 import win32process
 import win32con
-import psutil
-import pystray
-from PIL import Image
 
+import ipc
 import logger
-from config import Config, ConfigManager
-from overlay import ViolationOverlay
-from status_window import StatusWindow
+from activity import ActivityLog
+from config import Config, ConfigManager, TimeWindow
+from foreground import ForegroundSource, create_source
+from lease import Lease, create_lease
+from proctable import ExeCache, ProcessIndex, PsutilTable
+from scheduler import TickScheduler
+from state import StateStore, restore_deadline
+from usage import UsageAccountant
+from watchdog import Heartbeat
 
 BASE_DIR = Path(__file__).resolve().parent
 CONFIG_PATH = BASE_DIR / "config.yaml"
+CACHE_DIR = BASE_DIR / ".cache"
+MONITOR_HEARTBEAT = BASE_DIR / "logs" / ".monitor_heartbeat"   # read by guardian.py
+LEASE_NAME = "SleeperMonitorV1"   # held by the one main.py that is enforcing
+STATE_PATH = BASE_DIR / "logs" / ".state.json"   # runtime state carried across restarts
+
+
+class _NullOverlay:
+    """Stands in for ViolationOverlay until the Tk thread is up."""
+
+    def show(self, *args, **kwargs) -> None:
+        pass
+
+    def hide(self) -> None:
+        pass
+
+    def destroy(self) -> None:
+        pass
+
+    def stats(self) -> dict:
+        return {}
+
+
+def _system_dpi() -> int:
+    try:
+        import ctypes
+        return ctypes.windll.user32.GetDpiForSystem() or 96
+    except Exception:
+        return 96
 
 
 class Sleeper:
-    def __init__(self):
-        self._cfg_mgr = ConfigManager(CONFIG_PATH, on_reload=self._on_config_reload)
-        logger.init(BASE_DIR / self._cfg_mgr.config.log_dir)
+    def __init__(self, lease: Lease, promoted_at: Optional[float] = None,
+                 fg: Optional[ForegroundSource] = None):
+        # Held for the life of the process: on Windows, dropping the last
+        # handle to the named mutex deletes it, and a standby would then
+        # create a fresh one and start enforcing alongside us.
+        self._lease = lease
+        # time.time() a warm standby took the lease; None for a cold start
+        self._promoted_at = promoted_at
+
+        # Foreground-change events (WinEvent hook, polling fallback; *fg* for benchmarks)
+        self._fg: ForegroundSource = fg or create_source(win32gui.GetForegroundWindow)
+
+        self._cfg_mgr = ConfigManager(CONFIG_PATH, on_reload=self._on_config_reload,
+                                      cache_dir=CACHE_DIR, on_invalid=self._on_config_invalid)
+        logger.init(BASE_DIR / self._cfg_mgr.config.log_dir,
+                    fsync=self._cfg_mgr.config.log_fsync)
         logger.log("app_start")
 
         # Override state
         self._override_until: Optional[datetime] = None
         self._override_lock = threading.Lock()
 
-        # Violation rate-limiting: last log time per window name
-        self._last_overlay: dict[str, datetime] = {}
+        # Foreground transitions and coalesced violation records
+        self._activity = ActivityLog()
+
+        # pid -> exe path, validated by process create time
+        self._exe_cache = ExeCache()
+
+        # name -> pids, refreshed incrementally for force-kill
+        self._procs = ProcessIndex()
 
+        # Adaptive sleep between monitor ticks
+        self._ticks = TickScheduler(event_driven=self._fg.event_driven)
 
-        # Tkinter root (for dialogs and StatusWindow)
-        self._tk_root: tk.Tk = None  # type: ignore
+        # Foreground minutes per app for quota windows
+        self._usage = UsageAccountant()
+
+        # Snapshot of the above, restored so a restart resumes warm
+        self._state = StateStore(STATE_PATH)
+        self._restore_state(self._state.load())
+        self._state.add("override_until", self._override_expiry)
+        self._state.add("violations", self._activity.export)
+        self._state.add("exe_cache", self._exe_cache.export)
+        self._state.add("usage", self._usage.snapshot)
+
+        # Per-tick heartbeat for the guardian's stall detection
+        try:
+            self._heartbeat: Optional[Heartbeat] = Heartbeat(MONITOR_HEARTBEAT)
+        except (OSError, ValueError):
+            self._heartbeat = None
+
+        # Set on exit; the monitor thread does the final flush and save itself
+        self._stop = threading.Event()
+        self._monitor: Optional[threading.Thread] = None
+
+        # Tkinter root (for overlay and override dialog)
+        self._tk_root = None
         self._tk_ready = threading.Event()
 
         # Components (built after tk root is ready)
-        self._overlay: Optional[ViolationOverlay] = None
-        self._status_win: Optional[StatusWindow] = None
-        self._icon: Optional[pystray.Icon] = None
+        self._overlay = _NullOverlay()
+        self._status_proc: Optional[subprocess.Popen] = None   # Status & Logs UI
+        self._published: Optional[tuple] = None    # (rule name, override_until)
+        self._tick_started = 0.0                   # perf_counter() at the top of the tick
+        self._tick_ms = (0.0, 0.0)                 # (last, max) tick processing time
+        self._icon = None
+        self._tray_state: Optional[str] = None
 
     # ----------------------------------------------------------------- startup
 
     def run(self) -> None:
+        # Enforce first; the UI comes up behind it.
+        self._monitor = threading.Thread(target=self._monitor_loop, daemon=True, name="monitor")
+        self._monitor.start()
+        try:
+            ipc.Server("main", {"status": self._ipc_status})
+        except OSError:
+            pass
+
         threading.Thread(target=self._tk_thread, daemon=True, name="tk-main").start()
         self._tk_ready.wait(timeout=5)
 
+        from overlay import ViolationOverlay
         self._overlay = ViolationOverlay(self._tk_root, on_override_click=self._open_override_dialog)
-        self._status_win = StatusWindow(self._tk_root, lambda: self._cfg_mgr.config)
-
-        threading.Thread(target=self._monitor_loop, daemon=True, name="monitor").start()
 
         self._icon = self._build_tray()
+        if self._tray_state:
+            self._icon.icon = self._tray_image(self._tray_state)   # state may have moved meanwhile
         self._icon.run()  # blocks main thread
+        self._stop.set()
+        self._fg.wake()
+        self._monitor.join(timeout=5)
         logger.log("app_exit")
 
     # ----------------------------------------------------------------- Tk root
 
     def _tk_thread(self) -> None:
+        import tkinter as tk
         self._tk_root = tk.Tk()
         self._tk_root.withdraw()
         self._tk_ready.set()
@@ -73,11 +170,15 @@ class Sleeper:
 
     # ----------------------------------------------------------------- tray
 
-    def _build_tray(self) -> pystray.Icon:
-        from icon_util import generate_tray_icon
-        ico_path = str(BASE_DIR / "sleeper64.ico")
-        generate_tray_icon(ico_path, size=64)
-        image = Image.open(ico_path)
+    def _tray_image(self, state: str):
+        from icon_util import get_tray_icon
+        return get_tray_icon(state, size=64, dpi=_system_dpi(), cache_dir=str(CACHE_DIR))
+
+    def _build_tray(self):
+        import pystray
+        for state in ("active", "restricted", "override"):
+            self._tray_image(state)   # warm the cache so swaps never render
+        image = self._tray_image(self._tray_state or "active")
 
         icon = pystray.Icon("sleeper", image, "Sleeper", menu=pystray.Menu(
             pystray.MenuItem(self._tray_status_label, None, enabled=False),
@@ -89,13 +190,13 @@ class Sleeper:
 
     def _can_override_now(self) -> bool:
         cfg = self._cfg_mgr.config
-        window = cfg.is_restricted_now(datetime.now().time())
+        window = cfg.is_restricted_now(datetime.now())
         return bool(window and window.allow_override)
 
     def _tray_status_label(self, item) -> str:
         now = datetime.now()
         cfg = self._cfg_mgr.config
-        w = cfg.is_restricted_now(now.time())
+        w = cfg.is_restricted_now(now)
         with self._override_lock:
             if self._override_until and now < self._override_until and (w is None or w.allow_override):
                 remaining = int((self._override_until - now).total_seconds() / 60)
@@ -105,7 +206,15 @@ class Sleeper:
         return "✅ Sleeper — Active"
 
     def _tray_status(self, icon, item):
-        self._tk_root.after(0, self._status_win.toggle)
+        """Open Status & Logs in its own process (keeps matplotlib out of the monitor)."""
+        if self._status_proc and self._status_proc.poll() is None:
+            return
+        self._status_proc = subprocess.Popen(
+            [sys.executable, str(BASE_DIR / "status_window.py")],
+            cwd=str(BASE_DIR),
+            creationflags=0x08000000,   # CREATE_NO_WINDOW
+            close_fds=True,
+        )
 
     def _tray_restart(self, icon, item):
         """Exit cleanly — guardian will relaunch main.py automatically."""
@@ -118,6 +227,7 @@ class Sleeper:
 
     def _open_override_dialog(self) -> None:
         """Show the Emergency Override dialog (Tk thread)."""
+        import tkinter as tk
         if not self._can_override_now():
             return
 
@@ -167,6 +277,7 @@ class Sleeper:
             with self._override_lock:
                 self._override_until = until
             logger.log("override_granted", reason=reason, minutes=mins)
+            self._fg.wake()
             dlg.destroy()
 
         tk.Button(dlg, text="Confirm Override", command=confirm,
@@ -175,61 +286,169 @@ class Sleeper:
 
     # ----------------------------------------------------------------- helpers
 
+    def _override_expiry(self) -> Optional[float]:
+        until = self._override_until
+        return until.timestamp() if until else None
+
+    def _restore_state(self, sections: dict) -> None:
+        """
+        Resume from the last snapshot. Every section is optional and checked:
+        an override is dropped if it has expired and capped at
+        override_max_minutes from now (the clock may have moved back), and
+        malformed sections are ignored.
+        """
+        until = restore_deadline(sections.get("override_until"), datetime.now(),
+                                 timedelta(minutes=self._cfg_mgr.config.override_max_minutes))
+        if until is not None:
+            self._override_until = until
+            logger.log("override_restored", until=until.isoformat(timespec="seconds"))
+        for name, restore in (("violations", self._activity.restore),
+                              ("exe_cache", self._exe_cache.restore),
+                              ("usage", self._usage.restore)):
+            try:
+                restore(sections.get(name) or ())
+            except (TypeError, ValueError, AttributeError):
+                pass
+
     def _on_config_reload(self, cfg: Config) -> None:
-        logger.log("config_reloaded")
+        logger.log("config_reloaded", generation=cfg.generation)
+        self._fg.wake()
+
+    def _on_config_invalid(self, error: Exception) -> None:
+        logger.log("config_invalid", error=str(error))
 
-    def _get_active_app(self) -> tuple[int, str, str, int]:
-        """Returns (hwnd, window_title, exe_basename, pid). hwnd=0 on failure."""
+    def _get_active_app(self) -> tuple[int, str, str, int, str]:
+        """Returns (hwnd, window_title, exe_basename, pid, exe_path). hwnd=0 on failure."""
         try:
-            hwnd = win32gui.GetForegroundWindow()
+            hwnd = self._fg.current()
             if not hwnd:
-                return 0, "", "", 0
+                return 0, "", "", 0, ""
             title = win32gui.GetWindowText(hwnd)
             _, pid = win32process.GetWindowThreadProcessId(hwnd)
             if not pid:
-                return hwnd, title, "", 0
-            proc = psutil.Process(pid)
-            return hwnd, title, os.path.basename(proc.exe()).lower(), pid
+                return hwnd, title, "", 0, ""
+            path = self._exe_cache.lookup(pid)
+            return hwnd, title, os.path.basename(path), pid, path
         except Exception:
-            return 0, "", "", 0
+            return 0, "", "", 0, ""
 
 
+    def _log_startup_time(self, pid: int) -> None:
+        """Record process start (or standby promotion) → first enforcement tick."""
+        if self._promoted_at is not None:
+            logger.log("first_tick", takeover_ms=round((time.time() - self._promoted_at) * 1000))
+            return
+        try:
+            ms = (time.time() - PsutilTable().create_time(pid)) * 1000
+        except Exception:
+            return
+        logger.log("first_tick", startup_ms=round(ms))
+
+    def _ipc_status(self, request: dict) -> dict:
+        """Answer for `setup.py --status` and the Status window (IPC thread)."""
+        rule, override_until = self._published or (None, None)
+        last_ms, max_ms = self._tick_ms
+        return {
+            "pid": os.getpid(),
+            "rule": rule,
+            "override_until": override_until.isoformat(timespec="seconds") if override_until else None,
+            "config_generation": self._cfg_mgr.config.generation,
+            "tick_ms": {"last": round(last_ms, 3), "max": round(max_ms, 3)},
+            "ticks": self._ticks.stats(),
+            "exe_cache": self._exe_cache.stats(),
+            "overlay": self._overlay.stats(),
+        }
+
+    def _publish_status(self, window: Optional[TimeWindow], override_until: Optional[datetime]) -> None:
+        """On a rule or override change: record it for IPC and swap the tray icon."""
+        state = (window.name if window else None, override_until)
+        if state == self._published:
+            return
+        self._published = state
+
+        tray_state = "override" if override_until else "restricted" if window else "active"
+        if tray_state != self._tray_state:
+            self._tray_state = tray_state
+            if self._icon is not None:
+                try:
+                    self._icon.icon = self._tray_image(tray_state)
+                except Exception:
+                    pass
+
+    def _tick(self, mode: str, cfg: Config, now: datetime,
+              until: Optional[datetime] = None, key=None) -> None:
+        """Sleep as long as the scheduler allows; a foreground change ends it early."""
+        # Via timestamp() so a DST shift between now and until is accounted for.
+        deadline = until.timestamp() - now.timestamp() if until else None
+        delay = self._ticks.delay(mode, cfg.check_interval, deadline, key)
+        ms = (time.perf_counter() - self._tick_started) * 1000
+        self._tick_ms = (ms, max(ms, self._tick_ms[1]))
+        if self._heartbeat is not None:
+            self._heartbeat.beat(delay)
+        if self._fg.wait(delay):
+            self._ticks.changed()
+
     # ----------------------------------------------------------------- monitor loop
 
     def _monitor_loop(self) -> None:
         my_pid = os.getpid()
-        while True:
+        self._log_startup_time(my_pid)
+        while not self._stop.is_set():
+            self._tick_started = time.perf_counter()
             cfg = self._cfg_mgr.config
             now = datetime.now()
-            window = cfg.is_restricted_now(now.time())
+            window = cfg.is_restricted_now(now)
+            boundary = cfg.next_change(now)
 
             # If override active, skip enforcement only when the active window allows it.
             with self._override_lock:
-                if self._override_until:
+                override_until = self._override_until
+                if override_until:
                     if window is not None and not window.allow_override:
-                        self._override_until = None
-                    elif now < self._override_until:
-                        self._overlay.hide()
-                        time.sleep(cfg.check_interval)
-                        continue
-                    else:
+                        self._override_until = override_until = None
+                    elif now >= override_until:
                         logger.log("override_expired")
-                        self._override_until = None
+                        self._override_until = override_until = None
+
+            self._publish_status(window, override_until)
+            self._state.maybe_save()
+            self._activity.tick()
+
+            if override_until:
+                self._usage.switch(None)
+                self._activity.close()
+                self._overlay.hide()
+                until = min(override_until, boundary) if boundary else override_until
+                self._tick(TickScheduler.OVERRIDE, cfg, now, until)
+                continue
 
             if window is None:
+                self._usage.switch(None)
+                self._activity.close()
                 self._overlay.hide()
-                time.sleep(cfg.check_interval)
+                self._tick(TickScheduler.IDLE, cfg, now, boundary)
                 continue
 
-            hwnd, title, app_name, pid = self._get_active_app()
+            hwnd, title, app_name, pid, app_path = self._get_active_app()
 
             # Skip when our own windows (overlay, dialogs) are foreground —
             # avoids whitelisting pythonw.exe and maintains current overlay state.
             if pid == my_pid or not app_name:
-                time.sleep(cfg.check_interval)
+                self._usage.switch(None)
+                self._activity.foreground(None)
+                self._tick(TickScheduler.FAST, cfg, now)
                 continue
 
-            if not cfg.is_app_allowed(app_name, window):
+            # Quota windows meter matched apps; other modes meter nothing.
+            quota_key, used = None, 0.0
+            if window.mode == "quota" and window.matcher.matches(app_name, app_path):
+                quota_key = (window.started_on(now).isoformat(), window.name, app_name.lower())
+                used = self._usage.used(quota_key)
+            allowed = cfg.is_app_allowed(app_name, window, app_path, used / 60)
+            self._usage.switch(quota_key if allowed else None)
+            self._activity.foreground(app_name, window.name)
+
+            if not allowed:
                 # Minimize only the specific violating window
                 if hwnd:
                     try:
@@ -237,33 +456,55 @@ class Sleeper:
                     except Exception:
                         pass
 
-                # Force-kill (blacklist + force_kill only)
-                if window.mode == "blacklist" and window.force_kill:
-                    self._force_kill(app_name)
+                # Force-kill (blacklist / exhausted quota + force_kill only)
+                if window.mode in ("blacklist", "quota") and window.force_kill:
+                    self._force_kill(app_name, pid, tree=window.kill_tree)
 
-                # Show banner; rate-limit only the log write (not the show call)
+                # Show banner every tick; repeats are coalesced into violation_summary records
                 self._overlay.show(window.name, app_name, window.end_time, allow_override=window.allow_override)
-                last = self._last_overlay.get(window.name)
-                if last is None or (now - last).total_seconds() >= 5:
-                    self._last_overlay[window.name] = now
-                    logger.log("violation", rule=window.name, app=app_name, title=title)
+                self._activity.violation(window.name, app_name, title)
+                self._tick(TickScheduler.FAST, cfg, now)
             else:
                 self._overlay.hide()
-
-            time.sleep(cfg.check_interval)
-
-    def _force_kill(self, app_name: str) -> None:
-        for proc in psutil.process_iter(["name", "pid"]):
-            try:
-                if proc.info["name"] and proc.info["name"].lower() == app_name:
-                    proc.kill()
-                    logger.log("force_killed", app=app_name, pid=proc.info["pid"])
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                pass
+                until = boundary
+                if quota_key is not None:   # wake exactly when the quota runs out
+                    exhausted = now + timedelta(seconds=window.quota_minutes * 60 - used)
+                    until = min(boundary, exhausted) if boundary else exhausted
+                self._tick(TickScheduler.STABLE, cfg, now, until, key=hwnd)
+
+        # Shutting down. Summaries are flushed before the final save so a
+        # restart does not write the same pending counts a second time.
+        self._activity.close()
+        self._state.save()
+
+    def _force_kill(self, app_name: str, pid: int, tree: bool = False) -> None:
+        # *pid* is the foreground offender, so a PID reused since the last refresh is still caught.
+        killed = self._procs.kill(app_name, tree=tree, pids=(pid,))
+        for pid in killed:
+            logger.log("force_killed", app=app_name, pid=pid)
+        if killed:
+            self._exe_cache.prune(self._procs.live_pids())
+
+
+def _prewarm() -> None:
+    """Standby: pay for the UI imports, config parse and tray icons before parking."""
+    import tkinter, pystray, psutil   # noqa: F401
+    import overlay                     # noqa: F401
+    from icon_util import get_tray_icon
+    ConfigManager(CONFIG_PATH, cache_dir=CACHE_DIR).stop()
+    for state in ("active", "restricted", "override"):
+        get_tray_icon(state, size=64, dpi=_system_dpi(), cache_dir=str(CACHE_DIR))
 
 
 def main() -> None:
-    app = Sleeper()
+    standby = "--standby" in sys.argv[1:]
+    if standby:
+        _prewarm()
+    # Only one main.py enforces. The guardian's standby parks here until the
+    # active process exits; the OS releases the lease even if it was killed.
+    lease = create_lease(LEASE_NAME, BASE_DIR / "logs")
+    lease.acquire()
+    app = Sleeper(lease, promoted_at=time.time() if standby else None)
     app.run()
 
 
@@ -1,7 +1,8 @@
 """Persistent top-center violation banner — always-on-top, no close button."""
+import threading
 import tkinter as tk
 from datetime import time as dtime
-from typing import Callable, Optional
+from typing import Callable, Optional, Tuple
 
 
 class ViolationOverlay:
@@ -10,7 +11,9 @@ class ViolationOverlay:
     NOT fullscreen — the user can still click through to allowed apps.
     Enforcement comes from repeated per-window minimization in the monitor loop.
 
-    show()/hide() are safe to call from any thread via root.after().
+    show()/hide() are safe to call from any thread. They only record the
+    desired state; at most one Tk callback is pending at a time, and it
+    touches the window manager only for what actually changed.
     """
 
     WIDTH = 700
@@ -23,25 +26,60 @@ class ViolationOverlay:
         self._label_var: Optional[tk.StringVar] = None
         self._override_btn: Optional[tk.Button] = None
 
+        # Desired vs. applied state: (message, allow_override), None = hidden
+        self._state_lock = threading.Lock()
+        self._desired: Optional[Tuple[str, bool]] = None
+        self._applied: Optional[Tuple[str, bool]] = None
+        self._pending = False
+        self.posted = 0      # Tk callbacks queued
+        self.coalesced = 0   # requests absorbed by a pending callback or no-op
+
     # ── public API (thread-safe) ─────────────────────────────────────────────
 
     def show(self, rule_name: str, app_name: str, restriction_end: Optional[dtime] = None,
              allow_override: bool = True) -> None:
         end_str = restriction_end.strftime("%H:%M") if restriction_end else "—"
         msg = f"Rule: {rule_name}   ·   Until: {end_str}   ·   Blocked: {app_name}"
-        self._root.after(0, lambda: self._do_show(msg, allow_override))
+        self._request((msg, allow_override))
 
     def hide(self) -> None:
-        self._root.after(0, self._do_hide)
+        self._request(None)
 
     def destroy(self) -> None:
         self._root.after(0, self._do_destroy)
 
+    def stats(self) -> dict:
+        with self._state_lock:
+            return {"posted": self.posted, "coalesced": self.coalesced}
+
+    def _request(self, state: Optional[Tuple[str, bool]]) -> None:
+        with self._state_lock:
+            self._desired = state
+            if self._pending or state == self._applied:
+                self.coalesced += 1
+                return
+            self._pending = True
+            self.posted += 1
+        self._root.after(0, self._apply)
+
     # ── Tk-thread internals ───────────────────────────────────────────────────
 
-    def _build_window(self) -> None:
-        if self._win and self._win.winfo_exists():
+    def _apply(self) -> None:
+        with self._state_lock:
+            state, prev = self._desired, self._applied
+            self._applied = state
+            self._pending = False
+        if state == prev:
             return
+        if state is None:
+            self._do_hide()
+        else:
+            self._do_show(state, prev)
+
+    def _build_window(self) -> bool:
+        """Create the banner if needed. True if a new window was built."""
+        if self._win and self._win.winfo_exists():
+            return False
         self._label_var = tk.StringVar()
 
         sw = self._root.winfo_screenwidth()
@@ -76,17 +114,20 @@ class ViolationOverlay:
                                        command=self._override)
 
         self._win = win
+        return True
 
-    def _do_show(self, msg: str, allow_override: bool) -> None:
-        self._build_window()
-        if self._label_var:
+    def _do_show(self, state: Tuple[str, bool], prev: Optional[Tuple[str, bool]]) -> None:
+        msg, allow_override = state
+        if self._build_window():
+            prev = None
+        if self._label_var and (prev is None or prev[0] != msg):
             self._label_var.set(msg)
-        if self._override_btn:
+        if self._override_btn and (prev is None or prev[1] != allow_override):
             if allow_override:
                 self._override_btn.place(relx=1.0, rely=0.0, anchor="ne", x=-2, y=2)
             else:
                 self._override_btn.place_forget()
-        if self._win and self._win.winfo_exists():
+        if prev is None and self._win and self._win.winfo_exists():
             self._win.deiconify()
             self._win.lift()
             self._win.attributes("-topmost", True)
@@ -96,12 +137,19 @@ class ViolationOverlay:
         if self._win and self._win.winfo_exists():
             self._win.withdraw()
 
+    def _forget_applied(self) -> None:
+        """The window changed behind _apply()'s back — next request must repaint."""
+        with self._state_lock:
+            self._applied = None
+
     def _do_destroy(self) -> None:
+        self._forget_applied()
         if self._win and self._win.winfo_exists():
             self._win.destroy()
             self._win = None
 
     def _override(self) -> None:
+        self._forget_applied()
         self._do_hide()
         if self._on_override:
             self._on_override()
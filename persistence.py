@@ -0,0 +1,235 @@
+"""Persistence vectors (scheduled tasks, HKCU Run key, Startup shortcut).
+
+Checking the three scheduled tasks used to cost one `schtasks /query` per
+task. WindowsBackend.list_tasks() lists every task with a single
+`schtasks /query /fo CSV /nh`. Persistence caches that listing for
+task_ttl seconds. The registry and shortcut checks run in-process, so
+they are always live. Repairs only shell out for vectors that are
+actually missing.
+
+  WindowsBackend   schtasks / winreg / WScript.Shell
+  FakeBackend      in-memory, counts spawns — for tests and benchmarks
+"""
+import csv
+import io
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Set
+
+TASK_NAMES = ["SleepGuard-1", "SleepGuard-2", "SleepGuard-3"]
+REG_KEY = r"SOFTWARE\Microsoft\Windows\CurrentVersion\Run"
+REG_VALUE = "SleepGuardian"
+STARTUP_LNK_NAME = "SleepGuardian.lnk"
+
+_NO_WINDOW = 0x08000000  # CREATE_NO_WINDOW
+
+
+def startup_lnk_path() -> Path:
+    appdata = os.environ.get("APPDATA", "")
+    return Path(appdata) / "Microsoft" / "Windows" / "Start Menu" / "Programs" / "Startup" / STARTUP_LNK_NAME
+
+
+class WindowsBackend:
+    def __init__(self, base_dir: Path, pythonw: Optional[Path] = None):
+        import winreg
+        self._winreg = winreg
+        self._base_dir = Path(base_dir)
+        self._pythonw = pythonw or Path(sys.executable).with_name("pythonw.exe")
+        self.spawns = 0
+
+    def guardian_cmd(self) -> str:
+        return f'"{self._pythonw}" "{self._base_dir / "guardian.py"}"'
+
+    def _run(self, cmd: List[str]) -> subprocess.CompletedProcess:
+        self.spawns += 1
+        return subprocess.run(cmd, capture_output=True, text=True, creationflags=_NO_WINDOW)
+
+    # ── scheduled tasks ──────────────────────────────────────────────────────
+
+    def list_tasks(self) -> Set[str]:
+        """Names of all scheduled tasks, in one schtasks call. Raises OSError on failure."""
+        r = self._run(["schtasks", "/query", "/fo", "CSV", "/nh"])
+        if r.returncode != 0:
+            raise OSError(r.returncode, r.stderr.strip() or "schtasks /query failed")
+        names = set()
+        for row in csv.reader(io.StringIO(r.stdout)):
+            if row:
+                names.add(row[0].rsplit("\\", 1)[-1])   # "\Folder\Name" -> "Name"
+        return names
+
+    def create_task(self, name: str) -> bool:
+        r = self._run([
+            "schtasks", "/create",
+            "/tn", name,
+            "/tr", self.guardian_cmd(),
+            "/sc", "MINUTE", "/mo", "1",
+            "/f", "/rl", "LIMITED",
+        ])
+        return r.returncode == 0
+
+    def delete_task(self, name: str) -> None:
+        self._run(["schtasks", "/delete", "/tn", name, "/f"])
+
+    # ── registry ─────────────────────────────────────────────────────────────
+
+    def registry_exists(self) -> bool:
+        winreg = self._winreg
+        try:
+            k = winreg.OpenKey(winreg.HKEY_CURRENT_USER, REG_KEY)
+            winreg.QueryValueEx(k, REG_VALUE)
+            winreg.CloseKey(k)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def set_registry(self) -> None:
+        winreg = self._winreg
+        k = winreg.OpenKey(winreg.HKEY_CURRENT_USER, REG_KEY, 0, winreg.KEY_SET_VALUE)
+        winreg.SetValueEx(k, REG_VALUE, 0, winreg.REG_SZ, self.guardian_cmd())
+        winreg.CloseKey(k)
+
+    def delete_registry(self) -> None:
+        winreg = self._winreg
+        try:
+            k = winreg.OpenKey(winreg.HKEY_CURRENT_USER, REG_KEY, 0, winreg.KEY_SET_VALUE)
+            winreg.DeleteValue(k, REG_VALUE)
+            winreg.CloseKey(k)
+        except FileNotFoundError:
+            pass
+
+    # ── startup shortcut ─────────────────────────────────────────────────────
+
+    def startup_exists(self) -> bool:
+        return startup_lnk_path().exists()
+
+    def create_startup(self) -> None:
+        import win32com.client
+        shell = win32com.client.Dispatch("WScript.Shell")
+        lnk = shell.CreateShortCut(str(startup_lnk_path()))
+        lnk.Targetpath = str(self._pythonw)
+        lnk.Arguments = f'"{self._base_dir / "guardian.py"}"'
+        lnk.WorkingDirectory = str(self._base_dir)
+        lnk.save()
+
+    def delete_startup(self) -> None:
+        p = startup_lnk_path()
+        if p.exists():
+            p.unlink()
+
+
+class FakeBackend:
+    """In-memory vectors. *spawn_cost* seconds are slept per would-be process spawn."""
+
+    def __init__(self, tasks: Optional[Set[str]] = None, registry: bool = False,
+                 startup: bool = False, spawn_cost: float = 0.0):
+        self.tasks: Set[str] = set(tasks or ())
+        self.registry = registry
+        self.startup = startup
+        self.spawn_cost = spawn_cost
+        self.spawns = 0
+
+    def _spawn(self) -> None:
+        self.spawns += 1
+        if self.spawn_cost:
+            time.sleep(self.spawn_cost)
+
+    def list_tasks(self) -> Set[str]:
+        self._spawn()
+        return set(self.tasks)
+
+    def create_task(self, name: str) -> bool:
+        self._spawn()
+        self.tasks.add(name)
+        return True
+
+    def delete_task(self, name: str) -> None:
+        self._spawn()
+        self.tasks.discard(name)
+
+    def registry_exists(self) -> bool:
+        return self.registry
+
+    def set_registry(self) -> None:
+        self.registry = True
+
+    def delete_registry(self) -> None:
+        self.registry = False
+
+    def startup_exists(self) -> bool:
+        return self.startup
+
+    def create_startup(self) -> None:
+        self.startup = True
+
+    def delete_startup(self) -> None:
+        self.startup = False
+
+
+class Status(NamedTuple):
+    tasks: Dict[str, bool]
+    registry: bool
+    startup: bool
+
+    @property
+    def healthy(self) -> bool:
+        return all(self.tasks.values()) and self.registry and self.startup
+
+
+class Persistence:
+    """Health checks and repairs over a backend, with the task listing cached."""
+
+    def __init__(self, backend, task_names: List[str] = TASK_NAMES, task_ttl: float = 55.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self._backend = backend
+        self._names = list(task_names)
+        self._ttl = task_ttl
+        self._clock = clock
+        self._tasks: Optional[Set[str]] = None
+        self._tasks_at = 0.0
+
+    def invalidate(self) -> None:
+        self._tasks = None
+
+    def _task_set(self, max_age: Optional[float]) -> Set[str]:
+        ttl = self._ttl if max_age is None else max_age
+        if self._tasks is None or self._clock() - self._tasks_at > ttl:
+            try:
+                self._tasks = self._backend.list_tasks()
+            except OSError:
+                self._tasks = set()     # can't tell — treat as missing and let repair retry
+            self._tasks_at = self._clock()
+        return self._tasks
+
+    def status(self, max_age: Optional[float] = None) -> Status:
+        """Current state; *max_age* overrides the task-listing TTL (0 = fresh)."""
+        tasks = self._task_set(max_age)
+        return Status({n: n in tasks for n in self._names},
+                      self._backend.registry_exists(), self._backend.startup_exists())
+
+    def cached(self) -> Optional[Status]:
+        """Status from the cached task listing, or None before the first check. Never spawns."""
+        if self._tasks is None:
+            return None
+        return Status({n: n in self._tasks for n in self._names},
+                      self._backend.registry_exists(), self._backend.startup_exists())
+
+    def heal(self) -> List[str]:
+        """Recreate missing vectors; returns what was repaired."""
+        st = self.status()
+        repaired = []
+        for name, ok in st.tasks.items():
+            if not ok and self._backend.create_task(name):
+                self._tasks.add(name)
+                repaired.append(name)
+        for ok, create, label in ((st.registry, self._backend.set_registry, "registry"),
+                                  (st.startup, self._backend.create_startup, "startup")):
+            if not ok:
+                try:
+                    create()
+                    repaired.append(label)
+                except Exception:
+                    pass
+        return repaired
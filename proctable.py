@@ -0,0 +1,341 @@
+"""Process-table access and caches used by the monitor loop."""
+import ntpath
+import sys
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+
+class ProcessError(Exception):
+    """A process-table call failed (e.g. access denied)."""
+
+
+class ProcessGone(ProcessError, LookupError):
+    """The PID no longer exists (or was never valid)."""
+
+
+class PsutilTable:
+    """Live process table backed by psutil."""
+
+    def __init__(self):
+        import psutil
+        self._psutil = psutil
+
+    def _call(self, pid: int, fn: Callable):
+        try:
+            return fn(self._psutil.Process(pid))
+        except self._psutil.NoSuchProcess as e:
+            raise ProcessGone(pid) from e
+        except self._psutil.Error as e:
+            raise ProcessError(pid) from e
+
+    def pids(self) -> List[int]:
+        return self._psutil.pids()
+
+    def create_time(self, pid: int) -> float:
+        return self._call(pid, lambda p: p.create_time())
+
+    def exe(self, pid: int) -> str:
+        return self._call(pid, lambda p: p.exe())
+
+    def name(self, pid: int) -> str:
+        return self._call(pid, lambda p: p.name())
+
+    def ppid(self, pid: int) -> int:
+        return self._call(pid, lambda p: p.ppid())
+
+    def kill(self, pid: int) -> None:
+        self._call(pid, lambda p: p.kill())
+
+    def snapshot(self) -> Dict[int, Tuple[str, int]]:
+        """pid -> (name, ppid) for every process in one call. Windows only."""
+        if sys.platform != "win32":
+            raise NotImplementedError
+        return _toolhelp_snapshot()
+
+
+def _toolhelp_snapshot() -> Dict[int, Tuple[str, int]]:
+    """CreateToolhelp32Snapshot: names and parents of all processes in one kernel call."""
+    import ctypes
+    from ctypes import wintypes
+
+    class PROCESSENTRY32W(ctypes.Structure):
+        _fields_ = [("dwSize", wintypes.DWORD), ("cntUsage", wintypes.DWORD),
+                    ("th32ProcessID", wintypes.DWORD), ("th32DefaultHeapID", ctypes.c_size_t),
+                    ("th32ModuleID", wintypes.DWORD), ("cntThreads", wintypes.DWORD),
+                    ("th32ParentProcessID", wintypes.DWORD), ("pcPriClassBase", wintypes.LONG),
+                    ("dwFlags", wintypes.DWORD), ("szExeFile", wintypes.WCHAR * 260)]
+
+    k32 = ctypes.windll.kernel32
+    k32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+    k32.CreateToolhelp32Snapshot.argtypes = [wintypes.DWORD, wintypes.DWORD]
+    k32.Process32FirstW.argtypes = k32.Process32NextW.argtypes = [
+        wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W)]
+    h = k32.CreateToolhelp32Snapshot(0x00000002, 0)   # TH32CS_SNAPPROCESS
+    if not h or h == ctypes.c_void_p(-1).value:
+        raise ProcessError("CreateToolhelp32Snapshot failed")
+    try:
+        entry = PROCESSENTRY32W()
+        entry.dwSize = ctypes.sizeof(PROCESSENTRY32W)
+        procs = {}
+        ok = k32.Process32FirstW(h, ctypes.byref(entry))
+        while ok:
+            procs[entry.th32ProcessID] = (entry.szExeFile, entry.th32ParentProcessID)
+            ok = k32.Process32NextW(h, ctypes.byref(entry))
+        return procs
+    finally:
+        k32.CloseHandle(h)
+
+
+class FakeProcessTable:
+    """
+    In-memory process table for tests and benchmarks: pid -> (create_time, exe, ppid).
+    With snapshot=False it behaves like a platform without a one-call snapshot.
+    """
+
+    def __init__(self, procs: Optional[Dict[int, Tuple[float, str, int]]] = None,
+                 snapshot: bool = True):
+        self.procs: Dict[int, Tuple[float, str, int]] = dict(procs or {})
+        self.has_snapshot = snapshot
+        self.calls = 0
+
+    def _get(self, pid: int) -> Tuple[float, str, int]:
+        self.calls += 1
+        try:
+            return self.procs[pid]
+        except KeyError:
+            raise ProcessGone(pid) from None
+
+    def pids(self) -> List[int]:
+        self.calls += 1
+        return list(self.procs)
+
+    def create_time(self, pid: int) -> float:
+        return self._get(pid)[0]
+
+    def exe(self, pid: int) -> str:
+        return self._get(pid)[1]
+
+    def name(self, pid: int) -> str:
+        return ntpath.basename(self._get(pid)[1])
+
+    def ppid(self, pid: int) -> int:
+        return self._get(pid)[2]
+
+    def kill(self, pid: int) -> None:
+        self._get(pid)
+        del self.procs[pid]
+
+    def snapshot(self) -> Dict[int, Tuple[str, int]]:
+        if not self.has_snapshot:
+            raise NotImplementedError
+        self.calls += 1
+        return {pid: (exe.rsplit("\\", 1)[-1], ppid) for pid, (_, exe, ppid) in self.procs.items()}
+
+
+class ExeCache:
+    """
+    Bounded LRU of pid -> lowercased exe path, validated by process create time.
+
+    A cached entry is only trusted while (pid, create_time) matches, so a
+    reused PID misses and is re-resolved. Exited processes are dropped when a
+    lookup finds them gone, or in bulk via prune().
+    """
+
+    def __init__(self, table=None, maxsize: int = 256):
+        self._table = table if table is not None else PsutilTable()
+        self._maxsize = maxsize
+        self._entries: "OrderedDict[int, Tuple[float, str]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, pid: int) -> str:
+        """Return the lowercased exe path for *pid*. Raises ProcessGone."""
+        try:
+            ctime = self._table.create_time(pid)
+        except ProcessGone:
+            self._entries.pop(pid, None)
+            raise
+        entry = self._entries.get(pid)
+        if entry is not None and entry[0] == ctime:
+            self._entries.move_to_end(pid)
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        path = self._table.exe(pid).lower()
+        self._entries[pid] = (ctime, path)
+        self._entries.move_to_end(pid)
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+        return path
+
+    def prune(self, live_pids) -> None:
+        """Drop entries whose PID is not in *live_pids*."""
+        live = set(live_pids)
+        for pid in [p for p in self._entries if p not in live]:
+            del self._entries[pid]
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+    def export(self) -> List[list]:
+        """[[pid, create_time, path], ...], least recently used first."""
+        return [[pid, ctime, path] for pid, (ctime, path) in list(self._entries.items())]
+
+    def restore(self, entries) -> None:
+        """Reload export() output. Entries stay validated by create time, so reused PIDs miss."""
+        for pid, ctime, path in entries:
+            self._entries[int(pid)] = (float(ctime), str(path))
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+
+class ProcessIndex:
+    """
+    Lowercased process name -> pids, plus a ppid map for process trees.
+
+    refresh() costs one call. Where the table has a one-call snapshot
+    (Toolhelp on Windows), it re-indexes any PID whose name or parent
+    changed, so a reused PID is picked up. Otherwise it diffs the PID set
+    and only queries PIDs that appeared. A PID reused between refreshes
+    then keeps its stale entry; kill() takes the PIDs the caller knows to
+    be the offender (the foreground process) and re-reads those.
+
+    Nothing in the index is trusted for a kill. kill() reads each target's
+    create time once, rejects roots whose name no longer matches and
+    descendants whose parent is not their recorded one or is younger than
+    they are, then checks the create time again right before killing.
+    """
+
+    def __init__(self, table=None, kill_interval: float = 1.0):
+        self._table = table if table is not None else PsutilTable()
+        self._kill_interval = kill_interval
+        self._snapshot = True          # until the table says it has none
+        self._procs: Dict[int, Tuple[str, int]] = {}   # pid -> (name, ppid)
+        self._by_name: Dict[str, Set[int]] = {}
+        self._children: Dict[int, Set[int]] = {}
+        self._last_kill: Dict[str, float] = {}
+
+    def refresh(self) -> None:
+        snap = None
+        if self._snapshot:
+            try:
+                snap = self._table.snapshot()
+            except NotImplementedError:
+                self._snapshot = False
+            except ProcessError:
+                pass
+        if snap is not None:
+            for pid in self._procs.keys() - snap.keys():
+                self._drop(pid)
+            for pid, (name, ppid) in snap.items():
+                entry = (name.lower(), ppid)
+                if self._procs.get(pid) != entry:
+                    self._drop(pid)     # new, or the PID was reused
+                    self._add(pid, *entry)
+            return
+        live = set(self._table.pids())
+        for pid in self._procs.keys() - live:
+            self._drop(pid)
+        for pid in live - self._procs.keys():
+            self._query(pid)
+
+    def _query(self, pid: int) -> None:
+        try:
+            name = self._table.name(pid).lower()
+            ppid = self._table.ppid(pid)
+        except ProcessError:
+            return
+        self._add(pid, name, ppid)
+
+    def _add(self, pid: int, name: str, ppid: int) -> None:
+        self._procs[pid] = (name, ppid)
+        self._by_name.setdefault(name, set()).add(pid)
+        self._children.setdefault(ppid, set()).add(pid)
+
+    def _drop(self, pid: int) -> None:
+        known = self._procs.pop(pid, None)
+        if known is not None:
+            name, ppid = known
+            self._discard(self._by_name, name, pid)
+            self._discard(self._children, ppid, pid)
+
+    @staticmethod
+    def _discard(index: dict, key, pid: int) -> None:
+        pids = index.get(key)
+        if pids is not None:
+            pids.discard(pid)
+            if not pids:
+                del index[key]
+
+    def live_pids(self) -> Set[int]:
+        return set(self._procs)
+
+    def pids(self, name: str) -> Set[int]:
+        return set(self._by_name.get(name.lower(), ()))
+
+    def descendants(self, pid: int) -> Set[int]:
+        return set(self._tree(pid))
+
+    def _tree(self, pid: int) -> Dict[int, int]:
+        """Indexed descendants of *pid* -> their recorded parent."""
+        found: Dict[int, int] = {}
+        stack = [pid]
+        while stack:
+            parent = stack.pop()
+            for child in self._children.get(parent, ()):
+                if child not in found and child != pid:
+                    found[child] = parent
+                    stack.append(child)
+        return found
+
+    def kill(self, name: str, tree: bool = False, pids: Iterable[int] = ()) -> List[int]:
+        """
+        Kill every process called *name* (and, with *tree*, their descendants).
+        *pids* are processes known to be current (re-read before use). At
+        most once per kill_interval per name. Returns the PIDs killed.
+        """
+        name = name.lower()
+        now = time.monotonic()
+        last = self._last_kill.get(name)
+        if last is not None and now - last < self._kill_interval:
+            return []
+        self._last_kill[name] = now
+
+        self.refresh()
+        for pid in pids:
+            self._drop(pid)
+            self._query(pid)
+        roots = self.pids(name)
+        parents: Dict[int, Optional[int]] = dict.fromkeys(roots)   # target -> expected ppid
+        if tree:
+            for pid in roots:
+                for child, parent in self._tree(pid).items():
+                    parents.setdefault(child, parent)
+
+        born: Dict[int, float] = {}
+        for pid in parents:
+            try:
+                born[pid] = self._table.create_time(pid)
+                if pid in roots and self._table.name(pid).lower() != name:
+                    del born[pid]       # stale entry for a reused PID
+            except ProcessError:
+                born.pop(pid, None)
+
+        killed = []
+        for pid, parent in reversed(parents.items()):   # children before their parents
+            if pid not in born:
+                continue
+            if parent is not None and not born.get(parent, float("inf")) <= born[pid]:
+                continue    # orphan whose ppid now names a reused (younger) PID
+            try:
+                if self._table.create_time(pid) != born[pid]:
+                    continue    # PID reused since we looked
+                if parent is not None and self._table.ppid(pid) != parent:
+                    continue
+                self._table.kill(pid)
+                killed.append(pid)
+            except ProcessError:
+                pass
+        return killed
@@ -0,0 +1,154 @@
+"""Per-day event rollups for the Analytics tab.
+
+Each logs/YYYY-MM-DD.jsonl gets a sidecar logs/.rollup/YYYY-MM-DD.json holding
+event counts per (hour, app, rule, event) plus the identity (inode, size,
+mtime) and byte offset of the day file it summarises. Queries read sidecars
+only; a day file that grew on the same inode is folded in from the stored
+offset, and any other change triggers a rebuild of that day.
+
+A violation_summary record counts as *count* violations, so coalesced and
+per-event logs chart the same way.
+"""
+import json
+import os
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+VERSION = 2
+
+Key = Tuple[int, str, str, str]   # (hour, app, rule, event)
+
+
+class _DayRollup:
+    __slots__ = ("ino", "size", "mtime_ns", "offset", "counts")
+
+    def __init__(self, ino: int = 0, size: int = 0, mtime_ns: int = 0, offset: int = 0,
+                 counts: Optional[Counter] = None):
+        self.ino = ino
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.offset = offset
+        self.counts: Counter = counts if counts is not None else Counter()
+
+    def to_json(self) -> dict:
+        return {
+            "version": VERSION, "ino": self.ino, "size": self.size,
+            "mtime_ns": self.mtime_ns, "offset": self.offset,
+            "counts": [[*k, n] for k, n in self.counts.items()],
+        }
+
+    @classmethod
+    def from_json(cls, d: dict) -> Optional["_DayRollup"]:
+        if d.get("version") != VERSION:
+            return None
+        counts = Counter({(int(h), a, r, e): n for h, a, r, e, n in d["counts"]})
+        return cls(d["ino"], d["size"], d["mtime_ns"], d["offset"], counts)
+
+
+class RollupStore:
+    def __init__(self, log_dir: str | Path):
+        self._dir = Path(log_dir)
+        self._sidecars = self._dir / ".rollup"
+        self._mem: Dict[str, _DayRollup] = {}
+
+    # ── queries ──────────────────────────────────────────────────────────────
+
+    def day(self, day: str) -> Counter:
+        """Counts for one YYYY-MM-DD day, brought up to date with its log file."""
+        path = self._dir / f"{day}.jsonl"
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            self._mem.pop(day, None)
+            return Counter()
+
+        roll = self._mem.get(day) or self._load(day)
+        if roll and roll.ino == st.st_ino and roll.size == st.st_size \
+                and roll.mtime_ns == st.st_mtime_ns:
+            self._mem[day] = roll
+            return roll.counts
+
+        if not (roll and roll.ino == st.st_ino and roll.offset <= st.st_size
+                and st.st_size > roll.size):
+            roll = _DayRollup(ino=st.st_ino)        # replaced, truncated or edited
+        roll.offset = _fold(path, roll.offset, roll.counts)
+        roll.size, roll.mtime_ns = st.st_size, st.st_mtime_ns
+        self._mem[day] = roll
+        self._save(day, roll)
+        return roll.counts
+
+    def query(self, start: str, end: str, event: str = "violation",
+              cancel: Optional[threading.Event] = None) -> Optional[Tuple[list, Counter]]:
+        """
+        (counts by hour [24], Counter by app) for *event* over start..end
+        inclusive, or None if *cancel* was set part-way.
+        """
+        hours = [0] * 24
+        apps: Counter = Counter()
+        for day in self.days(start, end):
+            if cancel is not None and cancel.is_set():
+                return None
+            for (hour, app, _rule, ev), n in self.day(day).items():
+                if ev == event:
+                    hours[hour] += n
+                    apps[app or "?"] += n
+        return hours, apps
+
+    def signature(self, start: str, end: str) -> tuple:
+        """(day, size, mtime_ns) of every day file in range — a cheap cache key."""
+        sig = []
+        for day in self.days(start, end):
+            try:
+                st = (self._dir / f"{day}.jsonl").stat()
+            except FileNotFoundError:
+                continue
+            sig.append((day, st.st_size, st.st_mtime_ns))
+        return tuple(sig)
+
+    def days(self, start: str, end: str) -> list:
+        if not self._dir.exists():
+            return []
+        return sorted(p.stem for p in self._dir.glob("*.jsonl") if start <= p.stem <= end)
+
+    # ── sidecars ─────────────────────────────────────────────────────────────
+
+    def _load(self, day: str) -> Optional[_DayRollup]:
+        try:
+            with open(self._sidecars / f"{day}.json", encoding="utf-8") as f:
+                return _DayRollup.from_json(json.load(f))
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _save(self, day: str, roll: _DayRollup) -> None:
+        try:
+            self._sidecars.mkdir(parents=True, exist_ok=True)
+            tmp = self._sidecars / f"{day}.json.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(roll.to_json(), f, separators=(",", ":"))
+            os.replace(tmp, self._sidecars / f"{day}.json")
+        except OSError:
+            pass
+
+
+def _fold(path: Path, offset: int, counts: Counter) -> int:
+    """Count complete lines of *path* from *offset*; return the new offset."""
+    with open(path, "rb") as f:
+        f.seek(offset)
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                break               # partial trailing line — pick it up next time
+            offset += len(raw)
+            try:
+                r = json.loads(raw)
+                det = r.get("details") or {}
+                event, n = r.get("event", ""), 1
+                if event == "violation_summary":
+                    event, n = "violation", int(det["count"])
+                key = (int(r["ts"][11:13]), str(det.get("app", "")),
+                       str(det.get("rule", "")), event)
+            except (ValueError, KeyError, TypeError, AttributeError):
+                continue
+            counts[key] += n
+    return offset
@@ -0,0 +1,79 @@
+"""Adaptive tick scheduler for the monitor loop."""
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+
+class TickScheduler:
+    """
+    Decides how long the monitor loop sleeps after each tick.
+
+    Modes:
+      IDLE      no window active — sleep until the next schedule boundary
+      OVERRIDE  override running — sleep until it expires (or a boundary)
+      STABLE    allowed app stays in front — back off exponentially
+      FAST      violation, own window, or anything in flux — base interval
+
+    Any observed change (changed(), or a new key passed to delay()) snaps
+    STABLE back to the base interval. Backoff is only used when the
+    foreground source is event-driven; with polling it would delay enforcement.
+    """
+
+    IDLE = "idle"
+    OVERRIDE = "override"
+    STABLE = "stable"
+    FAST = "fast"
+    MODES = (IDLE, OVERRIDE, STABLE, FAST)
+
+    MIN_WAIT = 0.05
+
+    def __init__(self, event_driven: bool, max_backoff: float = 8.0, max_wait: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self._event_driven = event_driven
+        self._max_backoff = max_backoff
+        self._max_wait = max_wait
+        self._backoff = 0.0
+        self._key = None
+        self._lock = threading.Lock()
+        self._ticks: Dict[str, int] = dict.fromkeys(self.MODES, 0)
+        self._clock = clock
+        self._started = clock()
+
+    def delay(self, mode: str, interval: float, deadline: Optional[float] = None,
+              key=None) -> float:
+        """
+        Seconds to sleep after a tick in *mode*. *deadline* is the number of
+        seconds until the next known state change (boundary, override expiry);
+        *key* identifies the foreground for STABLE (a different key resets backoff).
+        """
+        with self._lock:
+            self._ticks[mode] += 1
+
+        if mode == self.STABLE and self._event_driven:
+            if key != self._key:
+                self._key = key
+                self._backoff = 0.0
+            self._backoff = min(self._max_backoff, self._backoff * 2 if self._backoff else interval)
+            wait = self._backoff
+        elif mode in (self.IDLE, self.OVERRIDE):
+            self.changed()
+            wait = self._max_wait
+        else:
+            self.changed()
+            wait = interval
+
+        if deadline is not None:
+            wait = min(wait, deadline)
+        return max(self.MIN_WAIT, min(wait, self._max_wait))
+
+    def changed(self) -> None:
+        """Something happened — drop any accumulated backoff."""
+        self._backoff = 0.0
+        self._key = None
+
+    def stats(self) -> dict:
+        """Tick counts and mean ticks/second per mode since start."""
+        elapsed = max(self._clock() - self._started, 1e-9)
+        with self._lock:
+            return {m: {"ticks": n, "rate_hz": round(n / elapsed, 4)}
+                    for m, n in self._ticks.items()}
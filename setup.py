@@ -6,106 +6,27 @@ Usage:
     python setup.py --status     # show health of all 5 persistence vectors
     python setup.py --uninstall  # remove all persistence layers + stop guardian
 """
-import os
 import sys
 import subprocess
-import winreg
 import argparse
 from pathlib import Path
+from typing import Optional
 
-import win32com.client
-
-_NO_WINDOW = 0x08000000
+import ipc
+from persistence import (REG_VALUE, STARTUP_LNK_NAME, TASK_NAMES, Persistence,
+                         WindowsBackend)
 
 BASE_DIR = Path(__file__).resolve().parent
 PYTHONW = Path(sys.executable).with_name("pythonw.exe")
 
-TASK_NAMES = ["SleepGuard-1", "SleepGuard-2", "SleepGuard-3"]
-REG_KEY = r"SOFTWARE\Microsoft\Windows\CurrentVersion\Run"
-REG_VALUE = "SleepGuardian"
-STARTUP_LNK_NAME = "SleepGuardian.lnk"
-
-
-def _guardian_cmd() -> str:
-    return f'"{PYTHONW}" "{BASE_DIR / "guardian.py"}"'
-
-
-# ------------------------------------------------------------------ tasks
-
-def _task_exists(name: str) -> bool:
-    r = subprocess.run(["schtasks", "/query", "/tn", name],
-                       capture_output=True, text=True, creationflags=_NO_WINDOW)
-    return r.returncode == 0
-
-
-def _register_task(name: str) -> bool:
-    cmd = [
-        "schtasks", "/create",
-        "/tn", name,
-        "/tr", _guardian_cmd(),
-        "/sc", "MINUTE", "/mo", "1",
-        "/f", "/rl", "LIMITED",
-    ]
-    r = subprocess.run(cmd, capture_output=True, text=True, creationflags=_NO_WINDOW)
-    return r.returncode == 0
-
-
-def _delete_task(name: str) -> None:
-    subprocess.run(["schtasks", "/delete", "/tn", name, "/f"],
-                   capture_output=True, creationflags=_NO_WINDOW)
-
-
-# ------------------------------------------------------------------ registry
-
-def _reg_exists() -> bool:
-    try:
-        k = winreg.OpenKey(winreg.HKEY_CURRENT_USER, REG_KEY)
-        winreg.QueryValueEx(k, REG_VALUE)
-        winreg.CloseKey(k)
-        return True
-    except FileNotFoundError:
-        return False
-
-
-def _set_reg() -> None:
-    k = winreg.OpenKey(winreg.HKEY_CURRENT_USER, REG_KEY, 0, winreg.KEY_SET_VALUE)
-    winreg.SetValueEx(k, REG_VALUE, 0, winreg.REG_SZ, _guardian_cmd())
-    winreg.CloseKey(k)
-
-
-def _del_reg() -> None:
-    try:
-        k = winreg.OpenKey(winreg.HKEY_CURRENT_USER, REG_KEY, 0, winreg.KEY_SET_VALUE)
-        winreg.DeleteValue(k, REG_VALUE)
-        winreg.CloseKey(k)
-    except FileNotFoundError:
-        pass
-
-
-# ------------------------------------------------------------------ startup shortcut
+_backend: Optional[WindowsBackend] = None
 
-def _lnk_path() -> Path:
-    appdata = os.environ.get("APPDATA", "")
-    return Path(appdata) / "Microsoft" / "Windows" / "Start Menu" / "Programs" / "Startup" / STARTUP_LNK_NAME
 
-
-def _lnk_exists() -> bool:
-    return _lnk_path().exists()
-
-
-def _create_lnk() -> None:
-    shell = win32com.client.Dispatch("WScript.Shell")
-    lnk = shell.CreateShortCut(str(_lnk_path()))
-    lnk.Targetpath = str(PYTHONW)
-    lnk.Arguments = f'"{BASE_DIR / "guardian.py"}"'
-    lnk.WorkingDirectory = str(BASE_DIR)
-    lnk.save()
-
-
-def _del_lnk() -> None:
-    p = _lnk_path()
-    if p.exists():
-        p.unlink()
+def _vectors() -> WindowsBackend:
+    global _backend
+    if _backend is None:
+        _backend = WindowsBackend(BASE_DIR, PYTHONW)
+    return _backend
 
 
 # ------------------------------------------------------------------ guardian process
@@ -147,27 +68,44 @@ def _fmt(ok: bool, label: str) -> str:
 
 
 def cmd_status() -> None:
+    guardian = ipc.request("guardian")
+    monitor = ipc.request("main")
+
     print("Sleeper — persistence layer status\n")
-    for name in TASK_NAMES:
-        ok = _task_exists(name)
+    # The running guardian's last check costs nothing; ask the system only without one.
+    st = (guardian or {}).get("persistence")
+    if st is None:
+        st = Persistence(_vectors()).status(max_age=0)._asdict()
+    for name, ok in st["tasks"].items():
         print(_fmt(ok, f"Task Scheduler: {name}"))
-    print(_fmt(_reg_exists(),  f"Registry Run:   {REG_VALUE}"))
-    print(_fmt(_lnk_exists(),  f"Startup LNK:    {STARTUP_LNK_NAME}"))
+    print(_fmt(st["registry"], f"Registry Run:   {REG_VALUE}"))
+    print(_fmt(st["startup"],  f"Startup LNK:    {STARTUP_LNK_NAME}"))
+
+    print("\nProcesses\n")
+    print(_fmt(guardian is not None, "Guardian" + (
+        f":       pid {guardian['pid']}, {guardian['restarts']} restarts, "
+        f"{guardian['stalls']} stalls" if guardian else "")))
+    print(_fmt(monitor is not None, "Monitor" + (
+        f":        pid {monitor['pid']}, rule {monitor['rule'] or '—'}, "
+        f"tick {monitor['tick_ms']['last']:.2f} ms (max {monitor['tick_ms']['max']:.2f})"
+        if monitor else "")))
+    if monitor and monitor["override_until"]:
+        print(f"        override until {monitor['override_until']}")
     print()
 
 
 def cmd_install() -> None:
     print("Installing Sleeper persistence layers...\n")
     for name in TASK_NAMES:
-        ok = _register_task(name)
+        ok = _vectors().create_task(name)
         print(_fmt(ok, f"Task Scheduler: {name}"))
     try:
-        _set_reg()
+        _vectors().set_registry()
         print(_fmt(True, f"Registry Run:   {REG_VALUE}"))
     except Exception as e:
         print(_fmt(False, f"Registry Run:   {e}"))
     try:
-        _create_lnk()
+        _vectors().create_startup()
         print(_fmt(True, f"Startup LNK:    {STARTUP_LNK_NAME}"))
     except Exception as e:
         print(_fmt(False, f"Startup LNK:    {e}"))
@@ -183,7 +121,7 @@ def cmd_uninstall() -> None:
         from config import ConfigManager
         from datetime import datetime as _dt
         _cfg = ConfigManager(BASE_DIR / "config.yaml").config
-        _w = _cfg.is_restricted_now(_dt.now().time())
+        _w = _cfg.is_restricted_now(_dt.now())
         if _w:
             print(f"[BLOCKED] Cannot uninstall during restricted window '{_w.name}' "
                   f"({_w.start_time.strftime('%H:%M')}–{_w.end_time.strftime('%H:%M')}).")
@@ -202,11 +140,11 @@ def cmd_uninstall() -> None:
     _stop_guardian()
 
     for name in TASK_NAMES:
-        _delete_task(name)
+        _vectors().delete_task(name)
         print(f"  Removed task: {name}")
-    _del_reg()
+    _vectors().delete_registry()
     print(f"  Removed registry key: {REG_VALUE}")
-    _del_lnk()
+    _vectors().delete_startup()
     print(f"  Removed startup shortcut: {STARTUP_LNK_NAME}")
     print("\nSleeper uninstalled.\n")
 
@@ -0,0 +1,89 @@
+"""Runtime state snapshot, so a restarted (or promoted standby) main.py resumes warm.
+
+Components register named sections with a getter. At most every
+min_interval seconds, maybe_save() collects them and rewrites the file if
+anything changed, atomically (temp file + os.replace). Restoring is up to
+each component. load() returns {} for a missing, corrupt or older-version
+file, and restore code must treat every section as untrusted: times are
+wall-clock and the clock may have jumped since the snapshot was taken.
+"""
+import json
+import os
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+VERSION = 1
+
+
+def restore_deadline(value, now: datetime, max_ahead: timedelta) -> Optional[datetime]:
+    """
+    A deadline saved as a timestamp, or None if it is missing, malformed or
+    already past. Capped at *max_ahead* from *now*, since the clock may have
+    moved back after it was saved.
+    """
+    if value is None:
+        return None
+    try:
+        until = datetime.fromtimestamp(float(value))
+    except (TypeError, ValueError, OverflowError, OSError):
+        return None
+    if until <= now:
+        return None
+    return min(until, now + max_ahead)
+
+
+class StateStore:
+    def __init__(self, path: str | Path, min_interval: float = 10.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self._path = Path(path)
+        self._interval = min_interval
+        self._clock = clock
+        self._getters: Dict[str, Callable[[], object]] = {}
+        self._written: Optional[dict] = None
+        self._checked = clock()
+        self.writes = 0
+
+    def add(self, name: str, get: Callable[[], object]) -> None:
+        """Include *get()* (JSON-able) in every snapshot under *name*."""
+        self._getters[name] = get
+
+    def load(self) -> dict:
+        """Sections of the last snapshot, or {} if there is none usable."""
+        try:
+            with open(self._path, encoding="utf-8") as f:
+                d = json.load(f)
+            if d.get("version") != VERSION or not isinstance(d.get("sections"), dict):
+                return {}
+            return d["sections"]
+        except (OSError, ValueError, AttributeError):
+            return {}
+
+    def maybe_save(self) -> None:
+        """Snapshot if min_interval has passed since the last look."""
+        if self._clock() - self._checked >= self._interval:
+            self.save()
+
+    def save(self) -> None:
+        """Snapshot now, unless nothing changed since the last write."""
+        self._checked = self._clock()
+        sections = {}
+        for name, get in self._getters.items():
+            try:
+                sections[name] = get()
+            except Exception:
+                pass
+        if sections == self._written:
+            return
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self._path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"version": VERSION, "saved": time.time(), "sections": sections},
+                          f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp, self._path)
+        except (OSError, TypeError, ValueError):
+            return
+        self._written = sections
+        self.writes += 1
@@ -1,12 +1,21 @@
-"""Tkinter status/log viewer, analytics, and config viewer — opened from tray."""
+"""Tkinter status/log viewer, analytics, and config viewer — opened from tray.
+
+Runs as its own process (``pythonw status_window.py``) so matplotlib never
+loads into the monitor. It talks to the monitor only through the log
+directory and the monitor's IPC endpoint.
+"""
+import threading
 import tkinter as tk
+from collections import OrderedDict
 from tkinter import ttk
 from datetime import date, timedelta
 from pathlib import Path
 from typing import Callable, Optional
 
+import ipc
 import logger
-from config import Config
+from config import Config, ConfigManager
+from rollup import RollupStore
 
 BASE_DIR = Path(__file__).resolve().parent
 
@@ -62,11 +71,21 @@ def _entry(parent, var, width=30) -> tk.Entry:
 # ─────────────────────────────────────────────────────────────────────────────
 
 class StatusWindow:
-    def __init__(self, parent: tk.Tk, get_config: Callable[[], Config]):
+    def __init__(self, parent: tk.Tk, get_config: Callable[[], Config],
+                 on_close: Optional[Callable[[], None]] = None):
         self._parent = parent
         self._get_config = get_config
+        self._on_close = on_close
         self._win: Optional[tk.Toplevel] = None
         self._cfg_mgr: Optional[ConfigManager] = None  # lazily created for editor
+        self._log_tail = logger.LogTail()
+        self._log_records: list[dict] = []
+        self._rollups: Optional[RollupStore] = None
+        # Analytics worker: one RollupStore user at a time, newest job wins
+        self._an_lock = threading.Lock()
+        self._an_cancel: Optional[threading.Event] = None
+        self._an_gen = 0
+        self._an_cache: OrderedDict = OrderedDict()   # (from, to, signature) -> (hours, apps)
 
     # ── public ────────────────────────────────────────────────────────────────
 
@@ -85,12 +104,15 @@ class StatusWindow:
         win.geometry("880x560")
         win.configure(bg=BG)
         win.resizable(True, True)
-        win.protocol("WM_DELETE_WINDOW", win.destroy)
+        win.protocol("WM_DELETE_WINDOW", self._close)
         self._win = win
 
         style = ttk.Style(win)
         _style_ttk(style)
 
+        self._monitor_lbl = _lbl(win, "", fg=PURPLE)
+        self._monitor_lbl.pack(anchor="w", padx=12, pady=(8, 0))
+
         nb = ttk.Notebook(win)
         nb.pack(fill="both", expand=True, padx=8, pady=8)
 
@@ -98,6 +120,23 @@ class StatusWindow:
         self._build_analytics_tab(nb)
         self._build_config_tab(nb)
 
+    def _close(self) -> None:
+        self._win.destroy()
+        if self._on_close:
+            self._on_close()
+
+    def _refresh_monitor_status(self) -> None:
+        st = ipc.request("main")
+        if st is None:
+            text = "Monitor: not running"
+        elif st.get("override_until"):
+            text = f"Monitor: override until {st['override_until'][11:16]}"
+        elif st.get("rule"):
+            text = f"Monitor: ⛔ {st['rule']}"
+        else:
+            text = "Monitor: ✅ active"
+        self._monitor_lbl.config(text=text)
+
     # ── Log tab ───────────────────────────────────────────────────────────────
 
     def _build_log_tab(self, nb: ttk.Notebook) -> None:
@@ -134,15 +173,39 @@ class StatusWindow:
         tv.pack(fill="both", expand=True, padx=6, pady=(0, 6))
 
         self._log_tv = tv
-        self._log_filter.trace_add("write", lambda *_: self._refresh_log())
+        self._log_filter.trace_add("write", lambda *_: self._render_log())
+        # A fresh window starts from a fresh tail so the whole day is shown.
+        self._log_tail = logger.LogTail()
+        self._log_records = []
+        self._poll_log()
+
+    def _poll_log(self) -> None:
+        if not (self._win and self._win.winfo_exists()):
+            return
         self._refresh_log()
+        self._refresh_monitor_status()
+        self._win.after(5000, self._poll_log)
 
     def _refresh_log(self) -> None:
+        """Append records written since the last call; rebuild only on rollover."""
         if not (self._win and self._win.winfo_exists()):
             return
-        records = logger.read_today()
-        filt = self._log_filter.get().strip().lower() if hasattr(self, "_log_filter") else ""
+        reset, new = self._log_tail.read_new()
+        if reset:
+            self._log_records = new
+            self._render_log()
+        elif new:
+            self._log_records.extend(new)
+            self._append_log_rows(new)
+
+    def _render_log(self) -> None:
+        """Redraw the log from memory (filter changed or day rolled over)."""
         self._log_tv.delete(*self._log_tv.get_children())
+        self._append_log_rows(self._log_records)
+
+    def _append_log_rows(self, records: list[dict]) -> None:
+        filt = self._log_filter.get().strip().lower()
+        last = None
         for r in records:
             ev   = r.get("event", "")
             ts   = r.get("ts", "")
@@ -151,12 +214,10 @@ class StatusWindow:
             if filt and filt not in ev.lower() and filt not in det_str.lower():
                 continue
             tag = _event_tag(ev)
-            self._log_tv.insert("", "end", values=(ts, ev, det_str), tags=(tag,))
+            last = self._log_tv.insert("", "end", values=(ts, ev, det_str), tags=(tag,))
         # scroll to bottom
-        children = self._log_tv.get_children()
-        if children:
-            self._log_tv.see(children[-1])
-        self._win.after(5000, self._refresh_log)
+        if last:
+            self._log_tv.see(last)
 
     # ── Analytics tab ─────────────────────────────────────────────────────────
 
@@ -186,6 +247,8 @@ class StatusWindow:
         self._an_to = tk.StringVar(value=date.today().isoformat())
         _entry(bar, self._an_to, width=12).pack(side="left", padx=4)
         _btn(bar, "Load", lambda: self._reload_analytics(fig, canvas), bg=ACC).pack(side="left", padx=6)
+        self._an_status = _lbl(bar, "", fg="#888899", font=("Segoe UI", 9, "italic"))
+        self._an_status.pack(side="left", padx=6)
 
         # figure with 2 subplots
         fig = Figure(figsize=(8, 4), dpi=96, facecolor=BG)
@@ -204,9 +267,48 @@ class StatusWindow:
         self._reload_analytics(fig, canvas)
 
     def _reload_analytics(self, fig, canvas) -> None:
-        from collections import Counter
-        records = logger.read_range(self._an_from.get(), self._an_to.get())
-        violations = [r for r in records if r.get("event") == "violation"]
+        """Start a background computation for the current range (Tk thread)."""
+        if self._rollups is None:
+            self._rollups = RollupStore(logger.log_dir())
+        if self._an_cancel is not None:
+            self._an_cancel.set()
+        self._an_cancel = cancel = threading.Event()
+        self._an_gen += 1
+        self._an_status.config(text="Loading…")
+        threading.Thread(target=self._compute_analytics, daemon=True, name="analytics",
+                         args=(self._an_gen, self._an_from.get(), self._an_to.get(),
+                               cancel, fig, canvas)).start()
+
+    def _compute_analytics(self, gen: int, start: str, end: str,
+                           cancel: threading.Event, fig, canvas) -> None:
+        """Worker thread: no Tk calls except the final after()."""
+        try:
+            with self._an_lock:
+                if cancel.is_set():
+                    return
+                key = (start, end, self._rollups.signature(start, end))
+                result = self._an_cache.get(key)
+                if result is None:
+                    result = self._rollups.query(start, end, cancel=cancel)
+                    if result is None:
+                        return
+                    self._an_cache[key] = result
+                    while len(self._an_cache) > 16:
+                        self._an_cache.popitem(last=False)
+                self._an_cache.move_to_end(key)
+            self._parent.after(0, lambda: self._draw_analytics(gen, *result, fig, canvas))
+        except Exception as e:
+            msg = f"Error: {e}"
+            self._parent.after(0, lambda: self._analytics_failed(gen, msg))
+
+    def _analytics_failed(self, gen: int, msg: str) -> None:
+        if gen == self._an_gen and self._win and self._win.winfo_exists():
+            self._an_status.config(text=msg)
+
+    def _draw_analytics(self, gen: int, hours: list, apps, fig, canvas) -> None:
+        if gen != self._an_gen or not (self._win and self._win.winfo_exists()):
+            return   # superseded by a newer range, or window closed
+        self._an_status.config(text="")
 
         ax_hour, ax_app = self._an_axes
         ax_hour.clear()
@@ -219,13 +321,6 @@ class StatusWindow:
             ax.title.set_color(FG)
 
         # chart 1: violations by hour
-        hours = [0] * 24
-        for v in violations:
-            try:
-                h = int(v["ts"][11:13])
-                hours[h] += 1
-            except Exception:
-                pass
         ax_hour.bar(range(24), hours, color=RED, alpha=0.8, width=0.8)
         ax_hour.set_title("Violations by Hour")
         ax_hour.set_xlabel("Hour", color=FG)
@@ -233,7 +328,6 @@ class StatusWindow:
         ax_hour.set_xticks(range(0, 24, 3))
 
         # chart 2: top 10 violating apps
-        apps = Counter(v.get("details", {}).get("app", "?") for v in violations)
         if apps:
             labels, counts = zip(*apps.most_common(10))
             y_pos = range(len(labels))
@@ -273,10 +367,10 @@ class StatusWindow:
                            relief="groove", bd=1)
         wf.pack(fill="both", expand=True, padx=10, pady=4)
 
-        wcols = ("name", "start", "end", "mode", "force_kill", "allow_override", "apps")
+        wcols = ("name", "start", "end", "days", "mode", "force_kill", "allow_override", "apps")
         tv = ttk.Treeview(wf, columns=wcols, show="headings",
                           selectmode="none", height=6)
-        for col, w in zip(wcols, (120, 60, 60, 80, 70, 90, 210)):
+        for col, w in zip(wcols, (120, 60, 60, 110, 80, 70, 90, 210)):
             tv.heading(col, text=col)
             tv.column(col, width=w, minwidth=40)
         wsb = tk.Scrollbar(wf, orient="vertical", command=tv.yview)
@@ -289,7 +383,8 @@ class StatusWindow:
                 w.name,
                 w.start_time.strftime("%H:%M"),
                 w.end_time.strftime("%H:%M"),
-                w.mode,
+                _days_text(w),
+                f"quota {w.quota_minutes:g}m" if w.mode == "quota" else w.mode,
                 str(w.force_kill),
                 str(w.allow_override),
                 ", ".join(w.app_list),
@@ -301,11 +396,35 @@ class StatusWindow:
 
 # ── module-level helpers ──────────────────────────────────────────────────────
 
+def _days_text(w) -> str:
+    """Compact summary of a window's day/date filters for the config table."""
+    days = "daily" if not w.days_of_week else \
+        ",".join(("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")[d] for d in sorted(w.days_of_week))
+    if w.start_date or w.end_date:
+        days += f" {w.start_date or ''}…{w.end_date or ''}"
+    if w.except_dates:
+        days += f" (−{len(w.except_dates)})"
+    return days
+
+
 def _event_tag(event: str) -> str:
-    if event in ("violation", "force_killed"):
+    if event in ("violation", "violation_summary", "force_killed"):
         return "violation"
     if "override" in event:
         return "override"
-    if event in ("app_start", "config_reloaded", "guardian_restarted"):
+    if event in ("app_start", "config_reloaded", "guardian_restarted", "standby_promoted"):
         return "info"
     return ""
+
+
+def main() -> None:
+    cfg_mgr = ConfigManager(BASE_DIR / "config.yaml")
+    logger.init(BASE_DIR / cfg_mgr.config.log_dir)
+    root = tk.Tk()
+    root.withdraw()
+    StatusWindow(root, lambda: cfg_mgr.config, on_close=root.destroy).toggle()
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
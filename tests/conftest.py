@@ -0,0 +1,31 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# The modules live at the repository root, next to main.py.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+class FakeClock:
+    """Settable stand-in for the clock= parameters (time.monotonic and friends)."""
+
+    def __init__(self, t: float = 1000.0):
+        self.t = t
+
+    def __call__(self) -> float:
+        return self.t
+
+    def advance(self, seconds: float) -> None:
+        self.t += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def make_clock():
+    """For tests that need more than one clock (e.g. a restarted process)."""
+    return FakeClock
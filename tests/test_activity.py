@@ -0,0 +1,81 @@
+import time
+
+import pytest
+
+from activity import ActivityLog
+
+WALL = 1_800_000_000.0
+
+
+
+@pytest.fixture
+def wall(monkeypatch):
+    """time.time(), pinned so restore() ages are exact."""
+    now = [WALL]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    return now
+
+
+def _log(clock):
+    events = []
+    log = ActivityLog(emit=lambda event, **kw: events.append((event, kw)), clock=clock)
+    return log, events
+
+
+def test_export_restore_round_trip_does_not_relog(wall, clock, make_clock):
+    log, events = _log(clock)
+    log.violation("night", "steam.exe")
+    for _ in range(3):
+        clock.advance(5)
+        log.violation("night", "steam.exe")
+    saved = log.export()
+
+    restored, events = _log(make_clock(10.0))   # new process, new monotonic base
+    restored.restore(saved)
+    restored.violation("night", "steam.exe")
+    assert events == []                     # still inside the same run
+    restored.close()
+    assert events == [("violation_summary",
+                       {"rule": "night", "app": "steam.exe", "count": 3, "seconds": 15.0})]
+
+
+def test_restore_flushes_run_whose_interval_passed(wall, clock):
+    log, events = _log(clock)
+    log.restore([["night", "steam.exe", 4, WALL - 90, WALL - 80]])
+    assert [e for e, _ in events] == ["violation_summary"]
+    assert events[0][1]["count"] == 4
+    log.violation("night", "steam.exe")
+    assert [e for e, _ in events] == ["violation_summary", "violation"]
+
+
+def test_restore_drops_stale_run_without_count(wall, clock):
+    log, events = _log(clock)
+    log.restore([["night", "steam.exe", 0, WALL - 300, WALL - 300]])
+    assert events == []
+    assert log.export() == []
+
+
+def test_restore_discards_times_in_the_future(wall, clock):
+    # Saved, then the clock was set back an hour.
+    log, events = _log(clock)
+    log.restore([["night", "steam.exe", 2, WALL + 3600, WALL + 3610],
+                 ["night", "game.exe", 2, WALL - 10, WALL + 5]])
+    assert events == []
+    assert log.export() == []
+
+
+def test_restore_after_clock_moved_forward(wall, clock):
+    log, events = _log(clock)
+    saved = [["night", "steam.exe", 2, WALL - 20, WALL - 10]]
+    wall[0] += 6 * 3600
+    log.restore(saved)
+    assert [e for e, _ in events] == ["violation_summary"]
+    assert log.export() == []
+
+
+def test_restore_clamps_last_to_run_start(wall, clock):
+    # last < since can only come from a bad file; the run must still behave.
+    log, events = _log(clock)
+    log.restore([["night", "steam.exe", 1, WALL - 10, WALL - 50]])
+    [[_, _, count, since, last]] = log.export()
+    assert count == 1 and last >= since
@@ -0,0 +1,42 @@
+import pytest
+
+from config import _parse_days, _parse_yaml
+
+BASE = b"time_windows: []\n"
+
+
+@pytest.mark.parametrize("text, expected", [
+    (b"", None),
+    (b"log_fsync: null\n", None),
+    (b"log_fsync: false\n", None),
+    (b"log_fsync: 0\n", 0.0),
+    (b"log_fsync: 2.5\n", 2.5),
+])
+def test_log_fsync(text, expected):
+    assert _parse_yaml(BASE + text).log_fsync == expected
+
+
+@pytest.mark.parametrize("text", [b"log_fsync: -1\n", b"log_fsync: true\n", b"log_fsync: often\n"])
+def test_log_fsync_rejects_nonsense(text):
+    with pytest.raises(ValueError):
+        _parse_yaml(BASE + text)
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, set()),
+    ("weekdays", {0, 1, 2, 3, 4}),
+    ("Weekends", {5, 6}),
+    ("sat", {5}),
+    (["mon", "Wednesday", " FRI "], {0, 2, 4}),
+    ([0, 6], {0, 6}),
+])
+def test_days_of_week(value, expected):
+    assert _parse_days(value) == expected
+
+
+@pytest.mark.parametrize("value", [
+    ["monkey"], ["sunburn"], ["thurs"], ["mo"], [7], [-1], [True], [False], [1.0], "someday",
+])
+def test_days_of_week_rejects_anything_else(value):
+    with pytest.raises(ValueError):
+        _parse_days(value)
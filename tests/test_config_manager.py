@@ -0,0 +1,144 @@
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+import config
+from config import ConfigManager
+
+VALID = """
+check_interval: {interval}
+time_windows:
+  - name: night
+    start_time: "22:00"
+    end_time: "06:00"
+    mode: blacklist
+    app_list: [steam.exe]
+"""
+INVALID = "time_windows:\n  - name: broken\n    start_time: [\n"
+
+
+def _save(path, text):
+    """Atomic save the way most editors do it: temp file, then rename."""
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(text)
+    os.replace(tmp, path)
+
+
+class Recorder:
+    def __init__(self):
+        self.reloads = []
+        self.invalid = []
+        self.event = threading.Event()
+
+    def on_reload(self, cfg):
+        self.reloads.append(cfg)
+        self.event.set()
+
+    def on_invalid(self, err):
+        self.invalid.append(err)
+        self.event.set()
+
+    def wait(self, timeout=3.0):
+        ok = self.event.wait(timeout)
+        self.event.clear()
+        return ok
+
+
+def _quiet(mgr):
+    """Stop the watcher thread and wait for it, so direct _check()/reload() calls don't race it."""
+    mgr.stop()
+    mgr._thread.join(timeout=5)
+    assert not mgr._thread.is_alive()
+    return mgr
+
+
+@pytest.fixture(params=["native", "polling"])
+def manager(request, tmp_path, monkeypatch):
+    if request.param == "native" and not sys.platform.startswith("linux"):
+        pytest.skip("native watcher is only testable here on Linux")
+    if request.param == "polling":
+        import fswatch
+        monkeypatch.setattr(fswatch, "create_watcher",
+                            lambda path: fswatch.PollingWatcher(path, poll_interval=0.02))
+    monkeypatch.setattr(ConfigManager, "DEBOUNCE", 0.15)
+    path = tmp_path / "config.yaml"
+    path.write_text(VALID.format(interval=0.5))
+    rec = Recorder()
+    mgr = ConfigManager(path, on_reload=rec.on_reload, on_invalid=rec.on_invalid)
+    time.sleep(0.1)     # let the watcher thread arm
+    yield path, mgr, rec
+    mgr.stop()
+
+
+def test_initial_load(manager):
+    path, mgr, rec = manager
+    assert mgr.config.check_interval == 0.5
+    assert mgr.config.generation == 1
+
+
+def test_burst_of_saves_reloads_once(manager):
+    path, mgr, rec = manager
+    for i in range(5):
+        _save(path, VALID.format(interval=1 + i))
+        time.sleep(0.05)
+    assert rec.wait()
+    time.sleep(0.5)
+    assert len(rec.reloads) == 1
+    assert mgr.config.check_interval == 5
+    assert mgr.config.generation == 2
+
+
+def test_unchanged_contents_do_not_reload(manager):
+    path, mgr, rec = manager
+    _save(path, VALID.format(interval=0.5))
+    os.utime(path)
+    assert not rec.wait(0.6)
+    assert rec.reloads == []
+
+
+def test_invalid_then_valid(manager):
+    path, mgr, rec = manager
+    _save(path, INVALID)
+    assert rec.wait()
+    assert len(rec.invalid) == 1 and rec.reloads == []
+    assert mgr.config.check_interval == 0.5          # last known good kept
+
+    _save(path, INVALID + "# still broken\n")
+    assert not rec.wait(0.6)
+    assert len(rec.invalid) == 1                     # reported once per broken spell
+
+    _save(path, VALID.format(interval=2))
+    assert rec.wait()
+    assert mgr.config.check_interval == 2
+
+
+def test_new_breakage_after_restoring_live_config_is_reported(tmp_path):
+    # _check() directly, without the watcher thread's timing.
+    path = tmp_path / "config.yaml"
+    good = VALID.format(interval=0.5)
+    path.write_text(good)
+    rec = Recorder()
+    mgr = _quiet(ConfigManager(path, on_reload=rec.on_reload, on_invalid=rec.on_invalid))
+    path.write_text(INVALID)
+    mgr._check()
+    path.write_text(good)           # put the live config back
+    mgr._check()
+    path.write_text(INVALID + "# different\n")
+    mgr._check()
+    assert len(rec.invalid) == 2
+    assert rec.reloads == []
+
+
+def test_reload_bumps_generation(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text(VALID.format(interval=0.5))
+    mgr = _quiet(ConfigManager(path))
+    path.write_text(VALID.format(interval=3))
+    assert mgr.reload().generation == 2
+    with pytest.raises(Exception):
+        path.write_text(INVALID)
+        mgr.reload()
+    assert mgr.config.check_interval == 3
@@ -0,0 +1,76 @@
+import threading
+import time
+
+from foreground import PollingForegroundSource, ScriptedForegroundSource
+
+
+def test_scripted_source_wakes_wait_on_change():
+    src = ScriptedForegroundSource([(0.05, 101)], initial=100)
+    assert src.event_driven
+    assert src.current() == 100
+    src.start()
+    try:
+        t0 = time.monotonic()
+        assert src.wait(2.0)
+        assert time.monotonic() - t0 < 1.0
+        assert src.current() == 101
+    finally:
+        src.stop()
+
+
+def test_wait_times_out_without_change():
+    src = ScriptedForegroundSource(initial=5)
+    t0 = time.monotonic()
+    assert not src.wait(0.1)
+    assert time.monotonic() - t0 >= 0.09
+
+
+def test_same_hwnd_does_not_wake():
+    src = ScriptedForegroundSource(initial=5)
+    src.push(5)
+    assert not src.wait(0.05)
+    src.push(6)
+    assert src.wait(0.05)
+
+
+def test_wake_without_change():
+    src = ScriptedForegroundSource(initial=5)
+    threading.Timer(0.05, src.wake).start()
+    assert src.wait(2.0)
+    assert src.current() == 5
+
+
+def test_change_before_wait_is_not_lost():
+    src = ScriptedForegroundSource(initial=1)
+    src.push(2)
+    assert src.wait(0)
+    assert not src.wait(0)      # consumed
+
+
+def test_script_plays_in_order_and_stop_ends_it():
+    src = ScriptedForegroundSource([(0.01, 1), (0.01, 2), (0.01, 3), (10.0, 4)])
+    seen = []
+    src.start()
+    while len(seen) < 3 and src.wait(1.0):
+        seen.append(src.current())
+    src.stop()
+    assert src.done.wait(1.0)
+    assert seen == [1, 2, 3]
+    assert src.current() == 3
+
+
+def test_polling_source_reads_getter_on_demand():
+    values = iter([7, 0, None])
+    src = PollingForegroundSource(lambda: next(values))
+    assert not src.event_driven
+    assert src.current() == 7
+    assert src.current() == 0
+    assert src.current() == 0       # None is normalised
+    assert src.current() == 0       # getter raising is treated as no foreground
+
+
+def test_polling_source_never_wakes_early():
+    src = PollingForegroundSource(lambda: 1)
+    t0 = time.monotonic()
+    assert not src.wait(0.1)
+    assert time.monotonic() - t0 >= 0.09
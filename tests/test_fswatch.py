@@ -0,0 +1,88 @@
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+from fswatch import InotifyWatcher, PollingWatcher
+
+linux_only = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+
+
+def _later(delay, fn):
+    t = threading.Timer(delay, fn)
+    t.start()
+    return t
+
+
+def _atomic_save(path, text):
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(text)
+    os.replace(tmp, path)
+
+
+@pytest.fixture
+def cfg(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text("a: 1\n")
+    return path
+
+
+@linux_only
+def test_inotify_sees_in_place_write(cfg):
+    w = InotifyWatcher(cfg)
+    try:
+        _later(0.05, lambda: cfg.write_text("a: 2\n"))
+        assert w.wait(2.0)
+    finally:
+        w.close()
+
+
+@linux_only
+def test_inotify_sees_atomic_rename(cfg):
+    w = InotifyWatcher(cfg)
+    try:
+        _later(0.05, lambda: _atomic_save(cfg, "a: 2\n"))
+        assert w.wait(2.0)
+    finally:
+        w.close()
+
+
+@linux_only
+def test_inotify_other_files_do_not_end_the_wait(cfg):
+    w = InotifyWatcher(cfg)
+    try:
+        _later(0.05, lambda: (cfg.parent / "other.txt").write_text("x"))
+        t0 = time.monotonic()
+        assert not w.wait(0.5)
+        assert time.monotonic() - t0 >= 0.45
+    finally:
+        w.close()
+
+
+@linux_only
+def test_inotify_closed_watcher_returns_false(cfg):
+    w = InotifyWatcher(cfg)
+    w.close()
+    assert not w.wait(0.1)
+
+
+def test_polling_sees_change(cfg):
+    w = PollingWatcher(cfg, poll_interval=0.02)
+    _later(0.05, lambda: _atomic_save(cfg, "a: 22\n"))
+    assert w.wait(2.0)
+    assert not w.wait(0.1)      # nothing new since
+
+
+def test_polling_times_out(cfg):
+    w = PollingWatcher(cfg, poll_interval=0.02)
+    t0 = time.monotonic()
+    assert not w.wait(0.2)
+    assert time.monotonic() - t0 >= 0.18
+
+
+def test_polling_sees_deletion(cfg):
+    w = PollingWatcher(cfg, poll_interval=0.02)
+    cfg.unlink()
+    assert w.wait(0.5)
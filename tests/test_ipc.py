@@ -0,0 +1,92 @@
+import json
+import os
+import socket
+import sys
+import uuid
+from multiprocessing.connection import Client
+
+import pytest
+
+import ipc
+
+
+@pytest.fixture
+def name():
+    n = f"test-{uuid.uuid4().hex[:12]}"
+    yield n
+    addr, family = ipc.address(n)
+    if family == "AF_UNIX" and os.path.exists(addr):
+        os.unlink(addr)
+
+
+@pytest.fixture
+def serve(name):
+    servers = []
+
+    def start(handlers):
+        server = ipc.Server(name, handlers)
+        servers.append(server)
+        return server
+
+    yield start
+    for s in servers:
+        s.close()
+
+
+def _raw(name, payload: bytes) -> dict:
+    addr, family = ipc.address(name)
+    with Client(addr, family) as conn:
+        conn.send_bytes(payload)
+        assert conn.poll(2)
+        return json.loads(conn.recv_bytes())
+
+
+def test_round_trip(name, serve):
+    serve({"status": lambda req: {"pid": 42}, "echo": lambda req: req["x"]})
+    assert ipc.request(name, timeout=2) == {"pid": 42}
+    assert ipc.request(name, "echo", timeout=2, x=[1, "two"]) == [1, "two"]
+
+
+def test_unknown_and_missing_op(name, serve):
+    serve({"status": lambda req: 1})
+    assert ipc.request(name, "nope", timeout=2) is None
+    reply = _raw(name, b'{"op": "nope"}')
+    assert reply["ok"] is False and "unknown or missing op" in reply["error"]
+    reply = _raw(name, b'{"args": 1}')
+    assert reply["ok"] is False and "unknown or missing op" in reply["error"]
+
+
+def test_handler_error_is_reported_not_raised(name, serve):
+    serve({"status": lambda req: 1 / 0})
+    reply = _raw(name, b'{"op": "status"}')
+    assert reply == {"ok": False, "error": "ZeroDivisionError: division by zero"}
+    assert ipc.request(name, timeout=2) is None
+
+
+@pytest.mark.parametrize("payload", [b"{not json", b"\xff\xfe", b'["status"]'])
+def test_malformed_request(name, serve, payload):
+    serve({"status": lambda req: 1})
+    assert _raw(name, payload)["ok"] is False
+    assert ipc.request(name, timeout=2) == 1       # the server is still serving
+
+
+def test_absent_endpoint(name):
+    assert ipc.request(name, timeout=0.2) is None
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Unix socket endpoints")
+def test_stale_socket_is_replaced(name, serve):
+    addr, _ = ipc.address(name)
+    dead = socket.socket(socket.AF_UNIX)
+    dead.bind(addr)                                 # a holder that died without unlinking
+    dead.close()
+    serve({"status": lambda req: "fresh"})
+    assert ipc.request(name, timeout=2) == "fresh"
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Unix socket endpoints")
+def test_live_endpoint_is_not_stolen(name, serve):
+    serve({"status": lambda req: "first"})
+    with pytest.raises(OSError):
+        ipc.Server(name, {"status": lambda req: "second"})
+    assert ipc.request(name, timeout=2) == "first"
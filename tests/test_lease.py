@@ -0,0 +1,196 @@
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from lease import FileLease, LocalLease, Standby
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+class FakeProc:
+    _next_pid = 100
+
+    def __init__(self):
+        FakeProc._next_pid += 1
+        self.pid = FakeProc._next_pid
+        self.returncode = None
+
+    def poll(self):
+        return self.returncode
+
+    def die(self, rc=1):
+        self.returncode = rc
+
+
+class FakeLauncher:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.launched = []
+
+    def __call__(self, standby=False):
+        assert standby
+        if self.fail:
+            raise OSError("spawn failed")
+        proc = FakeProc()
+        self.launched.append(proc)
+        return proc
+
+
+@pytest.fixture
+def standby(clock):
+    launch = FakeLauncher()
+    return Standby(launch, retry=30.0, clock=clock), launch, clock
+
+
+# --------------------------------------------------------------------------- Standby
+
+def test_tend_spawns_once_while_alive(standby):
+    sb, launch, clock = standby
+    sb.tend()
+    sb.tend()
+    assert len(launch.launched) == 1
+    assert sb.proc is launch.launched[0]
+
+
+def test_defer_holds_back_the_spawn(standby):
+    sb, launch, clock = standby
+    sb.defer(5.0)
+    sb.tend()
+    clock.advance(4.9)
+    sb.tend()
+    assert launch.launched == []
+    clock.advance(0.2)
+    sb.tend()
+    assert len(launch.launched) == 1
+
+
+def test_defer_never_shortens_a_longer_wait(standby):
+    sb, launch, clock = standby
+    sb.defer(30.0)
+    sb.defer(5.0)
+    clock.advance(10)
+    sb.tend()
+    assert launch.launched == []
+
+
+def test_standby_that_dies_is_respawned_after_retry(standby):
+    sb, launch, clock = standby
+    sb.tend()
+    launch.launched[0].die()
+    sb.tend()
+    assert sb.proc is None and len(launch.launched) == 1
+    clock.advance(29)
+    sb.tend()
+    assert len(launch.launched) == 1
+    clock.advance(2)
+    sb.tend()
+    assert len(launch.launched) == 2
+
+
+def test_failed_spawn_waits_for_retry(clock):
+    launch = FakeLauncher(fail=True)
+    sb = Standby(launch, retry=30.0, clock=clock)
+    sb.tend()
+    launch.fail = False
+    sb.tend()
+    assert launch.launched == []
+    clock.advance(31)
+    sb.tend()
+    assert len(launch.launched) == 1
+
+
+def test_promote_hands_over_a_live_standby(standby):
+    sb, launch, clock = standby
+    sb.tend()
+    proc = sb.promote()
+    assert proc is launch.launched[0]
+    assert sb.proc is None
+    assert sb.promote() is None
+    sb.tend()                                   # a fresh standby for the next handoff
+    assert len(launch.launched) == 2
+
+
+def test_promote_ignores_a_dead_standby(standby):
+    sb, launch, clock = standby
+    sb.tend()
+    launch.launched[0].die()
+    assert sb.promote() is None
+
+
+def test_promoted_standby_already_holds_the_lease(standby):
+    # The standby parks on the lease; it is enforcing before promote() runs.
+    sb, launch, clock = standby
+    name = "test-handoff"
+    active = LocalLease(name)
+    assert active.acquire(timeout=0)
+    took_over = threading.Event()
+
+    def parked():
+        LocalLease(name).acquire()
+        took_over.set()
+
+    waiter = threading.Thread(target=parked, daemon=True)
+    waiter.start()
+    sb.tend()
+    assert not took_over.wait(0.05)
+    active.release()                            # the active main.py exits
+    assert took_over.wait(2)
+    assert sb.promote() is launch.launched[0]
+    waiter.join(2)
+
+
+# --------------------------------------------------------------------------- leases
+
+def test_local_lease_is_exclusive_per_name():
+    a, b, other = LocalLease("test-excl"), LocalLease("test-excl"), LocalLease("test-other")
+    assert a.acquire(timeout=0)
+    assert not b.acquire(timeout=0.01)
+    assert other.acquire(timeout=0)
+    a.release()
+    assert b.acquire(timeout=0)
+    b.release()
+    other.release()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="flock lease is POSIX only")
+def test_file_lease_is_exclusive(tmp_path):
+    path = tmp_path / "locks" / "monitor.lock"
+    a, b = FileLease(path), FileLease(path)
+    assert a.acquire(timeout=0)
+    assert not b.acquire(timeout=0.05)
+    a.release()
+    assert b.acquire(timeout=0)
+    b.release()
+
+
+HOLDER = """
+import sys, time
+sys.path.insert(0, sys.argv[1])
+from lease import FileLease
+FileLease(sys.argv[2]).acquire()
+print("held", flush=True)
+time.sleep(60)
+"""
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="flock lease is POSIX only")
+def test_file_lease_is_taken_over_when_the_holder_is_killed(tmp_path):
+    path = tmp_path / "monitor.lock"
+    holder = subprocess.Popen([sys.executable, "-c", HOLDER, str(ROOT), str(path)],
+                              stdout=subprocess.PIPE, text=True)
+    try:
+        assert holder.stdout.readline().strip() == "held"
+        waiter = FileLease(path)
+        assert not waiter.acquire(timeout=0.05)
+        holder.kill()                           # no release(): the OS drops the lock
+        t0 = time.monotonic()
+        assert waiter.acquire(timeout=5)
+        assert time.monotonic() - t0 < 2
+    finally:
+        holder.kill()
+        holder.wait()
+        holder.stdout.close()
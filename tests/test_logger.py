@@ -0,0 +1,99 @@
+import json
+from datetime import date
+
+import pytest
+
+import logger
+from logger import _Writer
+
+
+def _records(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+@pytest.fixture
+def writer(tmp_path):
+    made = []
+
+    def make(max_queue=100, fsync=None):
+        w = _Writer(tmp_path, max_queue, fsync)
+        made.append(w)
+        return w
+
+    yield make
+    for w in made:
+        w.close(2)
+
+
+def _line(n, event="tick"):
+    return json.dumps({"ts": "2026-03-10T12:00:00", "event": event, "details": {"n": n}})
+
+
+def test_flush_waits_until_everything_is_written(writer, tmp_path):
+    w = writer()
+    for n in range(50):
+        w.put("2026-03-10", _line(n))
+    assert w.flush(2)
+    assert [r["details"]["n"] for r in _records(tmp_path / "2026-03-10.jsonl")] == list(range(50))
+
+
+def test_flush_with_nothing_queued_returns_at_once(writer):
+    assert writer().flush(0)
+
+
+def test_full_queue_drops_oldest_and_reports_the_count(writer, tmp_path):
+    # log_dropped is stamped with the current time, so use today's file.
+    today = date.today().isoformat()
+    w = writer(max_queue=3)
+    with w._cond:                  # hold the writer off while the queue overflows
+        for n in range(10):
+            w.put(today, _line(n))
+    assert w.flush(2)
+    records = _records(tmp_path / f"{today}.jsonl")
+    assert records[0]["event"] == "log_dropped"
+    assert records[0]["details"] == {"count": 7}
+    assert [r["details"]["n"] for r in records[1:]] == [7, 8, 9]
+
+
+def test_day_rollover_switches_files(writer, tmp_path):
+    w = writer()
+    w.put("2026-03-10", _line(1))
+    w.put("2026-03-11", _line(2))
+    w.put("2026-03-11", _line(3))
+    assert w.flush(2)
+    assert [r["details"]["n"] for r in _records(tmp_path / "2026-03-10.jsonl")] == [1]
+    assert [r["details"]["n"] for r in _records(tmp_path / "2026-03-11.jsonl")] == [2, 3]
+
+
+def test_close_drains_the_queue(tmp_path):
+    w = _Writer(tmp_path, 100, None)
+    with w._cond:
+        for n in range(5):
+            w.put("2026-03-10", _line(n))
+    w.close(2)
+    assert len(_records(tmp_path / "2026-03-10.jsonl")) == 5
+
+
+@pytest.mark.parametrize("fsync, expect_syncs", [(None, 0), (0, 3), (3600, 1)])
+def test_fsync_policy(writer, monkeypatch, fsync, expect_syncs):
+    synced = []
+    monkeypatch.setattr(logger.os, "fsync", synced.append)
+    w = writer(fsync=fsync)
+    for n in range(3):
+        w.put("2026-03-10", _line(n))
+        assert w.flush(2)           # one batch each
+    assert len(synced) == expect_syncs
+
+
+def test_init_passes_fsync_to_the_writer(tmp_path, monkeypatch):
+    monkeypatch.setattr(logger.os, "fsync", lambda fd: None)
+    try:
+        logger.init(tmp_path, fsync=0)
+        logger.log("hello", x=1)
+        assert logger.flush(2)
+        assert logger._writer._fsync == 0
+        [record] = _records(logger._log_path())
+        assert record["event"] == "hello" and record["details"] == {"x": 1}
+    finally:
+        logger.shutdown()
+        logger.init(tmp_path)
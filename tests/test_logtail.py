@@ -0,0 +1,98 @@
+import json
+import os
+
+import pytest
+
+import logger
+from logger import LogTail
+
+
+def _line(n):
+    return json.dumps({"ts": "2026-03-10T12:00:00", "event": "tick", "details": {"n": n}}) + "\n"
+
+
+def _append(path, text):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(text)
+
+
+def _ns(records):
+    return [r["details"]["n"] for r in records]
+
+
+@pytest.fixture
+def today(tmp_path, monkeypatch):
+    """A settable 'today's log file' for LogTail."""
+    current = [tmp_path / "2026-03-10.jsonl"]
+    monkeypatch.setattr(logger, "_log_path", lambda: current[0])
+    return current
+
+
+def test_first_read_resets_then_only_new_records(today):
+    _append(today[0], _line(1) + _line(2))
+    tail = LogTail()
+    reset, records = tail.read_new()
+    assert reset and _ns(records) == [1, 2]
+    assert tail.read_new() == (False, [])
+    _append(today[0], _line(3))
+    reset, records = tail.read_new()
+    assert not reset and _ns(records) == [3]
+
+
+def test_missing_file_is_empty(today):
+    tail = LogTail()
+    assert tail.read_new() == (True, [])
+    assert tail.read_new() == (False, [])
+    _append(today[0], _line(1))
+    reset, records = tail.read_new()
+    assert reset and _ns(records) == [1]        # the file appeared: a new identity
+
+
+def test_partial_line_is_held_back(today):
+    whole = _line(2)
+    _append(today[0], _line(1) + whole[:15])
+    tail = LogTail()
+    assert _ns(tail.read_new()[1]) == [1]
+    assert tail.read_new() == (False, [])
+    _append(today[0], whole[15:])
+    reset, records = tail.read_new()
+    assert not reset and _ns(records) == [2]
+
+
+def test_day_rollover_resets(today, tmp_path):
+    _append(today[0], _line(1))
+    tail = LogTail()
+    tail.read_new()
+    today[0] = tmp_path / "2026-03-11.jsonl"
+    _append(today[0], _line(2))
+    reset, records = tail.read_new()
+    assert reset and _ns(records) == [2]
+
+
+def test_day_rollover_drops_a_partial_line(today, tmp_path):
+    _append(today[0], _line(1) + _line(9)[:10])
+    tail = LogTail()
+    tail.read_new()
+    today[0] = tmp_path / "2026-03-11.jsonl"
+    _append(today[0], _line(2))
+    assert _ns(tail.read_new()[1]) == [2]
+
+
+def test_truncation_resets(today):
+    _append(today[0], _line(1) + _line(2))
+    tail = LogTail()
+    tail.read_new()
+    today[0].write_text(_line(3))
+    reset, records = tail.read_new()
+    assert reset and _ns(records) == [3]
+
+
+def test_replacement_resets(today, tmp_path):
+    _append(today[0], _line(1))
+    tail = LogTail()
+    tail.read_new()
+    tmp = tmp_path / "new.tmp"
+    tmp.write_text(_line(1) + _line(2) + _line(3))
+    os.replace(tmp, today[0])
+    reset, records = tail.read_new()
+    assert reset and _ns(records) == [1, 2, 3]
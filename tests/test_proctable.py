@@ -0,0 +1,127 @@
+import pytest
+
+from proctable import FakeProcessTable, ProcessIndex
+
+STEAM = r"c:\games\steam.exe"
+HELPER = r"c:\games\steamwebhelper.exe"
+NOTEPAD = r"c:\windows\notepad.exe"
+IMPORTANT = r"c:\work\important.exe"
+
+
+@pytest.fixture(params=[True, False], ids=["snapshot", "pid-diff"])
+def make_index(request):
+    def make(procs):
+        table = FakeProcessTable(procs, snapshot=request.param)
+        return table, ProcessIndex(table, kill_interval=0)
+    return make
+
+
+def test_kill_by_name(make_index):
+    table, index = make_index({1: (100.0, STEAM, 0), 2: (101.0, NOTEPAD, 0), 3: (102.0, STEAM, 0)})
+    assert sorted(index.kill("Steam.exe")) == [1, 3]
+    assert list(table.procs) == [2]
+
+
+def test_kill_finds_caller_pid_on_reused_pid(make_index):
+    table, index = make_index({1: (100.0, NOTEPAD, 0)})
+    index.refresh()
+    table.procs[1] = (200.0, STEAM, 0)   # notepad exited, steam got pid 1
+
+    assert index.kill("steam.exe", pids=[1]) == [1]
+    assert 1 not in table.procs
+
+
+def test_snapshot_finds_reused_pid_without_hint():
+    table = FakeProcessTable({1: (100.0, NOTEPAD, 0)})
+    index = ProcessIndex(table, kill_interval=0)
+    index.refresh()
+    table.procs[1] = (200.0, STEAM, 0)
+    assert index.kill("steam.exe") == [1]
+
+
+def test_kill_skips_stale_name_on_reused_pid(make_index):
+    table, index = make_index({1: (100.0, STEAM, 0)})
+    index.refresh()
+    table.procs[1] = (200.0, IMPORTANT, 0)
+
+    assert index.kill("steam.exe") == []
+    assert 1 in table.procs
+
+
+def test_tree_kill(make_index):
+    table, index = make_index({
+        1: (100.0, STEAM, 0),
+        2: (101.0, HELPER, 1),
+        3: (102.0, HELPER, 2),
+        4: (103.0, NOTEPAD, 0),
+    })
+    assert sorted(index.kill("steam.exe", tree=True)) == [1, 2, 3]
+    assert list(table.procs) == [4]
+
+
+def test_tree_kill_skips_reused_descendant():
+    # Without a snapshot the index keeps pid 2 as steam's helper after an
+    # unrelated process took the PID over.
+    table = FakeProcessTable({1: (100.0, STEAM, 0), 2: (101.0, HELPER, 1)}, snapshot=False)
+    index = ProcessIndex(table, kill_interval=0)
+    index.refresh()
+    table.procs[2] = (300.0, IMPORTANT, 5)
+
+    assert index.kill("steam.exe", tree=True) == [1]
+    assert 2 in table.procs
+
+
+def test_tree_kill_skips_pid_reused_between_check_and_kill(make_index):
+    table, index = make_index({1: (100.0, STEAM, 0), 2: (101.0, HELPER, 1), 3: (102.0, HELPER, 1)})
+    real_kill = table.kill
+
+    def kill(pid):
+        real_kill(pid)
+        if pid == 3:    # while we kill 3, 2 exits and an unrelated process takes its PID
+            table.procs[2] = (300.0, IMPORTANT, 1)
+
+    table.kill = kill
+    assert 2 not in index.kill("steam.exe", tree=True)
+    assert table.procs[2][1] == IMPORTANT
+
+
+def test_tree_kill_ignores_orphan_of_reused_parent_pid(make_index):
+    # pid 7 outlived its original parent; steam now has pid 1, the orphan's stale ppid.
+    table, index = make_index({
+        1: (500.0, STEAM, 0),
+        7: (50.0, IMPORTANT, 1),
+        8: (501.0, HELPER, 1),
+    })
+    assert sorted(index.kill("steam.exe", tree=True)) == [1, 8]
+    assert 7 in table.procs
+
+
+def test_refresh_costs_one_call_when_steady(make_index):
+    procs = {pid: (float(pid), rf"c:\apps\app{pid}.exe", 0) for pid in range(1, 101)}
+    table, index = make_index(procs)
+    index.refresh()
+    table.calls = 0
+    index.refresh()
+    assert table.calls == 1
+
+
+def test_pid_diff_queries_only_new_processes():
+    procs = {pid: (float(pid), rf"c:\apps\app{pid}.exe", 0) for pid in range(1, 101)}
+    table = FakeProcessTable(procs, snapshot=False)
+    index = ProcessIndex(table)
+    index.refresh()
+    table.procs[500] = (500.0, STEAM, 0)
+    del table.procs[1]
+    table.calls = 0
+    index.refresh()
+    assert table.calls == 3                 # pids(), then name() and ppid() of pid 500
+    assert index.pids("steam.exe") == {500}
+    assert 1 not in index.live_pids()
+
+
+def test_kill_is_rate_limited_per_name():
+    table = FakeProcessTable({1: (100.0, STEAM, 0)})
+    index = ProcessIndex(table, kill_interval=60)
+    assert index.kill("steam.exe") == [1]
+    table.procs[2] = (200.0, STEAM, 0)
+    assert index.kill("steam.exe") == []
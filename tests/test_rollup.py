@@ -0,0 +1,127 @@
+import json
+import os
+
+import pytest
+
+import rollup
+from rollup import RollupStore
+
+DAY = "2026-03-10"
+
+
+def _line(hour, event="violation", app="game.exe", rule="Night", **details):
+    return json.dumps({"ts": f"{DAY}T{hour:02d}:15:00", "event": event,
+                       "details": {"app": app, "rule": rule, **details}}) + "\n"
+
+
+@pytest.fixture
+def day_file(tmp_path):
+    return tmp_path / f"{DAY}.jsonl"
+
+
+@pytest.fixture
+def folds(monkeypatch):
+    """Offsets _fold was called with."""
+    calls = []
+    fold = rollup._fold
+
+    def spy(path, offset, counts):
+        calls.append(offset)
+        return fold(path, offset, counts)
+
+    monkeypatch.setattr(rollup, "_fold", spy)
+    return calls
+
+
+def _append(path, text):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(text)
+
+
+def test_counts_per_hour_app_rule_event(tmp_path, day_file):
+    day_file.write_text(_line(1) + _line(1) + _line(2, app="b.exe")
+                        + _line(3, event="violation_summary", count=5)
+                        + _line(3, event="foreground_changed") + "not json\n")
+    counts = RollupStore(tmp_path).day(DAY)
+    assert counts == {
+        (1, "game.exe", "Night", "violation"): 2,
+        (2, "b.exe", "Night", "violation"): 1,
+        (3, "game.exe", "Night", "violation"): 5,
+        (3, "game.exe", "Night", "foreground_changed"): 1,
+    }
+    hours, apps = RollupStore(tmp_path).query(DAY, DAY)
+    assert hours[1] == 2 and hours[3] == 5 and sum(hours) == 8
+    assert apps == {"game.exe": 7, "b.exe": 1}
+
+
+def test_unchanged_day_is_served_from_the_sidecar(tmp_path, day_file, folds):
+    day_file.write_text(_line(1) * 3)
+    first = RollupStore(tmp_path).day(DAY)
+    assert (tmp_path / ".rollup" / f"{DAY}.json").exists()
+    folds.clear()
+    assert RollupStore(tmp_path).day(DAY) == first      # a fresh store, as after a restart
+    assert folds == []
+
+
+def test_growth_is_folded_from_the_stored_offset(tmp_path, day_file, folds):
+    day_file.write_text(_line(1) * 3)
+    RollupStore(tmp_path).day(DAY)
+    size = day_file.stat().st_size
+    _append(day_file, _line(2) * 2)
+    folds.clear()
+    counts = RollupStore(tmp_path).day(DAY)
+    assert folds == [size]
+    assert counts[(1, "game.exe", "Night", "violation")] == 3
+    assert counts[(2, "game.exe", "Night", "violation")] == 2
+
+
+def test_partial_trailing_line_is_held_back(tmp_path, day_file):
+    store = RollupStore(tmp_path)
+    whole = _line(4)
+    day_file.write_text(_line(1) + whole[:20])
+    assert sum(store.day(DAY).values()) == 1
+    _append(day_file, whole[20:])
+    counts = store.day(DAY)
+    assert counts[(4, "game.exe", "Night", "violation")] == 1
+    assert sum(counts.values()) == 2
+
+
+def test_truncated_day_is_rebuilt(tmp_path, day_file, folds):
+    day_file.write_text(_line(1) * 5)
+    store = RollupStore(tmp_path)
+    store.day(DAY)
+    day_file.write_text(_line(2))                      # same inode, shorter
+    folds.clear()
+    assert store.day(DAY) == {(2, "game.exe", "Night", "violation"): 1}
+    assert folds == [0]
+
+
+def test_replaced_day_is_rebuilt(tmp_path, day_file, folds):
+    day_file.write_text(_line(1))
+    store = RollupStore(tmp_path)
+    store.day(DAY)
+    tmp = tmp_path / "new.tmp"
+    tmp.write_text(_line(1) + _line(5) * 4)            # longer, but a different file
+    os.replace(tmp, day_file)
+    folds.clear()
+    assert store.day(DAY) == {(1, "game.exe", "Night", "violation"): 1,
+                              (5, "game.exe", "Night", "violation"): 4}
+    assert folds == [0]
+
+
+def test_corrupt_or_old_sidecar_is_rebuilt(tmp_path, day_file):
+    day_file.write_text(_line(1) * 2)
+    sidecar = tmp_path / ".rollup" / f"{DAY}.json"
+    sidecar.parent.mkdir()
+    sidecar.write_text("{broken")
+    assert sum(RollupStore(tmp_path).day(DAY).values()) == 2
+    sidecar.write_text(json.dumps({"version": rollup.VERSION - 1}))
+    assert sum(RollupStore(tmp_path).day(DAY).values()) == 2
+
+
+def test_deleted_day_counts_nothing(tmp_path, day_file):
+    day_file.write_text(_line(1))
+    store = RollupStore(tmp_path)
+    store.day(DAY)
+    day_file.unlink()
+    assert store.day(DAY) == {}
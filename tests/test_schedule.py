@@ -0,0 +1,168 @@
+"""Randomized equivalence of ScheduleIndex against the original _in_window scan."""
+import random
+from datetime import date, datetime, time as dtime, timedelta
+
+import pytest
+
+from config import Config, TimeWindow, _in_window
+
+BASE = date(2026, 3, 2)    # a Monday
+SPAN_DAYS = 21             # dates, ranges and queries stay in [BASE - 7, BASE + 14)
+US = timedelta(microseconds=1)
+
+
+def _time(rng: random.Random) -> dtime:
+    r = rng.random()
+    if r < 0.15:
+        return rng.choice([dtime(0, 0), dtime(23, 59, 59, 999999), dtime(12, 0)])
+    if r < 0.3:
+        return dtime(rng.randrange(24), rng.randrange(60), rng.randrange(60), rng.randrange(1_000_000))
+    return dtime(rng.randrange(24), rng.choice([0, 15, 30, 45, rng.randrange(60)]))
+
+
+def _day(rng: random.Random) -> date:
+    return BASE + timedelta(days=rng.randrange(-7, SPAN_DAYS - 7))
+
+
+def _window(rng: random.Random, i: int, calendar: bool) -> TimeWindow:
+    start = _time(rng)
+    end = start if rng.random() < 0.05 else _time(rng)
+    kw = {}
+    if calendar:
+        if rng.random() < 0.5:
+            kw["days_of_week"] = frozenset(rng.sample(range(7), rng.randint(1, 6)))
+        if rng.random() < 0.3:
+            kw["start_date"] = _day(rng)
+        if rng.random() < 0.3:
+            kw["end_date"] = _day(rng)
+        if rng.random() < 0.3:
+            kw["except_dates"] = frozenset(_day(rng) for _ in range(rng.randint(1, 3)))
+    return TimeWindow(f"w{i}", start, end, "blacklist", ("x.exe",), **kw)
+
+
+def _config(rng: random.Random, calendar: bool) -> Config:
+    return Config(0.5, "logs", 30, [_window(rng, i, calendar) for i in range(rng.randint(0, 6))])
+
+
+def reference(cfg: Config, now: datetime):
+    """First matching window, by linear scan, as before the index existed."""
+    t, today = now.time(), now.date()
+    for i, w in enumerate(cfg.time_windows):
+        if not _in_window(t, w.start_time, w.end_time):
+            continue
+        if w.start_time <= w.end_time or t >= w.start_time:
+            started = today                       # same-day part
+        else:
+            started = today - timedelta(days=1)   # after midnight: yesterday's occurrence
+        if w.starts_on(started):
+            return i
+    return None
+
+
+def _active(cfg: Config, now: datetime):
+    w = cfg.is_restricted_now(now)
+    return None if w is None else cfg.time_windows.index(w)
+
+
+def _queries(rng: random.Random, cfg: Config, n: int):
+    """Random instants, plus instants on and next to every window edge."""
+    for _ in range(n):
+        d = BASE + timedelta(days=rng.randrange(SPAN_DAYS - 7))
+        yield datetime.combine(d, _time(rng))
+    for w in cfg.time_windows:
+        d = BASE + timedelta(days=rng.randrange(SPAN_DAYS - 7))
+        for t in (w.start_time, w.end_time):
+            at = datetime.combine(d, t)
+            yield from (at - US, at, at + US)
+    yield datetime.combine(BASE, dtime()) - US
+
+
+def reference_next_change(cfg: Config, now: datetime, days: int):
+    """First window edge after *now* where the reference answer changes."""
+    edges = set()
+    for k in range(days + 1):
+        day = datetime.combine(now.date() + timedelta(days=k), dtime())
+        edges.add(day)
+        for w in cfg.time_windows:
+            edges.add(datetime.combine(day.date(), w.start_time))
+            edges.add(datetime.combine(day.date(), w.end_time) + US)
+    current = reference(cfg, now)
+    for at in sorted(e for e in edges if e > now):
+        if reference(cfg, at) != current:
+            return at
+    return None
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_active_matches_in_window_every_day(seed):
+    rng = random.Random(seed)
+    cfg = _config(rng, calendar=False)
+    for now in _queries(rng, cfg, 200):
+        assert _active(cfg, now) == reference(cfg, now), now
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_active_matches_in_window_with_calendar(seed):
+    rng = random.Random(1000 + seed)
+    cfg = _config(rng, calendar=True)
+    for now in _queries(rng, cfg, 200):
+        assert _active(cfg, now) == reference(cfg, now), now
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_next_change(seed):
+    rng = random.Random(2000 + seed)
+    cfg = _config(rng, calendar=seed % 2 == 1)
+    horizon = SPAN_DAYS + 2
+    for now in _queries(rng, cfg, 40):
+        got = cfg.next_change(now)
+        want = reference_next_change(cfg, now, horizon)
+        if want is None:
+            assert got is None or got > now + timedelta(days=horizon), now
+        else:
+            assert got == want, now
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_next_change_none_means_never(seed):
+    # The walk stops after a quiet week once no dated rule is left; check
+    # against a reference scan well past every date in the config.
+    rng = random.Random(3000 + seed)
+    cfg = _config(rng, calendar=True)
+    for now in _queries(rng, cfg, 10):
+        if cfg.next_change(now) is None:
+            assert reference_next_change(cfg, now, SPAN_DAYS + 14) is None, now
+
+
+def _allday(**kw) -> TimeWindow:
+    return TimeWindow("w", dtime(0, 0), dtime(23, 59, 59, 999999), "blacklist", ("x.exe",), **kw)
+
+
+def test_next_change_finds_a_rule_far_beyond_the_date_memo():
+    start = BASE + timedelta(days=300)
+    cfg = Config(0.5, "logs", 30, [_allday(start_date=start)])
+    now = datetime.combine(BASE, dtime(12))
+    assert cfg.next_change(now) == datetime.combine(start, dtime())
+
+
+def test_next_change_walk_does_not_flush_the_date_memo():
+    cfg = Config(0.5, "logs", 30, [_allday(start_date=BASE + timedelta(days=300))])
+    now = datetime.combine(BASE, dtime(12))
+    cfg.is_restricted_now(now)
+    cfg.next_change(now)
+    assert list(cfg.schedule._days) == [BASE]
+
+
+@pytest.mark.parametrize("windows", [
+    [],
+    [_allday()],
+    [_allday(days_of_week=frozenset(range(7)), except_dates=frozenset({BASE - timedelta(days=3)}))],
+])
+def test_next_change_gives_up_after_a_quiet_week(windows, monkeypatch):
+    cfg = Config(0.5, "logs", 30, windows)
+    walked = []
+    profile = type(cfg.schedule)._profile
+    monkeypatch.setattr(type(cfg.schedule), "_profile",
+                        lambda self, d: walked.append(d) or profile(self, d))
+    assert cfg.next_change(datetime.combine(BASE, dtime(12))) is None
+    assert len(walked) <= 8
@@ -0,0 +1,81 @@
+import pytest
+
+from scheduler import TickScheduler
+
+STABLE, FAST, IDLE, OVERRIDE = (TickScheduler.STABLE, TickScheduler.FAST,
+                                TickScheduler.IDLE, TickScheduler.OVERRIDE)
+
+
+def test_stable_backs_off_exponentially_up_to_the_cap():
+    ticks = TickScheduler(event_driven=True, max_backoff=8.0)
+    waits = [ticks.delay(STABLE, 0.5, key=1) for _ in range(7)]
+    assert waits == [0.5, 1.0, 2.0, 4.0, 8.0, 8.0, 8.0]
+
+
+def test_new_key_resets_backoff():
+    ticks = TickScheduler(event_driven=True)
+    for _ in range(4):
+        ticks.delay(STABLE, 0.5, key=1)
+    assert ticks.delay(STABLE, 0.5, key=2) == 0.5
+    assert ticks.delay(STABLE, 0.5, key=2) == 1.0
+
+
+@pytest.mark.parametrize("mode", [FAST, IDLE, OVERRIDE])
+def test_other_modes_reset_backoff(mode):
+    ticks = TickScheduler(event_driven=True)
+    for _ in range(4):
+        ticks.delay(STABLE, 0.5, key=1)
+    ticks.delay(mode, 0.5)
+    assert ticks.delay(STABLE, 0.5, key=1) == 0.5
+
+
+def test_changed_resets_backoff():
+    ticks = TickScheduler(event_driven=True)
+    for _ in range(4):
+        ticks.delay(STABLE, 0.5, key=1)
+    ticks.changed()
+    assert ticks.delay(STABLE, 0.5, key=1) == 0.5
+
+
+def test_no_backoff_when_polling():
+    ticks = TickScheduler(event_driven=False)
+    assert [ticks.delay(STABLE, 0.5, key=1) for _ in range(5)] == [0.5] * 5
+
+
+def test_fast_uses_the_base_interval():
+    assert TickScheduler(event_driven=True).delay(FAST, 0.5) == 0.5
+
+
+@pytest.mark.parametrize("mode", [IDLE, OVERRIDE])
+def test_idle_and_override_sleep_to_the_deadline(mode):
+    ticks = TickScheduler(event_driven=True, max_wait=60.0)
+    assert ticks.delay(mode, 0.5) == 60.0
+    assert ticks.delay(mode, 0.5, deadline=12.5) == 12.5
+    assert ticks.delay(mode, 0.5, deadline=600) == 60.0
+
+
+def test_deadline_clamps_backoff():
+    ticks = TickScheduler(event_driven=True)
+    for _ in range(4):
+        ticks.delay(STABLE, 0.5, key=1)
+    assert ticks.delay(STABLE, 0.5, deadline=3.0, key=1) == 3.0     # backoff would be 8
+
+
+@pytest.mark.parametrize("deadline", [0.0, -5.0, 0.001])
+def test_never_sleeps_less_than_min_wait(deadline):
+    ticks = TickScheduler(event_driven=True)
+    assert ticks.delay(IDLE, 0.5, deadline=deadline) == TickScheduler.MIN_WAIT
+    assert ticks.delay(FAST, 0.0) == TickScheduler.MIN_WAIT
+
+
+def test_stats_counts_ticks_per_mode(clock):
+    ticks = TickScheduler(event_driven=True, clock=clock)
+    for _ in range(3):
+        ticks.delay(STABLE, 0.5, key=1)
+    ticks.delay(FAST, 0.5)
+    clock.advance(2.0)
+    stats = ticks.stats()
+    assert set(stats) == set(TickScheduler.MODES)
+    assert stats[STABLE] == {"ticks": 3, "rate_hz": 1.5}
+    assert stats[FAST] == {"ticks": 1, "rate_hz": 0.5}
+    assert stats[IDLE] == {"ticks": 0, "rate_hz": 0.0}
@@ -0,0 +1,86 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from state import VERSION, StateStore, restore_deadline
+
+
+
+@pytest.mark.parametrize("content", [
+    b"",
+    b'{"version": 1, "sections": {"usage": {',      # truncated mid-write
+    b"\x00\x00\x00\x00",
+    b"not json at all",
+    b"[1, 2, 3]",
+    b'"a string"',
+    json.dumps({"version": VERSION + 1, "sections": {"usage": {}}}).encode(),
+    json.dumps({"version": VERSION - 1, "sections": {"usage": {}}}).encode(),
+    json.dumps({"sections": {"usage": {}}}).encode(),
+    json.dumps({"version": VERSION, "sections": ["usage"]}).encode(),
+    "{\"version\": 1, \"sections\": {\"x\": \"é\"}}".encode("latin-1"),   # not UTF-8
+])
+def test_load_rejects_bad_files(tmp_path, content):
+    path = tmp_path / "state.json"
+    path.write_bytes(content)
+    assert StateStore(path).load() == {}
+
+
+def test_load_missing_file(tmp_path):
+    assert StateStore(tmp_path / "nope" / "state.json").load() == {}
+
+
+def test_save_round_trip_and_skips_unchanged(tmp_path, make_clock):
+    path, clock = tmp_path / "state.json", make_clock(0.0)
+    store = StateStore(path, min_interval=10, clock=clock)
+    value = {"a": 1}
+    store.add("section", lambda: dict(value))
+
+    store.maybe_save()
+    assert store.writes == 0            # interval not reached yet
+    clock.t = 10
+    store.maybe_save()
+    assert store.writes == 1
+    clock.t = 20
+    store.maybe_save()
+    assert store.writes == 1            # nothing changed
+    value["a"] = 2
+    store.save()
+    assert store.writes == 2
+    assert StateStore(path).load() == {"section": {"a": 2}}
+    assert not path.with_suffix(".tmp").exists()
+
+
+def test_failing_getter_does_not_block_other_sections(tmp_path):
+    path = tmp_path / "state.json"
+    store = StateStore(path)
+    store.add("bad", lambda: 1 / 0)
+    store.add("good", lambda: [1, 2])
+    store.save()
+    assert StateStore(path).load() == {"good": [1, 2]}
+
+
+NOW = datetime(2026, 3, 10, 21, 0)
+CAP = timedelta(minutes=30)
+
+
+def test_restore_deadline_keeps_pending_override():
+    until = NOW + timedelta(minutes=10)
+    assert restore_deadline(until.timestamp(), NOW, CAP) == until
+
+
+def test_restore_deadline_drops_expired_override():
+    # The clock moved forward past the override while we were down.
+    assert restore_deadline((NOW - timedelta(seconds=1)).timestamp(), NOW, CAP) is None
+    assert restore_deadline(NOW.timestamp(), NOW, CAP) is None
+
+
+def test_restore_deadline_caps_after_clock_moved_back():
+    # Saved with 20 minutes left, then the clock was set back 3 hours.
+    until = NOW + timedelta(hours=3, minutes=20)
+    assert restore_deadline(until.timestamp(), NOW, CAP) == NOW + CAP
+
+
+@pytest.mark.parametrize("value", [None, "soon", [], {}, float("nan"), float("inf"), 1e300])
+def test_restore_deadline_ignores_garbage(value):
+    assert restore_deadline(value, NOW, CAP) is None
@@ -0,0 +1,82 @@
+from datetime import date, timedelta
+
+import pytest
+
+import usage
+from usage import UsageAccountant
+
+TODAY = date(2026, 3, 10)
+
+
+
+@pytest.fixture(autouse=True)
+def today(monkeypatch):
+    class FixedDate(date):
+        @classmethod
+        def today(cls):
+            return TODAY
+    monkeypatch.setattr(usage, "date", FixedDate)
+
+
+def _day(offset):
+    return (TODAY + timedelta(days=offset)).isoformat()
+
+
+def test_restore_keeps_today_and_yesterday_only():
+    acct = UsageAccountant()
+    acct.restore({
+        _day(-2): {"w": {"a.exe": 50}},
+        _day(-1): {"w": {"a.exe": 60}},
+        _day(0): {"w": {"a.exe": 70}},
+        _day(1): {"w": {"a.exe": 80}},      # from before the clock was set back
+    })
+    assert acct.snapshot() == {_day(-1): {"w": {"a.exe": 60}}, _day(0): {"w": {"a.exe": 70}}}
+
+
+def test_future_day_cannot_count_once_it_arrives():
+    acct = UsageAccountant()
+    acct.restore({_day(1): {"w": {"a.exe": 3000}}})
+    assert acct.used((_day(1), "w", "a.exe")) == 0
+
+
+def test_restore_skips_malformed_entries():
+    acct = UsageAccountant()
+    acct.restore({_day(0): {"w": {"a.exe": "lots", "b.exe": -5, "c.exe": None, "d.exe": "12.5"}}})
+    assert acct.snapshot() == {_day(0): {"w": {"d.exe": 12.5}}}
+
+
+@pytest.mark.parametrize("bad", [[1, 2], {_day(0): [1]}, {_day(0): {"w": 3}}])
+def test_restore_rejects_wrong_shapes(bad):
+    # main.py catches these; nothing is half-loaded into a new accountant.
+    acct = UsageAccountant()
+    with pytest.raises((AttributeError, TypeError)):
+        acct.restore(bad)
+    assert acct.snapshot() == {}
+
+
+def test_snapshot_restore_never_counts_twice(clock, make_clock):
+    key = (_day(0), "w", "a.exe")
+    acct = UsageAccountant(clock=clock)
+    acct.switch(key)
+    clock.advance(30)
+    acct.switch(key)
+    saved = acct.snapshot()
+    clock.advance(20)                       # lost: after the last snapshot
+    acct.switch(key)
+
+    restarted = UsageAccountant(clock=make_clock(5.0))
+    restarted.restore(saved)
+    assert restarted.used(key) == 30
+    assert acct.used(key) == 50
+
+
+def test_gap_longer_than_max_gap_is_not_charged(clock):
+    key = (_day(0), "w", "a.exe")
+    acct = UsageAccountant(max_gap=120, clock=clock)
+    acct.switch(key)
+    clock.advance(60)
+    acct.switch(key)
+    clock.advance(8 * 3600)                 # asleep
+    acct.switch(key)
+    clock.advance(10)
+    assert acct.used(key) == 70
@@ -0,0 +1,72 @@
+import pytest
+
+from watchdog import Beat, StallDetector
+
+
+class FakeReader:
+    def __init__(self):
+        self.beat = None
+
+    def read(self):
+        return self.beat
+
+
+@pytest.fixture
+def watched(clock):
+    """(reader, clock, detector) with a 30 s stall timeout."""
+    reader = FakeReader()
+    return reader, clock, StallDetector(reader, lambda: 30.0, clock=clock)
+
+
+def _poll(detector, clock, seconds, pid=42):
+    """Advance one-second polls for *seconds*; the first Stall seen, else None."""
+    for _ in range(int(seconds)):
+        clock.advance(1)
+        stall = detector.check(pid)
+        if stall is not None:
+            return stall
+    return None
+
+
+def test_stalled_child_is_reported_after_timeout(watched):
+    reader, clock, detector = watched
+    reader.beat = Beat(1, 5.0, 5.5, 42)   # child clock, 0.5s wait announced
+    assert _poll(detector, clock, 30) is None
+    stall = _poll(detector, clock, 5)
+    assert stall is not None and stall.beat.seq == 1
+    assert 30 < stall.overdue < 32
+
+
+def test_beating_child_is_never_reported(watched):
+    reader, clock, detector = watched
+    for seq in range(1, 100):
+        reader.beat = Beat(seq, float(seq), seq + 0.5, 42)
+        assert _poll(detector, clock, 1) is None
+
+
+def test_resume_from_sleep_is_not_a_stall(watched):
+    # The child's deadline is on a clock that skipped the sleep; the
+    # guardian's clock jumps by the whole sleep.
+    reader, clock, detector = watched
+    reader.beat = Beat(1, 5.0, 5.5, 42)
+    assert _poll(detector, clock, 3) is None
+    clock.advance(8 * 3600)
+    assert detector.check(42) is None
+    for seq in range(2, 60):
+        reader.beat = Beat(seq, float(seq), seq + 0.5, 42)
+        assert _poll(detector, clock, 1) is None
+
+
+def test_child_hung_across_sleep_is_still_caught(watched):
+    reader, clock, detector = watched
+    reader.beat = Beat(1, 5.0, 5.5, 42)
+    _poll(detector, clock, 3)
+    clock.advance(3600)
+    assert detector.check(42) is None
+    assert _poll(detector, clock, 35) is not None
+
+
+def test_beat_from_another_pid_is_ignored(watched):
+    reader, clock, detector = watched
+    reader.beat = Beat(1, 5.0, 5.5, 7)
+    assert _poll(detector, clock, 120) is None
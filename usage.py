@@ -0,0 +1,99 @@
+"""Foreground-time accounting for quota windows.
+
+UsageAccountant charges elapsed foreground time to a (day, window, app)
+key. The monitor calls switch() every tick, but time is only added to a
+total when the key changes, so the cost is O(1) per transition. A gap
+between calls longer than max_gap (a hung monitor, or the machine asleep)
+is not charged.
+
+snapshot() folds the open segment into the totals and restarts it at
+the snapshot time. The monitor persists snapshots with its runtime state
+(state.py), and a restarted process restore()s them with no open
+segment. Time since the last snapshot can be lost, but it is never
+counted twice.
+"""
+import threading
+import time
+from datetime import date, timedelta
+from typing import Callable, Dict, Optional, Tuple
+
+Key = Tuple[str, str, str]   # (YYYY-MM-DD the window started, window name, app)
+
+
+class UsageAccountant:
+    def __init__(self, max_gap: float = 120.0, clock: Callable[[], float] = time.monotonic):
+        self._max_gap = max_gap
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._totals: Dict[Key, float] = {}
+        self._key: Optional[Key] = None
+        self._since = self._seen = clock()
+
+    # ── accounting ───────────────────────────────────────────────────────────
+
+    def switch(self, key: Optional[Key]) -> None:
+        """The foreground is now *key* (None = nothing being metered)."""
+        with self._lock:
+            now = self._clock()
+            if key == self._key and now - self._seen <= self._max_gap:
+                self._seen = now
+                return
+            self._close(now)
+            self._key, self._since, self._seen = key, now, now
+
+    def used(self, key: Key) -> float:
+        """Seconds charged to *key* so far, including the open segment."""
+        with self._lock:
+            total = self._totals.get(key, 0.0)
+            if key == self._key:
+                total += self._end(self._clock()) - self._since
+            return total
+
+    def _end(self, now: float) -> float:
+        """Where the open segment ends if closed at *now*: a long gap stops at the last call."""
+        return now if now - self._seen <= self._max_gap else self._seen
+
+    def _close(self, now: float) -> None:
+        if self._key is None:
+            return
+        end = self._end(now)
+        if end > self._since:
+            self._totals[self._key] = self._totals.get(self._key, 0.0) + (end - self._since)
+        self._since = end
+
+    # ── persistence ──────────────────────────────────────────────────────────
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """{day: {window: {app: seconds}}}, with the open segment folded in."""
+        with self._lock:
+            self._close(self._clock())
+            self._prune()
+            days: Dict[str, Dict[str, Dict[str, float]]] = {}
+            for (day, window, app), secs in self._totals.items():
+                days.setdefault(day, {}).setdefault(window, {})[app] = round(secs, 3)
+            return days
+
+    def restore(self, days: dict) -> None:
+        """Load totals from a snapshot; malformed entries are skipped."""
+        with self._lock:
+            for day, windows in days.items():
+                for window, apps in windows.items():
+                    for app, secs in apps.items():
+                        try:
+                            secs = float(secs)
+                        except (TypeError, ValueError):
+                            continue
+                        if secs >= 0:
+                            self._totals[(str(day), str(window), str(app))] = secs
+            self._prune()
+
+    def _prune(self) -> None:
+        """
+        Keep today and yesterday (a cross-midnight window is keyed by its
+        start day). Days after today only exist if the clock jumped back;
+        they are dropped too, so they cannot count once that day arrives.
+        """
+        today = date.today()
+        lo, hi = (today - timedelta(days=1)).isoformat(), today.isoformat()
+        for key in [k for k in self._totals if not lo <= k[0] <= hi]:
+            del self._totals[key]
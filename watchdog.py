@@ -0,0 +1,165 @@
+"""Monitor-thread heartbeat shared with the guardian through a memory-mapped file.
+
+The monitor calls Heartbeat.beat() once per tick with the time it is about
+to sleep. Each beat writes one fixed-size record in place:
+
+  seq       beat counter (repeated at the end of the record to detect torn reads)
+  ts        time.monotonic() of the beat (system-wide clock on Windows and Linux)
+  deadline  monotonic time by which the next beat is due
+  pid       process id of the writer
+
+The guardian polls HeartbeatReader and uses StallDetector and supervise()
+to kill a child whose beats are overdue by more than the configured
+stall timeout. Overdue is measured on the guardian's side, from when it
+last saw seq change, plus the wait the child announced. It never compares
+the child's deadline with its own clock: on Windows the monotonic clock
+keeps counting through sleep and hibernate, but wait timeouts do not, so
+every beat would look late by the length of the sleep. The guardian side
+has no Windows dependencies, so it can be exercised on Linux with a fake
+child.
+"""
+import mmap
+import os
+import struct
+import subprocess
+import time
+from pathlib import Path
+from typing import Callable, NamedTuple, Optional
+
+_RECORD = struct.Struct("<QddIIQ")   # seq, ts, deadline, pid, pad, seq again
+SIZE = _RECORD.size
+
+
+class Beat(NamedTuple):
+    seq: int
+    ts: float
+    deadline: float
+    pid: int
+
+
+class Stall(NamedTuple):
+    beat: Beat          # the last beat seen
+    overdue: float      # seconds past the announced wait, as the guardian measured it
+
+
+class Heartbeat:
+    """Writer side, used by the monitor thread."""
+
+    def __init__(self, path: str | Path, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._pid = os.getpid()
+        self._seq = 0
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Update in place (never replace) so a reader's mapping stays valid.
+        fd = os.open(path, os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+        try:
+            if os.fstat(fd).st_size < SIZE:
+                os.ftruncate(fd, SIZE)
+            self._mm = mmap.mmap(fd, SIZE)
+        finally:
+            os.close(fd)
+
+    def beat(self, next_within: float) -> None:
+        """Record a tick; the next one is expected within *next_within* seconds."""
+        self._seq += 1
+        now = self._clock()
+        self._mm[:SIZE] = _RECORD.pack(self._seq, now, now + next_within, self._pid, 0, self._seq)
+
+    def close(self) -> None:
+        self._mm.close()
+
+
+class HeartbeatReader:
+    """Reader side, used by the guardian. read() is None until a beat is visible."""
+
+    def __init__(self, path: str | Path):
+        self._path = Path(path)
+        self._mm: Optional[mmap.mmap] = None
+
+    def read(self) -> Optional[Beat]:
+        if self._mm is None and not self._open():
+            return None
+        for _ in range(3):
+            seq, ts, deadline, pid, _pad, seq2 = _RECORD.unpack(self._mm[:SIZE])
+            if seq == seq2:
+                return Beat(seq, ts, deadline, pid) if seq else None
+        return None     # kept being torn — the writer is clearly alive
+
+    def _open(self) -> bool:
+        try:
+            with open(self._path, "rb") as f:
+                self._mm = mmap.mmap(f.fileno(), SIZE, access=mmap.ACCESS_READ)
+            return True
+        except (OSError, ValueError):
+            return False
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+
+class StallDetector:
+    """
+    Decides whether a child's monitor thread has stalled. Detection is armed
+    by the child's first beat, so a child that cannot create the heartbeat
+    file is left alone rather than restarted in a loop. A *timeout* of 0
+    disables detection.
+
+    A gap between two checks longer than *suspend_gap* means the system
+    was suspended (or the guardian was not scheduled). The child's wait
+    was frozen during that time too, so the last beat is treated as if
+    it had just been seen.
+    """
+
+    def __init__(self, reader: HeartbeatReader, timeout: Callable[[], float],
+                 clock: Callable[[], float] = time.monotonic, suspend_gap: float = 5.0):
+        self._reader = reader
+        self._timeout = timeout
+        self._clock = clock
+        self._suspend_gap = suspend_gap
+        self._last: Optional[Beat] = None   # last beat seen
+        self._seen = 0.0                    # our clock when it was first seen
+        self._checked: Optional[float] = None
+
+    def check(self, pid: int) -> Optional[Stall]:
+        """A Stall if *pid*'s next beat is overdue by more than the timeout, else None."""
+        now = self._clock()
+        resumed = self._checked is not None and now - self._checked > self._suspend_gap
+        self._checked = now
+        timeout = self._timeout()
+        if timeout <= 0:
+            return None
+        beat = self._reader.read()
+        if beat is None or beat.pid != pid:
+            self._last = None
+            return None
+        if resumed or self._last is None or beat.seq != self._last.seq:
+            self._last, self._seen = beat, now
+            return None
+        overdue = now - self._seen - (beat.deadline - beat.ts)
+        if overdue > timeout:
+            return Stall(beat, overdue)
+        return None
+
+
+def supervise(proc: subprocess.Popen, detector: StallDetector,
+              on_stall: Callable[[Stall], None], poll: float = 1.0,
+              on_poll: Optional[Callable[[], None]] = None) -> int:
+    """
+    Wait for *proc* to exit, killing it if it stalls. Returns its exit code.
+    *on_poll* runs every *poll* seconds while waiting (housekeeping).
+    """
+    while True:
+        try:
+            return proc.wait(timeout=poll)
+        except subprocess.TimeoutExpired:
+            pass
+        if on_poll is not None:
+            on_poll()
+        stall = detector.check(proc.pid)
+        if stall is not None:
+            on_stall(stall)
+            proc.kill()
+            return proc.wait()